@@ -3,15 +3,29 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import sqlite3
 from app.config import Config
 
+@event.listens_for(Engine, 'connect')
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Ativa as chaves estrangeiras no SQLite, necessárias para o ON DELETE CASCADE/SET NULL."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
 # Inicializa extensões globalmente
 db = SQLAlchemy()
 login_manager = LoginManager()
 jwt = JWTManager()
 
-def create_app():
-    """Factory function para criar e configurar a aplicação Flask."""
+def create_app(schema_startup=None):
+    """Factory function para criar e configurar a aplicação Flask.
+
+    ``schema_startup`` substitui a configuração SCHEMA_STARTUP (ex.: 'skip' no migrate.py).
+    """
     app = Flask(__name__)
     
     # Carrega configurações da classe Config
@@ -24,7 +38,7 @@ def create_app():
 
     CORS(app, resources={r"/*": {"origins": "*"}},  
          supports_credentials=True, 
-         allow_headers=["Content-Type", "Authorization"],
+         allow_headers=["Content-Type", "Authorization", "Idempotency-Key"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
     
     # Configura o LoginManager
@@ -37,12 +51,28 @@ def create_app():
     from app.models.proposal import Proposal
     from app.models.admin import Admin
     from app.models.message import Message
+    from app.models.message_archive import MessageArchive
+    from app.models.revoked_token import RevokedToken
+    from app.models.stats_snapshot import StatsSnapshot
+    from app.models.facet_snapshot import FacetSnapshot
+    from app.models.skill_graph_snapshot import SkillGraphSnapshot
+    from app.models.job import Job
+    from app.models.idempotency_key import IdempotencyKey
     from app.models.review import Review
     from app.models.skill import Skill, freelancer_skills, project_skills
     
-    # Cria as tabelas do banco no contexto da aplicação
+    # Verifica a versão do esquema; as tabelas só são criadas/alteradas se ela mudou
+    from app.schema import ensure_schema
     with app.app_context():
-        db.create_all()
+        ensure_schema(schema_startup or app.config['SCHEMA_STARTUP'])
+
+    # Tokens revogados no logout são recusados em todas as rotas protegidas
+    from app.services.token_revocation import is_token_revoked
+    jwt.token_in_blocklist_loader(is_token_revoked)
+
+    # Perfilamento sob demanda (sem hooks quando desativado)
+    from app.services.profiler import init_profiling
+    init_profiling(app)
 
     # Importa e registra os Blueprints de rotas
     from app.routes import register_routes
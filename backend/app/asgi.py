@@ -0,0 +1,137 @@
+"""Modo ASGI: as leituras mais acessadas atendidas com o engine assíncrono do SQLAlchemy.
+
+No modo WSGI cada leitura ocupa uma thread do worker durante toda a ida ao
+banco. Aqui as rotas GET de ``ROUTES`` são atendidas por corrotinas
+(``AsyncReadController``) sobre um ``AsyncEngine`` (aiosqlite/asyncpg), de
+modo que um único processo mantém muitas leituras em andamento sem uma thread
+por requisição. Todas as outras rotas (e métodos) seguem para a aplicação
+Flask por meio do ``a2wsgi``.
+
+A autenticação, os handlers de erro do JWT e os cabeçalhos de CORS continuam
+sendo os do Flask: a requisição assíncrona roda dentro de um contexto de
+requisição da aplicação, e só o acesso ao banco é substituído.
+
+Requer os pacotes opcionais ``uvicorn``, ``a2wsgi`` e ``aiosqlite`` (SQLite)
+ou ``asyncpg`` (PostgreSQL). Uso: ``uvicorn asgi:app --workers 4``.
+"""
+
+import re
+
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy.engine import make_url
+
+from app.controllers.async_read_controller import AsyncReadController
+
+# Driver assíncrono equivalente a cada banco suportado
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+# Rotas GET atendidas de forma assíncrona -> método do controlador (grupos = argumentos inteiros)
+ROUTES = [
+    (re.compile(r'^/project/all$'), AsyncReadController.get_all),
+    (re.compile(r'^/project/(\d+)$'), AsyncReadController.get),
+    (re.compile(r'^/message/project/(\d+)$'), AsyncReadController.get_project_messages),
+    (re.compile(r'^/recommendation/project/(\d+)$'), AsyncReadController.get_recommendations)
+]
+
+
+def async_database_url(url):
+    """Converte a URL do banco para o driver assíncrono correspondente."""
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"Banco sem driver assíncrono configurado: {url.get_backend_name()}.")
+    return url.set(drivername=driver)
+
+
+def _environ(scope):
+    """Monta o environ WSGI de uma requisição GET (sem corpo) a partir do scope ASGI."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port or 0),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': None,
+        'wsgi.errors': None,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class AsyncReadApp:
+    """Aplicação ASGI que atende as leituras de ``ROUTES`` e repassa o resto ao Flask."""
+
+    def __init__(self, flask_app):
+        from a2wsgi import WSGIMiddleware
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config.get('ASGI_WSGI_THREADS', 10))
+        url = flask_app.config.get('ASYNC_DATABASE_URL') or async_database_url(flask_app.config['SQLALCHEMY_DATABASE_URI'])
+        self.engine = create_async_engine(url, pool_size=flask_app.config.get('ASYNC_DB_POOL_SIZE', 20), max_overflow=0)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, handler in ROUTES:
+                match = pattern.match(scope['path'])
+                if match:
+                    return await self._handle(scope, send, handler, [int(arg) for arg in match.groups()])
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _error_response(self, error):
+        """Resposta do Flask para a exceção (handlers do JWT, 404/500 padrão)."""
+        try:
+            return self.flask_app.handle_user_exception(error)
+        except Exception as unhandled:
+            return self.flask_app.handle_exception(unhandled)
+
+    async def _handle(self, scope, send, handler, args):
+        app = self.flask_app
+        with app.request_context(_environ(scope)):
+            try:
+                # Mesma verificação do @jwt_required (assinatura, expiração e revogação)
+                verify_jwt_in_request()
+                async with self.sessions() as session:
+                    body, status, *headers = await handler(session, get_jwt()['role'], get_jwt_identity(), *args)
+                response = app.make_response((app.json.response(body), status, *headers))
+            except Exception as e:
+                response = app.make_response(self._error_response(e))
+            response = app.process_response(response)
+
+        headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+def create_asgi_app(flask_app=None):
+    """Cria a aplicação ASGI sobre a aplicação Flask (criada aqui se não for informada)."""
+    if flask_app is None:
+        from app import create_app
+        flask_app = create_app()
+    return AsyncReadApp(flask_app)
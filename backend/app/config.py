@@ -16,7 +16,105 @@ class Config:
     # Configuração do banco de dados SQLite
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False  
+    SCHEMA_STARTUP = os.getenv('SCHEMA_STARTUP', 'upgrade')  # 'upgrade', 'check' (produção, com migrate.py) ou 'skip'
     
     # Configuração para JWT (autenticação com tokens)
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # Token expira em 1 hora
+    TOKEN_REVOCATION_SYNC_INTERVAL = float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', '5'))  # Segundos entre sincronizações da lista de revogação
+
+    # Hashing de senhas em pool de processos dedicado
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')  # Alterar o custo força o rehash no próximo login
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))  # 0 executa na thread da requisição
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '32'))  # Operações aguardando além das em execução
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', '0.5'))  # Segundos aguardando vaga antes do 503
+
+    # Limitação de taxa (token buckets por IP e por email)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+    RATE_LIMITS = {
+        'login': os.getenv('RATE_LIMIT_LOGIN', '10/minute'),
+        'register': os.getenv('RATE_LIMIT_REGISTER', '5/minute'),
+        'write': os.getenv('RATE_LIMIT_WRITE', '60/minute')
+    }
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))  # Limite de buckets em memória por processo
+    RATE_LIMIT_STORAGE = os.getenv('RATE_LIMIT_STORAGE', '')  # Vazio = memória; 'sqlite:///caminho' = compartilhado entre workers
+
+    # Importação em lote de usuários
+    USER_IMPORT_CHUNK_SIZE = int(os.getenv('USER_IMPORT_CHUNK_SIZE', '1000'))  # Linhas por bloco (uma transação por bloco)
+    USER_IMPORT_HASH_WORKERS = int(os.getenv('USER_IMPORT_HASH_WORKERS', str(os.cpu_count() or 1)))  # Processos para os hashes da importação
+
+    # Exportação de dados para análise
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '5000'))  # Linhas lidas do cursor por vez
+
+    # Estatísticas do painel administrativo
+    ADMIN_STATS_SERIES_DAYS = int(os.getenv('ADMIN_STATS_SERIES_DAYS', '30'))  # Dias das séries diárias
+    ADMIN_STATS_CACHE_SECONDS = int(os.getenv('ADMIN_STATS_CACHE_SECONDS', '10'))  # Tempo do snapshot em memória
+
+    # Exclusão de contas e projetos
+    PURGE_SYNC_MAX_ROWS = int(os.getenv('PURGE_SYNC_MAX_ROWS', '5000'))  # Acima disso a exclusão é feita em blocos, em segundo plano
+    PURGE_CHUNK_SIZE = int(os.getenv('PURGE_CHUNK_SIZE', '1000'))  # Linhas removidas por transação na exclusão em blocos
+
+    # Fila de tarefas em segundo plano (run_worker.py)
+    JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', '2'))  # Tarefas executadas ao mesmo tempo por worker
+    JOB_WORKER_MODE = os.getenv('JOB_WORKER_MODE', 'thread')  # 'thread' ou 'process' (tarefas limitadas por CPU)
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))  # Segundos entre consultas à fila vazia
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '60'))  # Sem renovação, outro worker assume a tarefa após esse tempo
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '5'))
+    JOB_RETRY_BACKOFF = float(os.getenv('JOB_RETRY_BACKOFF', '5'))  # Segundos até a 1ª nova tentativa (dobra a cada falha)
+    JOB_RETRY_BACKOFF_MAX = float(os.getenv('JOB_RETRY_BACKOFF_MAX', '3600'))
+    JOB_SCHEDULE = {  # Tarefas periódicas enfileiradas pelo worker -> intervalo em segundos (0 desativa)
+        'expire_projects': int(os.getenv('JOB_SCHEDULE_EXPIRE_PROJECTS', '300')),
+        'refresh_search_facets': int(os.getenv('JOB_SCHEDULE_REFRESH_SEARCH_FACETS', '60')),
+        'refresh_skill_graph': int(os.getenv('JOB_SCHEDULE_REFRESH_SKILL_GRAPH', '3600')),
+        'reconcile_active_projects': int(os.getenv('JOB_SCHEDULE_RECONCILE_ACTIVE_PROJECTS', '3600')),
+        'prune_idempotency_keys': int(os.getenv('JOB_SCHEDULE_PRUNE_IDEMPOTENCY_KEYS', '3600'))
+    }
+
+    # Expiração de projetos abertos com o prazo vencido
+    PROJECT_EXPIRY_BATCH_SIZE = int(os.getenv('PROJECT_EXPIRY_BATCH_SIZE', '500'))  # Projetos expirados por transação
+
+    # Modo ASGI (asgi.py): leituras assíncronas
+    ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL')  # Vazio = DATABASE_URL com o driver assíncrono (aiosqlite/asyncpg)
+    ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', '20'))  # Leituras simultâneas no banco por processo
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '10'))  # Threads para as rotas repassadas ao Flask
+
+    # Busca facetada de projetos (/project/search)
+    PROJECT_SEARCH_MAX_LIMIT = int(os.getenv('PROJECT_SEARCH_MAX_LIMIT', '100'))  # Projetos por página
+    PROJECT_SEARCH_SKILL_FACETS = int(os.getenv('PROJECT_SEARCH_SKILL_FACETS', '20'))  # Habilidades listadas na faceta
+    PROJECT_SEARCH_FACET_CACHE_SECONDS = int(os.getenv('PROJECT_SEARCH_FACET_CACHE_SECONDS', '30'))  # Facetas em memória por combinação de filtros
+
+    # Autocompletar e resolução de habilidades (/skill)
+    SKILL_INDEX_REFRESH_SECONDS = int(os.getenv('SKILL_INDEX_REFRESH_SECONDS', '60'))  # Reconstrução do índice em memória (nomes e uso)
+    SKILL_RESOLVE_MAX_NAMES = int(os.getenv('SKILL_RESOLVE_MAX_NAMES', '100'))  # Nomes por chamada de /skill/resolve
+
+    # Grafo de coocorrência de habilidades (/skill/<id>/related e recomendações)
+    SKILL_GRAPH_MIN_COOCCURRENCE = int(os.getenv('SKILL_GRAPH_MIN_COOCCURRENCE', '2'))  # Perfis/projetos em comum para relacionar duas habilidades
+    SKILL_GRAPH_MAX_RELATED = int(os.getenv('SKILL_GRAPH_MAX_RELATED', '20'))  # Relacionadas guardadas por habilidade
+    SKILL_GRAPH_RELOAD_SECONDS = int(os.getenv('SKILL_GRAPH_RELOAD_SECONDS', '30'))  # Intervalo entre verificações de um snapshot novo
+    SKILL_GRAPH_EXPANSION_PER_SKILL = int(os.getenv('SKILL_GRAPH_EXPANSION_PER_SKILL', '5'))  # Relacionadas usadas por habilidade do projeto (0 desativa)
+    SKILL_GRAPH_EXPANSION_WEIGHT = float(os.getenv('SKILL_GRAPH_EXPANSION_WEIGHT', '0.5'))  # Fração de crédito de uma habilidade relacionada
+
+    # Carga dos freelancers nas recomendações (Freelancer.active_projects)
+    RECOMMENDATION_LOAD_PENALTY = float(os.getenv('RECOMMENDATION_LOAD_PENALTY', '0.3'))  # Fração da pontuação perdida com a carga máxima (0 desativa)
+    RECOMMENDATION_LOAD_CAP = int(os.getenv('RECOMMENDATION_LOAD_CAP', '5'))  # Projetos em andamento a partir dos quais o desconto é total
+
+    # Chaves de idempotência das criações (cabeçalho Idempotency-Key)
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))  # Tempo em que uma repetição recebe a resposta gravada
+    IDEMPOTENCY_LOCK_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_SECONDS', '60'))  # Após isso uma chave sem resposta é considerada abandonada
+
+    # Cache de leitura de projetos, clientes e freelancers
+    ENTITY_CACHE_ENABLED = os.getenv('ENTITY_CACHE_ENABLED', '1') == '1'
+    ENTITY_CACHE_TTL = int(os.getenv('ENTITY_CACHE_TTL', '30'))  # Segundos de vida de cada entrada
+    ENTITY_CACHE_MAX_ENTRIES = int(os.getenv('ENTITY_CACHE_MAX_ENTRIES', '10000'))  # Limite do LRU em memória (ENTITY_CACHE_STORAGE=memory)
+    ENTITY_CACHE_STORAGE = os.getenv('ENTITY_CACHE_STORAGE', '')  # Vazio = arquivo ao lado do banco, compartilhado entre processos; 'sqlite:///caminho'; 'memory' (um único processo)
+
+    # Perfilamento de requisições (cabeçalho X-Profile de administradores ou amostragem)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '0') == '1'  # Desativado, nenhum hook é registrado
+    PROFILING_MODE = os.getenv('PROFILING_MODE', 'sample')  # 'sample' (pilhas recolhidas, baixo custo) ou 'cprofile' (pstats)
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))  # Fração das requisições perfiladas sem o cabeçalho
+    PROFILING_SAMPLE_INTERVAL = float(os.getenv('PROFILING_SAMPLE_INTERVAL', '0.005'))  # Segundos entre amostras da pilha
+    PROFILING_DIR = os.getenv('PROFILING_DIR', '')  # Vazio = instance/profiles
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '200'))  # Arquivos mais antigos são removidos
+
+    # Arquivamento de mensagens de projetos concluídos
+    MESSAGE_ARCHIVE_AFTER_DAYS = int(os.getenv('MESSAGE_ARCHIVE_AFTER_DAYS', '30'))  # Dias após a conclusão
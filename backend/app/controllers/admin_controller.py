@@ -1,12 +1,25 @@
-from flask import jsonify, request
+from flask import Response, jsonify, request, send_from_directory, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from app.models.admin import Admin
 from app.models.client import Client
 from app.models.freelancer import Freelancer
 from app.models.project import Project
 from app.models.proposal import Proposal
+from app.models.job import Job
+from app.services.password_hasher import HashingPoolSaturated, hash_password, verify_password, rehash_if_needed
+from app.services import password_hasher
+from app.services.proposal_workflow import ProposalConflict, accept_proposal
+from app.services import admin_stats
+from app.services import entity_cache
+from app.services import job_queue
+from app.services import profiler
+from app.services.exporter import EXPORTABLE, FORMATS, export_watermark, parquet_available, stream_export
+from app.services.user_import import IMPORTABLE, import_users, open_text_stream, read_rows
+from app.services.account_purge import delete_entity
+from app.services.versioning import StaleDataError, conflict, precondition_error
 from app import db
 from datetime import datetime
+import os
 
 class AdminController:
     """Controlador para gerenciar operações administrativas."""
@@ -19,7 +32,13 @@ class AdminController:
             return jsonify({"error": "Email e senha são obrigatórios."}), 400
 
         admin = Admin.query.filter_by(email=data['email']).first()
-        if admin and admin.check_password(data['password']):
+        try:
+            valid_password = admin is not None and verify_password(admin.password_hash, data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
+
+        if valid_password:
+            rehash_if_needed(admin, data['password'])
             access_token = create_access_token(identity=str(admin.id), additional_claims={'role': admin.role})
             return jsonify({
                 "message": "Login bem-sucedido.",
@@ -73,7 +92,10 @@ class AdminController:
             company=data.get('company'),
             phone=data.get('phone')
         )
-        new_client.set_password(data['password'])
+        try:
+            new_client.password_hash = hash_password(data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
 
         try:
             db.session.add(new_client)
@@ -106,7 +128,10 @@ class AdminController:
             portfolio_url=data.get('portfolio_url'),
             phone=data.get('phone')
         )
-        new_freelancer.set_password(data['password'])
+        try:
+            new_freelancer.password_hash = hash_password(data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
 
         try:
             db.session.add(new_freelancer)
@@ -190,8 +215,10 @@ class AdminController:
             return jsonify({"error": "Cliente não encontrado."}), 404
 
         try:
-            db.session.delete(client)
-            db.session.commit()
+            # O banco remove os dependentes (ON DELETE CASCADE); contas grandes são excluídas em blocos
+            job = delete_entity('client', client.id)
+            if job:
+                return jsonify({"message": "Exclusão do cliente agendada.", "job_id": job.id}), 202
             return jsonify({"message": "Cliente deletado com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
@@ -210,8 +237,10 @@ class AdminController:
             return jsonify({"error": "Freelancer não encontrado."}), 404
 
         try:
-            db.session.delete(freelancer)
-            db.session.commit()
+            # O banco remove os dependentes (ON DELETE CASCADE); contas grandes são excluídas em blocos
+            job = delete_entity('freelancer', freelancer.id)
+            if job:
+                return jsonify({"message": "Exclusão do freelancer agendada.", "job_id": job.id}), 202
             return jsonify({"message": "Freelancer deletado com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
@@ -250,6 +279,9 @@ class AdminController:
         project = Project.query.get(project_id)
         if not project:
             return jsonify({"error": "Projeto não encontrado."}), 404
+        error = precondition_error(project.version)
+        if error:
+            return error
 
         data = request.get_json()
         if not data:
@@ -261,10 +293,15 @@ class AdminController:
         project.budget = data.get('budget', project.budget)
         project.deadline = datetime.fromisoformat(data['deadline']) if data.get('deadline') else project.deadline
         project.status = data.get('status', project.status)
+        if project.status == 'completed' and not project.completed_at:
+            project.completed_at = datetime.today()
 
         try:
             db.session.commit()
             return jsonify({"message": "Projeto atualizado com sucesso.", "project": project.to_dict()}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
@@ -282,8 +319,10 @@ class AdminController:
             return jsonify({"error": "Projeto não encontrado."}), 404
 
         try:
-            db.session.delete(project)
-            db.session.commit()
+            # O banco remove os dependentes (ON DELETE CASCADE); contas grandes são excluídas em blocos
+            job = delete_entity('project', project.id)
+            if job:
+                return jsonify({"message": "Exclusão do projeto agendada.", "job_id": job.id}), 202
             return jsonify({"message": "Projeto deletado com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
@@ -300,6 +339,9 @@ class AdminController:
         proposal = Proposal.query.get(proposal_id)
         if not proposal:
             return jsonify({"error": "Proposta não encontrada."}), 404
+        error = precondition_error(proposal.version)
+        if error:
+            return error
 
         data = request.get_json()
         if not data or 'status' not in data:
@@ -314,14 +356,27 @@ class AdminController:
             if existing_accepted and existing_accepted.id != proposal.id:
                 return jsonify({"error": "Já existe uma proposta aceita para este projeto."}), 400
 
+            # Aceita, associa o freelancer ao projeto e rejeita as demais pendentes em uma transação
+            try:
+                rejected = accept_proposal(proposal)
+            except ProposalConflict:
+                return jsonify({"error": "O projeto já possui uma proposta aceita ou não está mais aberto."}), 409
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+            return jsonify({
+                "message": "Proposta atualizada com sucesso.",
+                "proposal": proposal.to_dict(),
+                "rejected_proposals": rejected
+            }), 200
+
         proposal.status = data['status']
-        if data['status'] == 'accepted':
-            project = Project.query.get(proposal.project_id)
-            project.status = 'in_progress'
 
         try:
             db.session.commit()
             return jsonify({"message": "Proposta atualizada com sucesso.", "proposal": proposal.to_dict()}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
@@ -344,4 +399,169 @@ class AdminController:
             return jsonify({"message": "Proposta deletada com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
-            return jsonify({"error": str(e)}), 500
\ No newline at end of file
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @jwt_required()
+    def import_users(kind):
+        """Importa clientes ou freelancers em lote a partir de um arquivo CSV ou NDJSON."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        if kind not in IMPORTABLE:
+            return jsonify({"error": f"Tipo inválido. Use: {', '.join(IMPORTABLE)}."}), 400
+
+        fmt = request.args.get('format')
+        if not fmt:
+            fmt = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+        if fmt not in ['csv', 'ndjson']:
+            return jsonify({"error": "Formato inválido. Use 'csv' ou 'ndjson'."}), 400
+
+        try:
+            report = import_users(kind, read_rows(open_text_stream(request.stream), fmt))
+            return jsonify({"message": "Importação concluída.", "report": report}), 200
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @jwt_required()
+    def export_data(name):
+        """Exporta uma tabela em streaming (CSV, NDJSON ou Parquet), opcionalmente de forma incremental."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        if name not in EXPORTABLE:
+            return jsonify({"error": f"Tabela inválida. Use: {', '.join(EXPORTABLE)}."}), 400
+
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in FORMATS:
+            return jsonify({"error": f"Formato inválido. Use: {', '.join(FORMATS)}."}), 400
+        if fmt == 'parquet' and not parquet_available():
+            return jsonify({"error": "Exportação em Parquet requer o pacote pyarrow instalado."}), 400
+
+        try:
+            since = datetime.fromisoformat(request.args['since']) if request.args.get('since') else None
+            after_id = request.args.get('after_id', type=int)
+        except ValueError:
+            return jsonify({"error": "Parâmetro 'since' deve estar no formato ISO 8601."}), 400
+
+        watermark = export_watermark(name, since=since, after_id=after_id)
+        headers = {'Content-Disposition': f'attachment; filename={name}.{fmt}'}
+        if watermark is not None:
+            # Próxima exportação incremental: ?after_id=<X-Export-Watermark>
+            headers['X-Export-Watermark'] = str(watermark)
+
+        content = stream_export(name, fmt, since=since, after_id=after_id, until_id=watermark)
+        return Response(stream_with_context(content), mimetype=FORMATS[fmt], headers=headers)
+
+    @staticmethod
+    @jwt_required()
+    def get_stats():
+        """Retorna as estatísticas pré-calculadas do painel administrativo."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        try:
+            stats = admin_stats.refresh_stats() if request.args.get('refresh') == '1' else admin_stats.get_stats()
+            return jsonify(stats), 200
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @jwt_required()
+    def get_metrics():
+        """Retorna métricas internas dos serviços da aplicação."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        return jsonify({
+            "password_hashing": password_hasher.get_stats(),
+            "jobs": job_queue.get_stats(),
+            "entity_cache": entity_cache.get_stats()
+        }), 200
+
+    @staticmethod
+    @jwt_required()
+    def get_jobs():
+        """Lista as tarefas da fila, das mais recentes para as mais antigas."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        query = Job.query
+        if request.args.get('status'):
+            query = query.filter_by(status=request.args['status'])
+        if request.args.get('name'):
+            query = query.filter_by(name=request.args['name'])
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        jobs = query.order_by(Job.id.desc()).limit(limit).all()
+        return jsonify([job.to_dict() for job in jobs]), 200
+
+    @staticmethod
+    @jwt_required()
+    def get_job(job_id):
+        """Retorna o status de uma tarefa da fila."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        job = Job.query.get(job_id)
+        if not job:
+            return jsonify({"error": "Tarefa não encontrada."}), 404
+        return jsonify(job.to_dict()), 200
+
+    @staticmethod
+    @jwt_required()
+    def create_job():
+        """Enfileira uma tarefa de manutenção (ex.: 'archive_messages', 'refresh_stats')."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        data = request.get_json()
+        if not data or 'name' not in data:
+            return jsonify({"error": "O nome da tarefa é obrigatório."}), 400
+        tasks = job_queue.load_tasks()
+        if data['name'] not in tasks:
+            return jsonify({"error": f"Tarefa inválida. Use: {', '.join(tasks)}."}), 400
+        if not isinstance(data.get('payload', {}), dict):
+            return jsonify({"error": "O payload deve ser um objeto JSON."}), 400
+        delay = data.get('delay', 0)
+        if not isinstance(delay, (int, float)) or delay < 0:
+            return jsonify({"error": "O atraso deve ser um número de segundos não negativo."}), 400
+
+        try:
+            job = job_queue.enqueue(data['name'], data.get('payload'), delay=delay)
+            return jsonify({"message": "Tarefa enfileirada.", "job": job.to_dict()}), 202
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @jwt_required()
+    def get_profiles():
+        """Lista os arquivos de perfil de requisições gravados neste servidor."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        return jsonify(profiler.list_profiles()), 200
+
+    @staticmethod
+    @jwt_required()
+    def download_profile(name):
+        """Baixa um arquivo de perfil (.pstats ou .folded)."""
+        claims = get_jwt()
+        if claims['role'] != 'admin':
+            return jsonify({"error": "Acesso não autorizado. Apenas administradores podem acessar."}), 403
+
+        directory = profiler.profiles_dir()
+        if not profiler.FILE_NAME.match(name) or not os.path.isfile(os.path.join(directory, name)):
+            return jsonify({"error": "Perfil não encontrado."}), 404
+        return send_from_directory(directory, name, as_attachment=True)
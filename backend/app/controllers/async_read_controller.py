@@ -0,0 +1,100 @@
+from flask import request
+from sqlalchemy import select
+from app.models.message import Message
+from app.models.message_archive import MessageArchive
+from app.models.project import Project
+from app.services import skill_graph
+from app.services.message_archive import decode_archive
+from app.services.project_access import NOT_FOUND, owner_error, participant_error, viewer_error
+from app.services.project_expiry import live_condition
+from app.services.versioning import etag_header
+from app.services.recommendations import (
+    NO_SKILLS_MESSAGE, build_recommendations, candidates_query, expanded_skill_ids, project_skill_ids_query,
+    ratings_query, skill_expansion
+)
+
+class AsyncReadController:
+    """Versões assíncronas das leituras mais acessadas, servidas pelo modo ASGI (``app/asgi.py``).
+
+    Cada método recebe uma ``AsyncSession`` e o usuário já autenticado e retorna
+    ``(corpo, status)``; as regras de acesso e o formato das respostas são os
+    mesmos dos controladores síncronos.
+    """
+
+    @staticmethod
+    async def _authorize(session, project_id, role, user_id, rule):
+        """Carrega o projeto e aplica a regra de acesso; retorna (projeto, erro)."""
+        project = await session.get(Project, project_id)
+        if project is None:
+            return None, ({"error": NOT_FOUND}, 404)
+        error = rule(project, role, user_id)
+        if error:
+            message, status = error
+            return None, ({"error": message}, status)
+        return project, None
+
+    @staticmethod
+    async def get_all(session, role, user_id):
+        """Lista os projetos do cliente ou os projetos abertos para freelancers."""
+        if role == 'client':
+            query = select(Project).where(Project.client_id == int(user_id))
+        elif role == 'freelancer':
+            query = select(Project).where(*live_condition())
+        else:
+            return {"error": "Acesso não autorizado."}, 403
+
+        projects = (await session.execute(query)).scalars().all()
+        return [project.to_dict() for project in projects], 200
+
+    @staticmethod
+    async def get(session, role, user_id, project_id):
+        """Obtém os detalhes de um projeto específico."""
+        project, error = await AsyncReadController._authorize(session, project_id, role, user_id, viewer_error)
+        if error:
+            return error
+        return project.to_dict(), 200, etag_header(project.version)
+
+    @staticmethod
+    async def get_project_messages(session, role, user_id, project_id):
+        """Lista todas as mensagens de um projeto, incluindo as arquivadas."""
+        project, error = await AsyncReadController._authorize(session, project_id, role, user_id, participant_error)
+        if error:
+            return error
+
+        messages = (await session.execute(
+            select(Message).where(Message.project_id == project_id).order_by(Message.created_at.asc())
+        )).scalars().all()
+        result = [message.to_dict() for message in messages]
+
+        archive = await session.scalar(select(MessageArchive).where(MessageArchive.project_id == project_id))
+        if archive:
+            result = sorted(decode_archive(archive) + result, key=lambda message: (message['created_at'], message['id']))
+
+        return result, 200
+
+    @staticmethod
+    async def get_recommendations(session, role, user_id, project_id):
+        """Gera uma lista de freelancers recomendados para um projeto."""
+        if role != 'client':
+            return {"error": "Acesso não autorizado. Apenas clientes podem obter recomendações."}, 403
+
+        project, error = await AsyncReadController._authorize(session, project_id, role, user_id, owner_error)
+        if error:
+            return error
+
+        project_skill_ids = list((await session.execute(project_skill_ids_query(project_id))).scalars())
+        if not project_skill_ids:
+            return {"message": NO_SKILLS_MESSAGE}, 200
+
+        expansion = skill_expansion(await session.run_sync(skill_graph.get_graph), project_skill_ids)
+        freelancers = (await session.execute(candidates_query(
+            expanded_skill_ids(project_skill_ids, expansion), request.args.get('max_active_projects', type=int)
+        ))).scalars().all()
+        ratings = {
+            freelancer_id: (avg_rating, review_count)
+            for freelancer_id, avg_rating, review_count in await session.execute(ratings_query([f.id for f in freelancers]))
+        }
+        return {
+            "message": "Recomendações geradas com sucesso.",
+            "recommendations": build_recommendations(project_skill_ids, freelancers, ratings, expansion)
+        }, 200
@@ -3,8 +3,12 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from app.models.client import Client
 from app.models.project import Project
 from app.models.review import Review
+from app.services.password_hasher import HashingPoolSaturated, hash_password, verify_password, rehash_if_needed
+from app.services.token_revocation import revoke_token
+from app.services.project_access import authorize_project
+from app.services.account_purge import delete_entity
+from app.services import entity_cache
 from app import db
-from werkzeug.security import check_password_hash
 
 class ClientController:
     """Controlador para gerenciar operações relacionadas a clientes."""
@@ -29,7 +33,10 @@ class ClientController:
             company=data.get('company'),
             phone=data.get('phone')
         )
-        new_client.set_password(data['password'])
+        try:
+            new_client.password_hash = hash_password(data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
         
         try:
             db.session.add(new_client)
@@ -49,7 +56,13 @@ class ClientController:
 
         client = Client.query.filter_by(email=data['email']).first()
         
-        if client and client.check_password(data['password']):
+        try:
+            valid_password = client is not None and verify_password(client.password_hash, data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
+
+        if valid_password:
+            rehash_if_needed(client, data['password'])
             access_token = create_access_token(identity=str(client.id), additional_claims={'role': client.role})
             return jsonify({
                 "message": "Login bem-sucedido.",
@@ -62,8 +75,13 @@ class ClientController:
     @staticmethod
     @jwt_required()
     def logout():
-        """Realiza o logout do cliente (gerenciado pelo frontend)."""
-        return jsonify({"message": "Logout bem-sucedido."}), 200
+        """Realiza o logout do cliente, revogando o token usado na requisição."""
+        try:
+            revoke_token(get_jwt())
+            return jsonify({"message": "Logout bem-sucedido."}), 200
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
 
     @staticmethod
     @jwt_required()
@@ -74,11 +92,11 @@ class ClientController:
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado."}), 403
         
-        client = Client.query.get(int(client_id))
+        client = entity_cache.get_dict('client', client_id, lambda: Client.query.get(int(client_id)))
         if not client:
             return jsonify({"error": "Cliente não encontrado."}), 404
         
-        return jsonify(client.to_dict()), 200
+        return jsonify(client), 200
 
     @staticmethod
     @jwt_required()
@@ -124,8 +142,10 @@ class ClientController:
             return jsonify({"error": "Cliente não encontrado."}), 404
 
         try:
-            db.session.delete(client)
-            db.session.commit()
+            # O banco remove os dependentes (ON DELETE CASCADE); contas grandes são excluídas em blocos
+            job = delete_entity('client', client.id)
+            if job:
+                return jsonify({"message": "Exclusão da conta agendada.", "job_id": job.id}), 202
             return jsonify({"message": "Conta deletada com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
@@ -145,11 +165,10 @@ class ClientController:
         if not data or not all(field in data for field in required_fields):
             return jsonify({"error": "ID do projeto, ID do freelancer e nota são obrigatórios."}), 400
 
-        project = Project.query.get(data['project_id'])
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
+        context, error = authorize_project(data['project_id'], claims['role'], client_id)
+        if error:
+            return error
+        project = context.project
         if project.status != 'completed':
             return jsonify({"error": "Avaliações só podem ser feitas para projetos concluídos."}), 400
         if project.freelancer_id != data['freelancer_id']:
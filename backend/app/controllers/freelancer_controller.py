@@ -3,8 +3,11 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from app.models.freelancer import Freelancer
 from app.models.project import Project
 from app.models.review import Review
+from app.services.password_hasher import HashingPoolSaturated, hash_password, verify_password, rehash_if_needed
+from app.services.token_revocation import revoke_token
+from app.services.account_purge import delete_entity
+from app.services import entity_cache
 from app import db
-from werkzeug.security import check_password_hash
 
 class FreelancerController:
     """Controlador para gerenciar operações relacionadas a freelancers."""
@@ -30,7 +33,10 @@ class FreelancerController:
             portfolio_url=data.get('portfolio_url'),
             phone=data.get('phone')
         )
-        new_freelancer.set_password(data['password'])
+        try:
+            new_freelancer.password_hash = hash_password(data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
         
         try:
             db.session.add(new_freelancer)
@@ -50,7 +56,13 @@ class FreelancerController:
 
         freelancer = Freelancer.query.filter_by(email=data['email']).first()
         
-        if freelancer and freelancer.check_password(data['password']):
+        try:
+            valid_password = freelancer is not None and verify_password(freelancer.password_hash, data['password'])
+        except HashingPoolSaturated:
+            return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), 503, {'Retry-After': '1'}
+
+        if valid_password:
+            rehash_if_needed(freelancer, data['password'])
             access_token = create_access_token(identity=str(freelancer.id), additional_claims={'role': freelancer.role})
             return jsonify({
                 "message": "Login bem-sucedido.",
@@ -63,8 +75,13 @@ class FreelancerController:
     @staticmethod
     @jwt_required()
     def logout():
-        """Realiza o logout do freelancer (gerenciado pelo frontend)."""
-        return jsonify({"message": "Logout bem-sucedido."}), 200
+        """Realiza o logout do freelancer, revogando o token usado na requisição."""
+        try:
+            revoke_token(get_jwt())
+            return jsonify({"message": "Logout bem-sucedido."}), 200
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
 
     @staticmethod
     @jwt_required()
@@ -75,11 +92,11 @@ class FreelancerController:
         if claims['role'] != 'freelancer':
             return jsonify({"error": "Acesso não autorizado."}), 403
         
-        freelancer = Freelancer.query.get(int(freelancer_id))
+        freelancer = entity_cache.get_dict('freelancer', freelancer_id, lambda: Freelancer.query.get(int(freelancer_id)))
         if not freelancer:
             return jsonify({"error": "Freelancer não encontrado."}), 404
         
-        return jsonify(freelancer.to_dict()), 200
+        return jsonify(freelancer), 200
 
     @staticmethod
     @jwt_required()
@@ -121,11 +138,11 @@ class FreelancerController:
         if claims['role'] != 'freelancer':
             return jsonify({"error": "Acesso não autorizado."}), 403
 
-        freelancer = Freelancer.query.get(freelancer_id)
+        freelancer = entity_cache.get_dict('freelancer', freelancer_id, lambda: Freelancer.query.get(int(freelancer_id)))
         if not freelancer:
             return jsonify({"error": "Freelancer não encontrado."}), 404
 
-        return jsonify(freelancer.to_dict()), 200
+        return jsonify(freelancer), 200
 
     @staticmethod
     @jwt_required()
@@ -141,8 +158,10 @@ class FreelancerController:
             return jsonify({"error": "Freelancer não encontrado."}), 404
 
         try:
-            db.session.delete(freelancer)
-            db.session.commit()
+            # O banco remove os dependentes (ON DELETE CASCADE); contas grandes são excluídas em blocos
+            job = delete_entity('freelancer', freelancer.id)
+            if job:
+                return jsonify({"message": "Exclusão da conta agendada.", "job_id": job.id}), 202
             return jsonify({"message": "Conta deletada com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
@@ -3,6 +3,11 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.models.project import Project
 from app.models.client import Client
 from app.models.proposal import Proposal
+from app.services.project_access import authorize_cached_project, authorize_project, viewer_error
+from app.services.account_purge import delete_entity
+from app.services.project_expiry import live_condition
+from app.services.project_search import search_projects
+from app.services.versioning import StaleDataError, conflict, etag_header, precondition_error
 from app import db
 from datetime import datetime
 
@@ -53,11 +58,25 @@ class ProjectController:
             projects = Project.query.filter_by(client_id=int(user_id)).all()
             return jsonify([project.to_dict() for project in projects]), 200
         elif role == 'freelancer':
-            projects = Project.query.filter_by(status='open').all()
+            # Apenas projetos abertos e dentro do prazo, mesmo antes da próxima expiração
+            projects = Project.query.filter(*live_condition()).all()
             return jsonify([project.to_dict() for project in projects]), 200
         else:
             return jsonify({"error": "Acesso não autorizado."}), 403
 
+    @staticmethod
+    @jwt_required()
+    def search():
+        """Busca projetos abertos com filtros, ordenação, paginação por cursor e facetas."""
+        claims = get_jwt()
+        if claims['role'] not in ['freelancer', 'client']:
+            return jsonify({"error": "Acesso não autorizado."}), 403
+
+        try:
+            return jsonify(search_projects(request.args)), 200
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
     @staticmethod
     @jwt_required()
     def get(project_id):
@@ -66,18 +85,11 @@ class ProjectController:
         claims = get_jwt()
         role = claims['role']
 
-        project = Project.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-
-        if role == 'client' and project.client_id != int(user_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
-        elif role == 'freelancer' and project.status != 'open' and project.freelancer_id != int(user_id):
-            return jsonify({"error": "Acesso não autorizado. Apenas projetos abertos ou associados ao freelancer são visíveis."}), 403
-        elif role not in ['client', 'freelancer']:
-            return jsonify({"error": "Acesso não autorizado."}), 403
+        project, error = authorize_cached_project(project_id, role, user_id, rule=viewer_error)
+        if error:
+            return error
 
-        return jsonify(project.to_dict()), 200
+        return jsonify(project), 200, etag_header(project.get('version'))
 
     @staticmethod
     @jwt_required()
@@ -88,11 +100,13 @@ class ProjectController:
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado."}), 403
 
-        project = Project.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
+        context, error = authorize_project(project_id, claims['role'], client_id)
+        if error:
+            return error
+        project = context.project
+        error = precondition_error(project.version)
+        if error:
+            return error
 
         data = request.get_json()
         if not data:
@@ -104,10 +118,15 @@ class ProjectController:
         project.budget = data.get('budget', project.budget)
         project.deadline = datetime.fromisoformat(data['deadline']) if data.get('deadline') else project.deadline
         project.status = data.get('status', project.status)
+        if project.status == 'completed' and not project.completed_at:
+            project.completed_at = datetime.today()
 
         try:
             db.session.commit()
             return jsonify({"message": "Projeto atualizado com sucesso.", "project": project.to_dict()}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
@@ -121,15 +140,16 @@ class ProjectController:
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado."}), 403
 
-        project = Project.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
+        context, error = authorize_project(project_id, claims['role'], client_id)
+        if error:
+            return error
+        project = context.project
 
         try:
-            db.session.delete(project)
-            db.session.commit()
+            # O banco remove os dependentes (ON DELETE CASCADE); contas grandes são excluídas em blocos
+            job = delete_entity('project', project.id)
+            if job:
+                return jsonify({"message": "Exclusão do projeto agendada.", "job_id": job.id}), 202
             return jsonify({"message": "Projeto deletado com sucesso."}), 200
         except Exception as e:
             db.session.rollback()
@@ -144,11 +164,13 @@ class ProjectController:
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado. Apenas clientes podem marcar projetos como concluídos."}), 403
 
-        project = Project.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
+        context, error = authorize_project(project_id, claims['role'], client_id)
+        if error:
+            return error
+        project = context.project
+        error = precondition_error(project.version)
+        if error:
+            return error
         if project.status != 'in_progress':
             return jsonify({"error": "Apenas projetos em andamento podem ser marcados como concluídos."}), 400
         if not project.freelancer_id:
@@ -160,10 +182,14 @@ class ProjectController:
             return jsonify({"error": "Nenhuma proposta aceita ou concluída pelo freelancer encontrada para este projeto."}), 400
 
         project.status = 'completed'
+        project.completed_at = datetime.today()
 
         try:
             db.session.commit()
             return jsonify({"message": "Projeto marcado como concluído com sucesso.", "project": project.to_dict()}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -1,8 +1,15 @@
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy.exc import IntegrityError
 from app.models.proposal import Proposal
-from app.models.project import Project
 from app.models.freelancer import Freelancer
+from app.services.proposal_workflow import ProposalConflict, accept_proposal
+from app.services.proposal_ranking import SORTS, rank_proposals
+from app.services.versioning import StaleDataError, conflict, etag_header, precondition_error
+from app.services.project_expiry import is_overdue
+from app.services.project_access import (
+    authorize_project, authorize_proposal, get_project_context, author_error, proposal_owner_error
+)
 from app import db
 
 class ProposalController:
@@ -22,10 +29,10 @@ class ProposalController:
         if not data or not all(field in data for field in required_fields):
             return jsonify({"error": "ID do projeto, valor da proposta e prazo estimado são obrigatórios."}), 400
 
-        project = Project.query.get(data['project_id'])
-        if not project:
+        context = get_project_context(data['project_id'])
+        if not context:
             return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.status != 'open':
+        if context.project.status != 'open' or is_overdue(context.project):
             return jsonify({"error": "Não é possível enviar propostas para projetos que não estão abertos."}), 400
 
         # Valida que bid_amount é positivo
@@ -49,6 +56,10 @@ class ProposalController:
             db.session.add(new_proposal)
             db.session.commit()
             return jsonify({"message": "Proposta criada com sucesso.", "proposal": new_proposal.to_dict()}), 201
+        except IntegrityError:
+            # Índice único (project_id, freelancer_id): proposta repetida ou enviada em paralelo
+            db.session.rollback()
+            return jsonify({"error": "Você já enviou uma proposta para este projeto."}), 409
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
@@ -56,20 +67,32 @@ class ProposalController:
     @staticmethod
     @jwt_required()
     def get_all(project_id):
-        """Lista todas as propostas de um projeto (apenas o cliente dono do projeto)."""
+        """Lista as propostas de um projeto (apenas o cliente dono do projeto); ``?sort=best`` ordena pela pontuação."""
         client_id = get_jwt_identity()
         claims = get_jwt()
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado."}), 403
 
-        project = Project.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
-
-        proposals = Proposal.query.filter_by(project_id=project_id).all()
-        return jsonify([proposal.to_dict() for proposal in proposals]), 200
+        context, error = authorize_project(project_id, claims['role'], client_id)
+        if error:
+            return error
+
+        sort = request.args.get('sort')
+        if sort is None:
+            proposals = Proposal.query.filter_by(project_id=project_id).all()
+            return jsonify([proposal.to_dict() for proposal in proposals]), 200
+        if sort not in SORTS:
+            return jsonify({"error": f"Ordenação inválida. Use: {', '.join(SORTS)}."}), 400
+
+        # Propostas pontuadas e paginadas na ordem da pontuação
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        proposals, total = rank_proposals(context.project, limit, offset)
+        return jsonify({
+            "proposals": proposals,
+            "total": total,
+            "next_offset": offset + limit if offset + limit < total else None
+        }), 200
 
     @staticmethod
     @jwt_required()
@@ -79,21 +102,11 @@ class ProposalController:
         claims = get_jwt()
         role = claims['role']
 
-        proposal = Proposal.query.get(proposal_id)
-        if not proposal:
-            return jsonify({"error": "Proposta não encontrada."}), 404
-
-        if role == 'client':
-            project = Project.query.get(proposal.project_id)
-            if project.client_id != int(user_id):
-                return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
-        elif role == 'freelancer':
-            if proposal.freelancer_id != int(user_id):
-                return jsonify({"error": "Acesso não autorizado. Esta proposta não pertence ao freelancer."}), 403
-        else:
-            return jsonify({"error": "Acesso não autorizado."}), 403
+        proposal, context, error = authorize_proposal(proposal_id, role, user_id)
+        if error:
+            return error
 
-        return jsonify(proposal.to_dict()), 200
+        return jsonify(proposal.to_dict()), 200, etag_header(proposal.version)
 
     @staticmethod
     @jwt_required()
@@ -104,14 +117,12 @@ class ProposalController:
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado. Apenas clientes podem atualizar propostas."}), 403
 
-        proposal = Proposal.query.get(proposal_id)
-        if not proposal:
-            return jsonify({"error": "Proposta não encontrada."}), 404
-
-        project = Project.query.get(proposal.project_id)
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
-
+        proposal, context, error = authorize_proposal(proposal_id, claims['role'], client_id, rule=proposal_owner_error)
+        if error:
+            return error
+        error = precondition_error(proposal.version)
+        if error:
+            return error
         data = request.get_json()
         if not data or 'status' not in data:
             return jsonify({"error": "Status é obrigatório para atualização."}), 400
@@ -121,17 +132,31 @@ class ProposalController:
             return jsonify({"error": f"Status inválido. Use: {', '.join(valid_statuses)}."}), 400
 
         if data['status'] == 'accepted':
-            existing_accepted = Proposal.query.filter_by(project_id=proposal.project_id, status='accepted').first()
+            existing_accepted = context.accepted_proposal()
             if existing_accepted and existing_accepted.id != proposal.id:
                 return jsonify({"error": "Já existe uma proposta aceita para este projeto."}), 400
-            project.freelancer_id = proposal.freelancer_id  # Associa o freelancer ao projeto
-            project.status = 'in_progress'
+
+            # Aceita, associa o freelancer ao projeto e rejeita as demais pendentes em uma transação
+            try:
+                rejected = accept_proposal(proposal)
+            except ProposalConflict:
+                return jsonify({"error": "O projeto já possui uma proposta aceita ou não está mais aberto."}), 409
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+            return jsonify({
+                "message": "Proposta atualizada com sucesso.",
+                "proposal": proposal.to_dict(),
+                "rejected_proposals": rejected
+            }), 200
 
         proposal.status = data['status']
 
         try:
             db.session.commit()
             return jsonify({"message": "Proposta atualizada com sucesso.", "proposal": proposal.to_dict()}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
@@ -144,24 +169,17 @@ class ProposalController:
         claims = get_jwt()
         role = claims['role']
 
-        proposal = Proposal.query.get(proposal_id)
-        if not proposal:
-            return jsonify({"error": "Proposta não encontrada."}), 404
-
-        if role == 'client':
-            project = Project.query.get(proposal.project_id)
-            if project.client_id != int(user_id):
-                return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
-        elif role == 'freelancer':
-            if proposal.freelancer_id != int(user_id):
-                return jsonify({"error": "Acesso não autorizado. Esta proposta não pertence ao freelancer."}), 403
-        else:
-            return jsonify({"error": "Acesso não autorizado."}), 403
+        proposal, context, error = authorize_proposal(proposal_id, role, user_id)
+        if error:
+            return error
 
         try:
             db.session.delete(proposal)
             db.session.commit()
             return jsonify({"message": "Proposta deletada com sucesso."}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
@@ -187,11 +205,12 @@ class ProposalController:
         if claims['role'] != 'freelancer':
             return jsonify({"error": "Acesso não autorizado. Apenas freelancers podem marcar propostas como concluídas."}), 403
 
-        proposal = Proposal.query.get(proposal_id)
-        if not proposal:
-            return jsonify({"error": "Proposta não encontrada."}), 404
-        if proposal.freelancer_id != int(freelancer_id):
-            return jsonify({"error": "Acesso não autorizado. Esta proposta não pertence ao freelancer."}), 403
+        proposal, context, error = authorize_proposal(proposal_id, claims['role'], freelancer_id, rule=author_error)
+        if error:
+            return error
+        error = precondition_error(proposal.version)
+        if error:
+            return error
         if proposal.status != 'accepted':
             return jsonify({"error": "Apenas propostas aceitas podem ser marcadas como concluídas."}), 400
 
@@ -200,6 +219,9 @@ class ProposalController:
         try:
             db.session.commit()
             return jsonify({"message": "Proposta marcada como concluída pelo freelancer.", "proposal": proposal.to_dict()}), 200
+        except StaleDataError:
+            db.session.rollback()
+            return conflict()
         except Exception as e:
             db.session.rollback()
             return jsonify({"error": str(e)}), 500
\ No newline at end of file
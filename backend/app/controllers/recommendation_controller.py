@@ -1,11 +1,12 @@
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from app.models.project import Project
-from app.models.freelancer import Freelancer
-from app.models.skill import Skill, freelancer_skills, project_skills
-from app.models.review import Review
+from app.services import skill_graph
+from app.services.project_access import authorize_project
+from app.services.recommendations import (
+    NO_SKILLS_MESSAGE, build_recommendations, candidates_query, expanded_skill_ids, project_skill_ids_query,
+    ratings_query, skill_expansion
+)
 from app import db
-from sqlalchemy.sql import func
 
 class RecommendationController:
     """Controlador para gerenciar recomendações de freelancers para projetos."""
@@ -19,49 +20,28 @@ class RecommendationController:
         if claims['role'] != 'client':
             return jsonify({"error": "Acesso não autorizado. Apenas clientes podem obter recomendações."}), 403
 
-        project = Project.query.get(project_id)
-        if not project:
-            return jsonify({"error": "Projeto não encontrado."}), 404
-        if project.client_id != int(client_id):
-            return jsonify({"error": "Acesso não autorizado. Este projeto não pertence ao cliente."}), 403
+        context, error = authorize_project(project_id, claims['role'], client_id)
+        if error:
+            return error
 
         # Obtém as habilidades requeridas pelo projeto
-        project_skills_query = db.session.query(Skill).join(project_skills).filter(project_skills.c.project_id == project_id).all()
-        project_skill_ids = [skill.id for skill in project_skills_query]
+        project_skill_ids = list(db.session.execute(project_skill_ids_query(project_id)).scalars())
 
         if not project_skill_ids:
-            return jsonify({"message": "Nenhuma habilidade associada ao projeto. Recomendações baseadas apenas em avaliações."}), 200
-
-        # Busca freelancers com pelo menos uma habilidade correspondente
-        matching_freelancers = db.session.query(Freelancer).join(freelancer_skills).filter(
-            freelancer_skills.c.skill_id.in_(project_skill_ids)
-        ).all()
-
-        # Calcula uma pontuação para cada freelancer com base em habilidades e avaliações
-        recommendations = []
-        for freelancer in matching_freelancers:
-            # Conta quantas habilidades do projeto o freelancer possui
-            freelancer_skill_ids = [skill.id for skill in freelancer.skill_set]
-            matching_skills = len(set(project_skill_ids).intersection(freelancer_skill_ids))
-            skill_match_score = matching_skills / len(project_skill_ids) if project_skill_ids else 0
-
-            # Calcula a média das avaliações do freelancer
-            avg_rating = db.session.query(func.avg(Review.rating)).filter_by(freelancer_id=freelancer.id).scalar() or 0
-            review_count = Review.query.filter_by(freelancer_id=freelancer.id).count()
-
-            # Pontuação combinada (50% habilidades, 50% avaliações)
-            score = (0.5 * skill_match_score) + (0.5 * (avg_rating / 5.0)) if avg_rating else skill_match_score
-
-            recommendations.append({
-                'freelancer': freelancer.to_dict(),
-                'score': round(score, 2),
-                'matching_skills': matching_skills,
-                'average_rating': round(avg_rating, 1) if avg_rating else None,
-                'review_count': review_count
-            })
-
-        # Ordena por pontuação (maior para menor)
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
+            return jsonify({"message": NO_SKILLS_MESSAGE}), 200
+
+        # Expande as habilidades pelo grafo de coocorrência (em memória)
+        expansion = skill_expansion(skill_graph.get_graph(db.session), project_skill_ids)
+
+        # Busca freelancers com pelo menos uma habilidade correspondente ou relacionada e as suas avaliações
+        freelancers = db.session.execute(candidates_query(
+            expanded_skill_ids(project_skill_ids, expansion), request.args.get('max_active_projects', type=int)
+        )).scalars().all()
+        ratings = {
+            freelancer_id: (avg_rating, review_count)
+            for freelancer_id, avg_rating, review_count in db.session.execute(ratings_query([f.id for f in freelancers]))
+        }
+        recommendations = build_recommendations(project_skill_ids, freelancers, ratings, expansion)
 
         return jsonify({
             "message": "Recomendações geradas com sucesso.",
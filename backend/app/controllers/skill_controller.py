@@ -0,0 +1,65 @@
+from flask import current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from app.models.skill import Skill
+from app.services import skill_graph, skill_index
+from app import db
+
+class SkillController:
+    """Controlador para gerenciar operações relacionadas a habilidades."""
+
+    @staticmethod
+    @jwt_required()
+    def suggest():
+        """Sugere habilidades pelo prefixo digitado, das mais usadas para as menos usadas."""
+        prefix = request.args.get('prefix', '')
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        return jsonify(skill_index.suggest(prefix, limit)), 200
+
+    @staticmethod
+    @jwt_required()
+    def resolve():
+        """Mapeia uma lista de nomes de habilidades para ids, criando as que não existem."""
+        data = request.get_json(silent=True)
+        if not data or 'names' not in data:
+            return jsonify({"error": "A lista 'names' é obrigatória."}), 400
+
+        try:
+            names = skill_index.clean_names(data['names'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        max_names = current_app.config.get('SKILL_RESOLVE_MAX_NAMES', 100)
+        if len(names) > max_names:
+            return jsonify({"error": f"Envie no máximo {max_names} habilidades por vez."}), 400
+
+        try:
+            skills, created = skill_index.resolve_skill_ids(names, create=data.get('create', True) is not False)
+            db.session.commit()
+            return jsonify({"skills": skills, "created": created}), 200
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @jwt_required()
+    def related(skill_id):
+        """Lista as habilidades que mais aparecem junto com a habilidade informada."""
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        graph = skill_graph.get_graph(db.session)
+        related = graph.related_to(skill_id, limit)
+
+        # Os nomes vêm de uma única consulta pela chave primária
+        names = dict(db.session.execute(
+            select(Skill.id, Skill.name).where(Skill.id.in_([skill_id] + [other for other, _, _ in related]))
+        ).all())
+        if skill_id not in names:
+            return jsonify({"error": "Habilidade não encontrada."}), 404
+
+        return jsonify({
+            "skill": {"id": skill_id, "name": names[skill_id]},
+            "related": [
+                {"id": other, "name": names[other], "weight": weight, "cooccurrences": count}
+                for other, weight, count in related if other in names
+            ]
+        }), 200
\ No newline at end of file
@@ -14,6 +14,12 @@ from app.models.review import Review
 
 from app.models.message import Message
 
+from app.models.message_archive import MessageArchive
+
+from app.models.revoked_token import RevokedToken
+
+from app.models.stats_snapshot import StatsSnapshot
+
 from app.models.skill import Skill, freelancer_skills, project_skills
 
-__all__ = [db, Client, Freelancer, Project, Proposal, Admin, Review, Message, Skill, freelancer_skills, project_skills]
\ No newline at end of file
+__all__ = [db, Client, Freelancer, Project, Proposal, Admin, Review, Message, MessageArchive, RevokedToken, StatsSnapshot, Skill, freelancer_skills, project_skills]
\ No newline at end of file
@@ -1,5 +1,6 @@
 from app import db
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_hasher import password_hash_method
 from datetime import datetime
 
 class Client(db.Model):
@@ -16,7 +17,7 @@ class Client(db.Model):
 
     def set_password(self, password):
         """Gera o hash da senha e armazena."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=password_hash_method())
 
     def check_password(self, password):
         """Verifica se a senha fornecida corresponde ao hash armazenado."""
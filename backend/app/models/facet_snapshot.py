@@ -0,0 +1,13 @@
+from app import db
+from datetime import datetime
+
+class FacetSnapshot(db.Model):
+    """Modelo que guarda as facetas pré-calculadas da busca de projetos sem filtros."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    payload = db.Column(db.Text, nullable=False)  # Facetas serializadas em JSON
+    computed_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+
+    def __repr__(self):
+        """Representação em string do modelo FacetSnapshot."""
+        return f'<FacetSnapshot {self.computed_at}>'
\ No newline at end of file
@@ -1,5 +1,6 @@
 from app import db
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_hasher import password_hash_method
 from datetime import datetime
 
 class Freelancer(db.Model):
@@ -13,11 +14,12 @@ class Freelancer(db.Model):
     portfolio_url = db.Column(db.String(200))  
     phone = db.Column(db.String(15))  
     role = db.Column(db.String(20), default='freelancer', nullable=False)  
+    active_projects = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Projetos em andamento (mantido por app/services/freelancer_load.py)
     created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
 
     def set_password(self, password):
         """Gera o hash da senha e armazena."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=password_hash_method())
 
     def check_password(self, password):
         """Verifica se a senha fornecida corresponde ao hash armazenado."""
@@ -34,6 +36,7 @@ class Freelancer(db.Model):
             'portfolio_url': self.portfolio_url,
             'phone': self.phone,
             'role': self.role,
+            'active_projects': self.active_projects,
             'created_at': self.created_at.isoformat()
         }
 
@@ -0,0 +1,22 @@
+from app import db
+from datetime import datetime
+
+class IdempotencyKey(db.Model):
+    """Modelo que guarda a resposta de uma escrita enviada com o cabeçalho Idempotency-Key."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    owner = db.Column(db.String(60), nullable=False)  # Usuário que enviou a chave ('papel:id')
+    key = db.Column(db.String(100), nullable=False)  # Valor do cabeçalho Idempotency-Key
+    fingerprint = db.Column(db.String(64), nullable=False)  # SHA-256 do método, caminho e corpo da requisição
+    status_code = db.Column(db.Integer)  # Vazio enquanto a requisição original está em execução
+    response = db.Column(db.Text)  # Corpo da resposta original
+    created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Após esta data a chave pode ser reutilizada e descartada
+
+    __table_args__ = (
+        db.Index('ux_idempotency_key_owner_key', 'owner', 'key', unique=True),  # Uma resposta por chave e usuário
+    )
+
+    def __repr__(self):
+        """Representação em string do modelo IdempotencyKey."""
+        return f'<IdempotencyKey {self.owner} {self.key}>'
\ No newline at end of file
@@ -0,0 +1,48 @@
+from app import db
+from datetime import datetime
+import json
+
+class Job(db.Model):
+    """Modelo que representa uma tarefa pesada enfileirada para execução pelo worker."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)  # Nome da tarefa registrada (ex.: 'purge_entity')
+    payload = db.Column(db.Text, nullable=False, default='{}')  # Argumentos da tarefa serializados em JSON
+    status = db.Column(db.String(20), default='queued', nullable=False)  # Status: queued, running, succeeded, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)  # Execuções iniciadas até agora
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    run_after = db.Column(db.DateTime, default=datetime.today, nullable=False)  # Não executa antes desta data (backoff)
+    locked_by = db.Column(db.String(100))  # Worker que detém a tarefa
+    lease_expires_at = db.Column(db.DateTime)  # Após esta data outro worker pode assumir a tarefa
+    last_error = db.Column(db.Text)
+    result = db.Column(db.Text)  # Resultado serializado em JSON
+    created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_job_status_run_after', 'status', 'run_after'),  # Busca da próxima tarefa pelo worker
+    )
+
+    def to_dict(self):
+        """Converte o modelo para um dicionário."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'payload': json.loads(self.payload),
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_after': self.run_after.isoformat(),
+            'locked_by': self.locked_by,
+            'lease_expires_at': self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            'last_error': self.last_error,
+            'result': json.loads(self.result) if self.result else None,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        """Representação em string do modelo Job."""
+        return f'<Job {self.id} {self.name} ({self.status})>'
@@ -14,7 +14,7 @@ class Message(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
 
     # Relacionamento com Project
-    project = db.relationship('Project', backref=db.backref('messages', lazy=True, cascade='all, delete'))
+    project = db.relationship('Project', backref=db.backref('messages', lazy=True, cascade='all, delete', passive_deletes=True))
 
     def to_dict(self):
         """Converte o modelo para um dicionário."""
@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime
+
+class MessageArchive(db.Model):
+    """Modelo que armazena as mensagens arquivadas de um projeto em um bloco comprimido."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), unique=True, nullable=False)  # Um segmento por projeto
+    codec = db.Column(db.String(10), nullable=False)  # Algoritmo de compressão ('zstd' ou 'gzip')
+    message_count = db.Column(db.Integer, nullable=False)  # Quantidade de mensagens no segmento
+    raw_size = db.Column(db.Integer, nullable=False)  # Tamanho em bytes do JSON antes da compressão
+    compressed_size = db.Column(db.Integer, nullable=False)  # Tamanho em bytes do segmento comprimido
+    payload = db.Column(db.LargeBinary, nullable=False)  # Lista de mensagens serializada em JSON e comprimida
+    created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.today, onupdate=datetime.today, nullable=False)
+
+    # Relacionamento com Project
+    project = db.relationship('Project', backref=db.backref('message_archive', uselist=False, lazy=True, cascade='all, delete', passive_deletes=True))
+
+    def to_dict(self):
+        """Converte o modelo para um dicionário (sem o conteúdo comprimido)."""
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'codec': self.codec,
+            'message_count': self.message_count,
+            'raw_size': self.raw_size,
+            'compressed_size': self.compressed_size,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+    def __repr__(self):
+        """Representação em string do modelo MessageArchive."""
+        return f'<MessageArchive for Project {self.project_id}>'
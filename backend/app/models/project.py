@@ -10,14 +10,26 @@ class Project(db.Model):
     skills_required = db.Column(db.Text)  
     budget = db.Column(db.Float)  
     deadline = db.Column(db.DateTime)  
-    status = db.Column(db.String(20), default='open', nullable=False)  # Status do projeto (ex: 'open', 'in progress', 'completed')
+    status = db.Column(db.String(20), default='open', nullable=False)  # Status do projeto (ex: 'open', 'in progress', 'completed', 'expired')
     client_id = db.Column(db.Integer, db.ForeignKey('client.id', ondelete='CASCADE'), nullable=False)
     freelancer_id = db.Column(db.Integer, db.ForeignKey('freelancer.id', ondelete='SET NULL'), nullable=True)  # Freelancer contratado
     created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)  
+    completed_at = db.Column(db.DateTime, nullable=True)  # Data em que o projeto foi concluído
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)  # Controle de concorrência otimista (ETag)
 
-    # Relacionamentos
-    client = db.relationship('Client', backref=db.backref('projects', lazy=True, cascade='all, delete'))
-    freelancer = db.relationship('Freelancer', backref=db.backref('projects', lazy=True))
+    __table_args__ = (
+        db.Index('ix_project_status_deadline', 'status', 'deadline'),  # Listagem de abertos e expiração por prazo
+        db.Index('ix_project_status_budget', 'status', 'budget', 'deadline'),  # Busca por orçamento (cobre o filtro de prazo e as facetas)
+        db.Index('ix_project_client_id', 'client_id'),  # Projetos de um cliente (listagem e filtro da busca)
+        db.Index('ix_project_freelancer_status', 'freelancer_id', 'status'),  # Projetos de um freelancer (e reconciliação da carga)
+    )
+
+    # Todo UPDATE do ORM exige a versão lida e a incrementa (app/services/versioning.py)
+    __mapper_args__ = {'version_id_col': version}
+
+    # Relacionamentos (as exclusões em cascata ficam a cargo do ON DELETE das chaves estrangeiras)
+    client = db.relationship('Client', backref=db.backref('projects', lazy=True, cascade='all, delete', passive_deletes=True))
+    freelancer = db.relationship('Freelancer', backref=db.backref('projects', lazy=True, passive_deletes=True))
 
     def to_dict(self):
         """Converte o modelo para um dicionário."""
@@ -31,7 +43,9 @@ class Project(db.Model):
             'status': self.status,
             'client_id': self.client_id,
             'freelancer_id': self.freelancer_id,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat(),
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'version': self.version
         }
 
     def __repr__(self):
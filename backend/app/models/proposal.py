@@ -12,10 +12,18 @@ class Proposal(db.Model):
     message = db.Column(db.Text)  
     status = db.Column(db.String(20), default='pending', nullable=False)  # Status: pending, accepted, rejected
     created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)  
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)  # Controle de concorrência otimista (ETag)
+
+    __table_args__ = (
+        db.Index('ux_proposal_project_freelancer', 'project_id', 'freelancer_id', unique=True),  # Uma proposta por freelancer e projeto
+    )
+
+    # Todo UPDATE do ORM exige a versão lida e a incrementa (app/services/versioning.py)
+    __mapper_args__ = {'version_id_col': version}
 
     # Relacionamentos com as models Project e Freelancer
-    project = db.relationship('Project', backref=db.backref('proposals', lazy=True, cascade='all, delete'))
-    freelancer = db.relationship('Freelancer', backref=db.backref('proposals', lazy=True, cascade='all, delete'))
+    project = db.relationship('Project', backref=db.backref('proposals', lazy=True, cascade='all, delete', passive_deletes=True))
+    freelancer = db.relationship('Freelancer', backref=db.backref('proposals', lazy=True, cascade='all, delete', passive_deletes=True))
 
     def to_dict(self):
         """Converte o modelo para um dicionário."""
@@ -27,7 +35,8 @@ class Proposal(db.Model):
             'estimated_days': self.estimated_days,
             'message': self.message,
             'status': self.status,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat(),
+            'version': self.version
         }
 
     def __repr__(self):
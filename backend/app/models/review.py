@@ -13,9 +13,9 @@ class Review(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
 
     # Relacionamentos
-    project = db.relationship('Project', backref=db.backref('reviews', lazy=True, cascade='all, delete'))
-    freelancer = db.relationship('Freelancer', backref=db.backref('reviews', lazy=True, cascade='all, delete'))
-    client = db.relationship('Client', backref=db.backref('reviews', lazy=True, cascade='all, delete'))
+    project = db.relationship('Project', backref=db.backref('reviews', lazy=True, cascade='all, delete', passive_deletes=True))
+    freelancer = db.relationship('Freelancer', backref=db.backref('reviews', lazy=True, cascade='all, delete', passive_deletes=True))
+    client = db.relationship('Client', backref=db.backref('reviews', lazy=True, cascade='all, delete', passive_deletes=True))
 
     def to_dict(self):
         """Converte o modelo para um dicionário."""
@@ -0,0 +1,23 @@
+from app import db
+from datetime import datetime
+
+class RevokedToken(db.Model):
+    """Modelo que registra tokens JWT revogados (logout) até a sua expiração."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)  # Identificador único do token (claim 'jti')
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Após esta data o registro pode ser descartado
+    created_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+
+    def to_dict(self):
+        """Converte o modelo para um dicionário."""
+        return {
+            'id': self.id,
+            'jti': self.jti,
+            'expires_at': self.expires_at.isoformat(),
+            'created_at': self.created_at.isoformat()
+        }
+
+    def __repr__(self):
+        """Representação em string do modelo RevokedToken."""
+        return f'<RevokedToken {self.jti}>'
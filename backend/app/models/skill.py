@@ -11,7 +11,8 @@ freelancer_skills = db.Table(
 project_skills = db.Table(
     'project_skills',
     db.Column('project_id', db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True),
-    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True)
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_project_skills_skill_id', 'skill_id', 'project_id')  # Filtro e faceta por habilidade na busca
 )
 
 class Skill(db.Model):
@@ -21,8 +22,8 @@ class Skill(db.Model):
     name = db.Column(db.String(50), unique=True, nullable=False)  # Nome da habilidade (ex.: Python, React)
 
     # Relacionamentos (definidos via tabelas associativas)
-    freelancers = db.relationship('Freelancer', secondary=freelancer_skills, backref=db.backref('skill_set', lazy=True))
-    projects = db.relationship('Project', secondary=project_skills, backref=db.backref('required_skills', lazy=True))
+    freelancers = db.relationship('Freelancer', secondary=freelancer_skills, backref=db.backref('skill_set', lazy=True, passive_deletes=True), passive_deletes=True)
+    projects = db.relationship('Project', secondary=project_skills, backref=db.backref('required_skills', lazy=True, passive_deletes=True), passive_deletes=True)
 
     def to_dict(self):
         """Converte o modelo para um dicionário."""
@@ -0,0 +1,13 @@
+from app import db
+from datetime import datetime
+
+class SkillGraphSnapshot(db.Model):
+    """Modelo que guarda o grafo de coocorrência de habilidades pré-calculado."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    payload = db.Column(db.Text, nullable=False)  # Habilidades relacionadas serializadas em JSON
+    computed_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+
+    def __repr__(self):
+        """Representação em string do modelo SkillGraphSnapshot."""
+        return f'<SkillGraphSnapshot {self.computed_at}>'
\ No newline at end of file
@@ -0,0 +1,13 @@
+from app import db
+from datetime import datetime
+
+class StatsSnapshot(db.Model):
+    """Modelo que guarda as estatísticas do painel administrativo pré-calculadas."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    payload = db.Column(db.Text, nullable=False)  # Estatísticas serializadas em JSON
+    computed_at = db.Column(db.DateTime, default=datetime.today, nullable=False)
+
+    def __repr__(self):
+        """Representação em string do modelo StatsSnapshot."""
+        return f'<StatsSnapshot {self.computed_at}>'
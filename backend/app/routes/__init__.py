@@ -6,6 +6,7 @@ from app.routes.proposal_routes import proposal_bp
 from app.routes.admin_routes import admin_bp
 from app.routes.message_routes import message_bp
 from app.routes.recommendation_routes import recommendation_bp
+from app.routes.skill_routes import skill_bp
 
 def register_routes(app):
     """Registra todos os Blueprints de rotas na aplicação Flask."""
@@ -16,4 +17,5 @@ def register_routes(app):
     app.register_blueprint(proposal_bp, url_prefix='/proposal')
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(message_bp, url_prefix='/message')
-    app.register_blueprint(recommendation_bp, url_prefix='/recommendation')
\ No newline at end of file
+    app.register_blueprint(recommendation_bp, url_prefix='/recommendation')
+    app.register_blueprint(skill_bp, url_prefix='/skill')
\ No newline at end of file
@@ -1,10 +1,12 @@
 from flask import Blueprint
+from app.services.rate_limiter import rate_limit
 from app.controllers.admin_controller import AdminController
 
 # Cria um Blueprint para rotas relacionadas a administradores
 admin_bp = Blueprint('admin', __name__)
 
 @admin_bp.route('/login', methods=['POST'])
+@rate_limit('login', by_email=True)
 def login():
     """Rota para login de administrador."""
     return AdminController.login()
@@ -77,4 +79,49 @@ def update_proposal(proposal_id):
 @admin_bp.route('/proposal/<int:proposal_id>', methods=['DELETE'])
 def delete_proposal(proposal_id):
     """Rota para deletar uma proposta existente."""
-    return AdminController.delete_proposal(proposal_id)
\ No newline at end of file
+    return AdminController.delete_proposal(proposal_id)
+
+@admin_bp.route('/import/<string:kind>', methods=['POST'])
+def import_users(kind):
+    """Rota para importar clientes ou freelancers em lote (CSV ou NDJSON)."""
+    return AdminController.import_users(kind)
+
+@admin_bp.route('/export/<string:name>', methods=['GET'])
+def export_data(name):
+    """Rota para exportar uma tabela em streaming (CSV, NDJSON ou Parquet)."""
+    return AdminController.export_data(name)
+
+@admin_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """Rota para obter as estatísticas do painel administrativo."""
+    return AdminController.get_stats()
+
+@admin_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Rota para obter métricas internas dos serviços."""
+    return AdminController.get_metrics()
+
+@admin_bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    """Rota para listar as tarefas da fila."""
+    return AdminController.get_jobs()
+
+@admin_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """Rota para enfileirar uma tarefa de manutenção."""
+    return AdminController.create_job()
+
+@admin_bp.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Rota para consultar o status de uma tarefa."""
+    return AdminController.get_job(job_id)
+
+@admin_bp.route('/profiles', methods=['GET'])
+def get_profiles():
+    """Rota para listar os perfis de requisições gravados."""
+    return AdminController.get_profiles()
+
+@admin_bp.route('/profiles/<string:name>', methods=['GET'])
+def download_profile(name):
+    """Rota para baixar um arquivo de perfil."""
+    return AdminController.download_profile(name)
\ No newline at end of file
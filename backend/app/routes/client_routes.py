@@ -1,15 +1,18 @@
 from flask import Blueprint
+from app.services.rate_limiter import rate_limit
 from app.controllers.client_controller import ClientController
 
 # Cria um Blueprint para rotas relacionadas a clientes
 client_bp = Blueprint('client', __name__)
 
 @client_bp.route('/register', methods=['POST'])
+@rate_limit('register')
 def register():
     """Rota para registrar um novo cliente."""
     return ClientController.register()
 
 @client_bp.route('/login', methods=['POST'])
+@rate_limit('login', by_email=True)
 def login():
     """Rota para realizar login do cliente."""
     return ClientController.login()
@@ -25,16 +28,19 @@ def get_profile():
     return ClientController.get_profile()
 
 @client_bp.route('/profile', methods=['PUT'])
+@rate_limit('write')
 def update_profile():
     """Rota para atualizar o perfil do cliente autenticado."""
     return ClientController.update_profile()
 
 @client_bp.route('/account', methods=['DELETE'])
+@rate_limit('write')
 def delete_account():
     """Rota para deletar a conta do cliente autenticado."""
     return ClientController.delete_account()
 
 @client_bp.route('/review', methods=['POST'])
+@rate_limit('write')
 def create_review():
     """Rota para criar uma avaliação para um freelancer."""
     return ClientController.create_review()
\ No newline at end of file
@@ -1,15 +1,18 @@
 from flask import Blueprint
+from app.services.rate_limiter import rate_limit
 from app.controllers.freelancer_controller import FreelancerController
 
 # Cria um Blueprint para rotas relacionadas a freelancers
 freelancer_bp = Blueprint('freelancer', __name__)
 
 @freelancer_bp.route('/register', methods=['POST'])
+@rate_limit('register')
 def register():
     """Rota para registrar um novo freelancer."""
     return FreelancerController.register()
 
 @freelancer_bp.route('/login', methods=['POST'])
+@rate_limit('login', by_email=True)
 def login():
     """Rota para realizar login do freelancer."""
     return FreelancerController.login()
@@ -25,6 +28,7 @@ def get_profile():
     return FreelancerController.get_profile()
 
 @freelancer_bp.route('/profile', methods=['PUT'])
+@rate_limit('write')
 def update_profile():
     """Rota para atualizar o perfil do freelancer autenticado."""
     return FreelancerController.update_profile()
@@ -35,6 +39,7 @@ def get_me():
     return FreelancerController.get_me()
 
 @freelancer_bp.route('/account', methods=['DELETE'])
+@rate_limit('write')
 def delete_account():
     """Rota para deletar a conta do freelancer autenticado."""
     return FreelancerController.delete_account()
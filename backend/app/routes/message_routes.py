@@ -1,10 +1,14 @@
 from flask import Blueprint
+from app.services.idempotency import idempotent
+from app.services.rate_limiter import rate_limit
 from app.controllers.message_controller import MessageController
 
 # Cria um Blueprint para rotas relacionadas a mensagens
 message_bp = Blueprint('message', __name__)
 
 @message_bp.route('/', methods=['POST'])
+@idempotent
+@rate_limit('write')
 def send_message():
     """Rota para enviar uma mensagem vinculada a um projeto."""
     return MessageController.send_message()
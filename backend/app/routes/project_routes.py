@@ -1,10 +1,14 @@
 from flask import Blueprint
+from app.services.idempotency import idempotent
+from app.services.rate_limiter import rate_limit
 from app.controllers.project_controller import ProjectController
 
 # Cria um Blueprint para rotas relacionadas a projetos
 project_bp = Blueprint('project', __name__)
 
 @project_bp.route('/create', methods=['POST'])
+@idempotent
+@rate_limit('write')
 def create():
     """Rota para criar um novo projeto."""
     return ProjectController.create()
@@ -14,22 +18,30 @@ def get_all():
     """Rota para listar todos os projetos do cliente autenticado."""
     return ProjectController.get_all()
 
+@project_bp.route('/search', methods=['GET'])
+def search():
+    """Rota para buscar projetos abertos com filtros e facetas."""
+    return ProjectController.search()
+
 @project_bp.route('/<int:project_id>', methods=['GET'])
 def get(project_id):
     """Rota para obter os detalhes de um projeto específico."""
     return ProjectController.get(project_id)
 
 @project_bp.route('/<int:project_id>', methods=['PUT'])
+@rate_limit('write')
 def update(project_id):
     """Rota para atualizar um projeto existente."""
     return ProjectController.update(project_id)
 
 @project_bp.route('/<int:project_id>', methods=['DELETE'])
+@rate_limit('write')
 def delete(project_id):
     """Rota para deletar um projeto existente."""
     return ProjectController.delete(project_id)
 
 @project_bp.route('/<int:project_id>/complete', methods=['PATCH'])
+@rate_limit('write')
 def complete(project_id):
     """Rota para marcar um projeto como concluído."""
-    return ProjectController.complete()
\ No newline at end of file
+    return ProjectController.complete(project_id)
\ No newline at end of file
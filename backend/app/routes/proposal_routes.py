@@ -1,10 +1,14 @@
 from flask import Blueprint
+from app.services.idempotency import idempotent
+from app.services.rate_limiter import rate_limit
 from app.controllers.proposal_controller import ProposalController
 
 # Cria um Blueprint para rotas relacionadas a propostas
 proposal_bp = Blueprint('proposal', __name__)
 
 @proposal_bp.route('/create', methods=['POST'])
+@idempotent
+@rate_limit('write')
 def create():
     """Rota para criar uma nova proposta para um projeto."""
     return ProposalController.create()
@@ -20,11 +24,13 @@ def get(proposal_id):
     return ProposalController.get(proposal_id)
 
 @proposal_bp.route('/<int:proposal_id>', methods=['PUT'])
+@rate_limit('write')
 def update(proposal_id):
     """Rota para atualizar o status de uma proposta."""
     return ProposalController.update(proposal_id)
 
 @proposal_bp.route('/<int:proposal_id>', methods=['DELETE'])
+@rate_limit('write')
 def delete(proposal_id):
     """Rota para deletar uma proposta."""
     return ProposalController.delete(proposal_id)
@@ -35,6 +41,7 @@ def get_freelancer_proposals():
     return ProposalController.get_freelancer_proposals()
 
 @proposal_bp.route('/<int:proposal_id>/complete', methods=['PATCH'])
+@rate_limit('write')
 def complete(proposal_id):
     """Rota para marcar uma proposta como concluída pelo freelancer."""
     return ProposalController.complete(proposal_id)
\ No newline at end of file
@@ -0,0 +1,22 @@
+from flask import Blueprint
+from app.services.rate_limiter import rate_limit
+from app.controllers.skill_controller import SkillController
+
+# Cria um Blueprint para rotas relacionadas a habilidades
+skill_bp = Blueprint('skill', __name__)
+
+@skill_bp.route('/suggest', methods=['GET'])
+def suggest():
+    """Rota para sugerir habilidades enquanto o usuário digita."""
+    return SkillController.suggest()
+
+@skill_bp.route('/resolve', methods=['POST'])
+@rate_limit('write')
+def resolve():
+    """Rota para obter (ou criar) os ids de uma lista de habilidades."""
+    return SkillController.resolve()
+
+@skill_bp.route('/<int:skill_id>/related', methods=['GET'])
+def related(skill_id):
+    """Rota para listar as habilidades relacionadas a uma habilidade."""
+    return SkillController.related(skill_id)
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""Utilitários para manter o esquema do banco sincronizado com as models.
+
+Aplicar o esquema (``create_all`` e a reflexão das tabelas) em toda
+inicialização custa várias consultas por processo e faz os workers disputarem
+o ALTER TABLE quando sobem juntos. Depois de aplicado, o esquema fica
+registrado na tabela ``schema_version`` com uma impressão digital das models;
+na inicialização basta comparar esse valor (uma consulta) e, em produção,
+aplicar as mudanças com ``python migrate.py`` antes do deploy.
+"""
+
+import hashlib
+from datetime import datetime
+
+from sqlalchemy import exc, inspect, text
+from app import db
+
+STARTUP_MODES = ['upgrade', 'check', 'skip']
+
+_fingerprint = None
+
+
+class SchemaOutdated(RuntimeError):
+    """Lançada na inicialização quando o banco não corresponde às models."""
+
+
+class DuplicateRows(RuntimeError):
+    """Lançada quando um índice único novo não pode ser criado porque a tabela tem linhas repetidas."""
+
+
+def _column_ddl(column, dialect):
+    """Monta a definição SQL de uma coluna para uso em ALTER TABLE."""
+    ddl = f'{column.name} {column.type.compile(dialect=dialect)}'
+    if column.server_default is not None:
+        default = column.server_default.arg
+        default = default.text if hasattr(default, 'text') else f"'{default}'"
+        ddl += f' DEFAULT {default}'
+    return ddl
+
+
+def _duplicate_count(conn, index):
+    """Linhas que violariam o índice único (além da primeira de cada grupo; NULL não conta como repetição)."""
+    columns = [column.name for column in index.columns]
+    return conn.execute(text(
+        f'SELECT COALESCE(SUM(total - 1), 0) FROM ('
+        f'SELECT COUNT(*) AS total FROM {index.table.name} '
+        f'WHERE {" AND ".join(f"{column} IS NOT NULL" for column in columns)} '
+        f'GROUP BY {", ".join(columns)} HAVING COUNT(*) > 1) duplicated'
+    )).scalar()
+
+
+def blocked_unique_indexes(conn, inspector):
+    """Índices únicos ainda não criados cujas tabelas têm duplicatas: ``[(índice, linhas duplicadas)]``."""
+    blocked = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if not index.unique or index.name in existing_indexes:
+                continue
+            if not all(column.name in existing_columns for column in index.columns):
+                continue
+            count = _duplicate_count(conn, index)
+            if count:
+                blocked.append((index, count))
+    return blocked
+
+
+def _remove_duplicate_proposals(conn):
+    """Mantém uma proposta por projeto e freelancer (a aceita ou, senão, a mais antiga); retorna as removidas."""
+    removed = conn.execute(text(
+        'SELECT id, project_id, freelancer_id, status FROM ('
+        ' SELECT id, project_id, freelancer_id, status, ROW_NUMBER() OVER ('
+        '  PARTITION BY project_id, freelancer_id'
+        "  ORDER BY CASE WHEN status IN ('accepted', 'completed_by_freelancer') THEN 0 ELSE 1 END, id"
+        ' ) AS position FROM proposal'
+        ') ranked WHERE position > 1 ORDER BY id'
+    )).mappings().all()
+    conn.execute(text('DELETE FROM proposal WHERE id = :id'), [{'id': row['id']} for row in removed])
+    return [dict(row) for row in removed]
+
+
+# Limpeza das duplicatas que impedem um índice único, executada só por ``migrate.py --remove-duplicates``
+DUPLICATE_REMOVERS = {
+    'ux_proposal_project_freelancer': _remove_duplicate_proposals
+}
+
+
+def remove_duplicates():
+    """Remove as duplicatas dos índices únicos pendentes; retorna ``{nome do índice: linhas removidas}``."""
+    removed = {}
+    with db.engine.begin() as conn:
+        for index, _ in blocked_unique_indexes(conn, inspect(conn)):
+            if index.name in DUPLICATE_REMOVERS:
+                removed[index.name] = DUPLICATE_REMOVERS[index.name](conn)
+    return removed
+
+
+def upgrade_schema():
+    """Cria as tabelas ausentes e adiciona colunas e índices novos em tabelas existentes.
+
+    O projeto não usa uma ferramenta de migrações e ``db.create_all`` só cria
+    tabelas que ainda não existem, então colunas adicionadas às models depois
+    da criação do banco precisam ser aplicadas com ALTER TABLE (e os índices
+    declarados depois, com CREATE INDEX).
+
+    Um índice único novo não é criado sobre dados duplicados: nada é alterado
+    e ``DuplicateRows`` informa quantas linhas impedem cada índice. A remoção
+    é feita explicitamente com ``python migrate.py --remove-duplicates``.
+    """
+    with db.engine.connect() as conn:
+        blocked = blocked_unique_indexes(conn, inspect(conn))
+    if blocked:
+        details = '; '.join(f'{index.name}: {count} linhas duplicadas em {index.table.name}' for index, count in blocked)
+        raise DuplicateRows(
+            f"Índices únicos não criados ({details}). "
+            "Execute 'python migrate.py --remove-duplicates' para removê-las."
+        )
+
+    db.create_all()
+
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {_column_ddl(column, db.engine.dialect)}'))
+
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+
+
+    _write_version(schema_fingerprint())
+
+
+def schema_fingerprint():
+    """Resume tabelas, colunas e índices das models em um identificador (calculado uma vez)."""
+    global _fingerprint
+    if _fingerprint is None:
+        parts = []
+        for table in db.metadata.sorted_tables:
+            parts.append(table.name)
+            parts.extend(f'{column.name}:{column.type}:{column.nullable}' for column in table.columns)
+            # ``table.indexes`` é um conjunto: a ordem varia entre processos
+            parts.extend(sorted(f'{index.name}:{",".join(column.name for column in index.columns)}' for index in table.indexes))
+        _fingerprint = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+    return _fingerprint
+
+
+def stored_version():
+    """Retorna a versão registrada no banco, ou ``None`` se o esquema nunca foi aplicado."""
+    try:
+        with db.engine.connect() as conn:
+            return conn.execute(text('SELECT version FROM schema_version WHERE id = 1')).scalar()
+    except exc.DBAPIError:
+        return None
+
+
+def _write_version(version):
+    """Registra a versão do esquema aplicada."""
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_version '
+            '(id INTEGER PRIMARY KEY, version VARCHAR(40) NOT NULL, applied_at DATETIME NOT NULL)'
+        ))
+        conn.execute(text('DELETE FROM schema_version'))
+        conn.execute(text('INSERT INTO schema_version (id, version, applied_at) VALUES (1, :version, :applied_at)'),
+                     {'version': version, 'applied_at': datetime.today()})
+
+
+def ensure_schema(mode='upgrade'):
+    """Verifica o esquema na inicialização da aplicação.
+
+    - ``upgrade``: aplica o esquema apenas se a versão registrada for diferente;
+    - ``check``: recusa a inicialização se o esquema estiver desatualizado;
+    - ``skip``: não consulta o banco.
+    """
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"SCHEMA_STARTUP inválido. Use: {', '.join(STARTUP_MODES)}.")
+    if mode == 'skip' or stored_version() == schema_fingerprint():
+        return
+    if mode == 'check':
+        raise SchemaOutdated("O esquema do banco está desatualizado. Execute 'python migrate.py' antes de iniciar a aplicação.")
+    upgrade_schema()
@@ -0,0 +1,147 @@
+"""Exclusão de clientes, freelancers e projetos apoiada no ON DELETE do banco.
+
+As chaves estrangeiras já declaram ``ON DELETE CASCADE``/``SET NULL`` e os
+relacionamentos usam ``passive_deletes``, então excluir a linha pai não carrega
+os filhos na sessão: o banco remove tudo em um único comando. Para contas muito
+grandes, até esse comando único seguraria o lock de escrita por muito tempo;
+nesses casos a exclusão é feita em blocos, com um commit por bloco, por uma
+tarefa da fila (``purge_entity``).
+"""
+
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+
+from app import db
+from app.models.client import Client
+from app.models.freelancer import Freelancer
+from app.models.message import Message
+from app.models.project import Project
+from app.models.proposal import Proposal
+from app.models.review import Review
+from app.services import entity_cache, freelancer_load
+from app.services.job_queue import enqueue
+from app.services.versioning import bump
+
+MODELS = {'client': Client, 'freelancer': Freelancer, 'project': Project}
+
+
+def dependent_rows(kind, entity_id):
+    """Estima quantas linhas serão removidas junto com a entidade (uma consulta)."""
+    if kind == 'client':
+        project_ids = select(Project.id).where(Project.client_id == entity_id).scalar_subquery()
+        counts = [
+            select(func.count(Project.id)).where(Project.client_id == entity_id),
+            select(func.count(Proposal.id)).where(Proposal.project_id.in_(project_ids)),
+            select(func.count(Message.id)).where(Message.project_id.in_(project_ids))
+        ]
+    elif kind == 'freelancer':
+        counts = [
+            select(func.count(Proposal.id)).where(Proposal.freelancer_id == entity_id),
+            select(func.count(Review.id)).where(Review.freelancer_id == entity_id)
+        ]
+    else:
+        counts = [
+            select(func.count(Proposal.id)).where(Proposal.project_id == entity_id),
+            select(func.count(Message.id)).where(Message.project_id == entity_id)
+        ]
+    total = counts[0].scalar_subquery()
+    for count in counts[1:]:
+        total = total + count.scalar_subquery()
+    return db.session.execute(select(total)).scalar()
+
+
+def affected_projects(kind, entity_id):
+    """Ids dos projetos removidos (cliente) ou desvinculados (freelancer) junto com a entidade."""
+    if kind == 'client':
+        condition = Project.client_id == entity_id
+    elif kind == 'freelancer':
+        condition = Project.freelancer_id == entity_id
+    else:
+        return [entity_id]
+    return list(db.session.execute(select(Project.id).where(condition)).scalars())
+
+
+def _released_projects(kind, entity_id):
+    """Desconta da carga dos freelancers os projetos em andamento que serão removidos (sem commit)."""
+    if kind == 'client':
+        return freelancer_load.release_projects(Project.client_id == entity_id)
+    if kind == 'project':
+        return freelancer_load.release_projects(Project.id == entity_id)
+    return []
+
+
+def _invalidate_cache(kind, entity_id, project_ids, freelancer_ids=()):
+    """Remove do cache a entidade, os projetos alterados pelo ON DELETE do banco e a carga dos freelancers."""
+    entity_cache.invalidate('project', *project_ids)
+    entity_cache.invalidate('freelancer', *freelancer_ids)
+    if kind != 'project':
+        entity_cache.invalidate(kind, entity_id)
+
+
+def delete_now(kind, entity_id):
+    """Exclui a entidade com um único DELETE; o banco cuida da cascata. Faz commit."""
+    model = MODELS[kind]
+    project_ids = affected_projects(kind, entity_id)
+    freelancer_ids = _released_projects(kind, entity_id)
+    deleted = db.session.execute(delete(model).where(model.id == entity_id)).rowcount
+    db.session.commit()
+    _invalidate_cache(kind, entity_id, project_ids, freelancer_ids)
+    return deleted
+
+
+def _delete_in_chunks(model, condition, chunk_size):
+    """Remove as linhas que atendem à condição em blocos, com um commit por bloco."""
+    total = 0
+    while True:
+        ids = select(model.id).where(condition).limit(chunk_size).scalar_subquery()
+        deleted = db.session.execute(delete(model).where(model.id.in_(ids))).rowcount
+        db.session.commit()
+        total += deleted
+        if deleted < chunk_size:
+            return total
+
+
+def purge(kind, entity_id, chunk_size=None):
+    """Exclui a entidade e os seus dependentes em blocos; retorna a quantidade de linhas removidas."""
+    chunk_size = chunk_size or current_app.config.get('PURGE_CHUNK_SIZE', 1000)
+    project_ids = affected_projects(kind, entity_id)
+    freelancer_ids = []
+    removed = 0
+
+    if kind == 'client':
+        client_projects = select(Project.id).where(Project.client_id == entity_id)
+        removed += _delete_in_chunks(Message, Message.project_id.in_(client_projects), chunk_size)
+        removed += _delete_in_chunks(Proposal, Proposal.project_id.in_(client_projects), chunk_size)
+        removed += _delete_in_chunks(Review, Review.client_id == entity_id, chunk_size)
+        # Descontada junto com o primeiro bloco; uma falha no meio é corrigida pela reconciliação
+        freelancer_ids = _released_projects(kind, entity_id)
+        removed += _delete_in_chunks(Project, Project.client_id == entity_id, chunk_size)
+    elif kind == 'freelancer':
+        removed += _delete_in_chunks(Proposal, Proposal.freelancer_id == entity_id, chunk_size)
+        removed += _delete_in_chunks(Review, Review.freelancer_id == entity_id, chunk_size)
+        while True:
+            ids = select(Project.id).where(Project.freelancer_id == entity_id).limit(chunk_size).scalar_subquery()
+            updated = db.session.execute(update(Project).where(Project.id.in_(ids)).values(freelancer_id=None, version=bump(Project))).rowcount
+            db.session.commit()
+            if updated < chunk_size:
+                break
+    else:
+        removed += _delete_in_chunks(Message, Message.project_id == entity_id, chunk_size)
+        removed += _delete_in_chunks(Proposal, Proposal.project_id == entity_id, chunk_size)
+
+    removed += delete_now(kind, entity_id)
+    # Projetos lidos (e colocados em cache) entre um bloco e outro
+    _invalidate_cache(kind, entity_id, project_ids, freelancer_ids)
+    return removed
+
+
+def delete_entity(kind, entity_id):
+    """Exclui a entidade agora ou, se for grande demais, enfileira a exclusão em blocos.
+
+    Retorna ``None`` quando a exclusão foi concluída e o Job enfileirado
+    quando ela foi adiada.
+    """
+    if dependent_rows(kind, entity_id) <= current_app.config.get('PURGE_SYNC_MAX_ROWS', 5000):
+        delete_now(kind, entity_id)
+        return None
+    return enqueue('purge_entity', {'kind': kind, 'entity_id': entity_id})
@@ -0,0 +1,114 @@
+"""Estatísticas pré-calculadas para o painel administrativo.
+
+O painel calculava os totais baixando todos os clientes, freelancers, projetos
+e propostas. Aqui as estatísticas são calculadas com consultas agregadas por
+um job (``refresh_stats.py``) e gravadas como um snapshot; o endpoint apenas
+lê o snapshot mais recente, que ainda fica em memória por alguns segundos.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func
+
+from app import db
+from app.models.client import Client
+from app.models.freelancer import Freelancer
+from app.models.project import Project
+from app.models.proposal import Proposal
+from app.models.review import Review
+from app.models.stats_snapshot import StatsSnapshot
+
+_lock = threading.Lock()
+_cached = None
+_cached_until = 0.0
+
+
+def _daily_series(model, start):
+    """Conta as linhas criadas por dia a partir de ``start``."""
+    day = func.date(model.created_at)
+    rows = db.session.query(day, func.count(model.id)).filter(model.created_at >= start).group_by(day).all()
+    return {str(date): count for date, count in rows}
+
+
+def compute_stats(days=None):
+    """Calcula as estatísticas com consultas agregadas (sem carregar as linhas)."""
+    days = days or current_app.config.get('ADMIN_STATS_SERIES_DAYS', 30)
+    start = (datetime.today() - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    projects_by_status = dict(db.session.query(Project.status, func.count(Project.id)).group_by(Project.status).all())
+    proposals_by_status = dict(db.session.query(Proposal.status, func.count(Proposal.id)).group_by(Proposal.status).all())
+    average_rating, review_count = db.session.query(func.avg(Review.rating), func.count(Review.id)).one()
+
+    series = {
+        'clients': _daily_series(Client, start),
+        'freelancers': _daily_series(Freelancer, start),
+        'projects': _daily_series(Project, start)
+    }
+    dates = [(start + timedelta(days=offset)).date().isoformat() for offset in range(days)]
+
+    return {
+        'totals': {
+            'clients': db.session.query(func.count(Client.id)).scalar(),
+            'freelancers': db.session.query(func.count(Freelancer.id)).scalar(),
+            'projects': sum(projects_by_status.values()),
+            'proposals': sum(proposals_by_status.values()),
+            'reviews': review_count
+        },
+        'projects_by_status': projects_by_status,
+        'proposals_by_status': proposals_by_status,
+        'total_budget': db.session.query(func.coalesce(func.sum(Project.budget), 0)).scalar(),
+        'bid_volume': db.session.query(func.coalesce(func.sum(Proposal.bid_amount), 0)).scalar(),
+        'accepted_bid_volume': db.session.query(func.coalesce(func.sum(Proposal.bid_amount), 0)).filter(
+            Proposal.status.in_(['accepted', 'completed_by_freelancer'])
+        ).scalar(),
+        'average_rating': round(average_rating, 2) if average_rating else None,
+        'daily': [
+            {
+                'date': date,
+                'new_clients': series['clients'].get(date, 0),
+                'new_freelancers': series['freelancers'].get(date, 0),
+                'new_projects': series['projects'].get(date, 0)
+            }
+            for date in dates
+        ]
+    }
+
+
+def refresh_stats():
+    """Recalcula as estatísticas e substitui o snapshot gravado. Faz commit."""
+    global _cached, _cached_until
+
+    stats = compute_stats()
+    snapshot = StatsSnapshot(payload=json.dumps(stats))
+    StatsSnapshot.query.delete()
+    db.session.add(snapshot)
+    db.session.commit()
+
+    result = dict(stats, computed_at=snapshot.computed_at.isoformat())
+    with _lock:
+        _cached = result
+        _cached_until = time.monotonic() + current_app.config.get('ADMIN_STATS_CACHE_SECONDS', 10)
+    return result
+
+
+def get_stats():
+    """Retorna o snapshot mais recente (da memória, do banco ou calculado na primeira vez)."""
+    global _cached, _cached_until
+
+    with _lock:
+        if _cached is not None and time.monotonic() < _cached_until:
+            return _cached
+
+    snapshot = StatsSnapshot.query.order_by(StatsSnapshot.id.desc()).first()
+    if snapshot is None:
+        return refresh_stats()
+
+    result = dict(json.loads(snapshot.payload), computed_at=snapshot.computed_at.isoformat())
+    with _lock:
+        _cached = result
+        _cached_until = time.monotonic() + current_app.config.get('ADMIN_STATS_CACHE_SECONDS', 10)
+    return result
@@ -0,0 +1,275 @@
+"""Cache de leitura das entidades mais consultadas (projeto, cliente e freelancer).
+
+``GET /project/<id>``, os perfis e ``/freelancer/me`` consultavam o banco a
+cada chamada, mas essas linhas mudam pouco. Aqui a representação (``to_dict``)
+de cada entidade fica em cache, com chave ``tipo:id``: a primeira leitura
+popula o cache e as seguintes não tocam no banco. A autorização continua sendo
+feita a cada requisição, sobre os campos da própria representação.
+
+A invalidação acompanha as escritas:
+
+- alterações e exclusões pelo ORM são capturadas pelos eventos
+  ``after_update``/``after_delete`` e a chave é removida na hora e de novo
+  após o commit;
+- os ``UPDATE``/``DELETE`` em lote (aceitação de propostas, expiração de
+  projetos, exclusão de contas) chamam ``invalidate`` explicitamente.
+
+A remoção deixa uma marca com o horário da invalidação; uma leitura iniciada
+antes dela não grava o valor antigo de volta. ``ENTITY_CACHE_TTL`` limita a
+vida de qualquer entrada.
+
+Os workers do gunicorn e o ``run_worker.py`` são processos separados e todos
+precisam enxergar as invalidações uns dos outros (o status e o freelancer do
+projeto em cache são usados na autorização). Por isso, por padrão, o cache
+fica em um arquivo SQLite ao lado do banco (``<banco>.entity-cache``),
+compartilhado por todos os processos que usam o mesmo banco.
+``ENTITY_CACHE_STORAGE`` pode apontar para outro arquivo
+(``sqlite:///caminho``) ou escolher ``memory``, um LRU por processo, aceito
+apenas em implantações de um único processo (o ``gunicorn.conf.py`` recusa
+``memory`` com mais de um worker).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.client import Client
+from app.models.freelancer import Freelancer
+from app.models.project import Project
+
+MODELS = {'project': Project, 'client': Client, 'freelancer': Freelancer}
+_KINDS = {model: kind for kind, model in MODELS.items()}
+
+
+class MemoryEntityStore:
+    """LRU em memória; entradas invalidadas ficam como marcas até saírem do LRU."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # chave -> (valor ou None, gravado/invalidado em, expira em)
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is None or entry[2] <= now:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, read_started, ttl, now):
+        """Grava o valor, exceto se a chave foi invalidada depois do início da leitura."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is None and entry[1] >= read_started:
+                return False
+            self._entries[key] = (value, now, now + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, keys, ttl, now):
+        with self._lock:
+            for key in keys:
+                self._entries[key] = (None, now, now + ttl)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for value, _, _ in self._entries.values() if value is not None)
+
+
+class SQLiteEntityStore:
+    """Entradas em um arquivo SQLite compartilhado entre os processos da máquina."""
+
+    name = 'sqlite'
+
+    def __init__(self, path, prune_interval=60):
+        self.path = path
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entity_cache ('
+                'key TEXT PRIMARY KEY, value TEXT, updated_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_entity_cache_expires_at ON entity_cache (expires_at)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, now):
+        row = self._connection().execute(
+            'SELECT value FROM entity_cache WHERE key = ? AND value IS NOT NULL AND expires_at > ?', (key, now)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, read_started, ttl, now):
+        """Grava o valor, exceto se a chave foi invalidada depois do início da leitura."""
+        conn = self._connection()
+        written = conn.execute(
+            'INSERT INTO entity_cache (key, value, updated_at, expires_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at, '
+            'expires_at = excluded.expires_at WHERE entity_cache.value IS NOT NULL OR entity_cache.updated_at < ?',
+            (key, json.dumps(value), now, now + ttl, read_started)
+        ).rowcount
+        if now >= self._next_prune:
+            conn.execute('DELETE FROM entity_cache WHERE expires_at < ?', (now,))
+            self._next_prune = now + self.prune_interval
+        return written == 1
+
+    def invalidate(self, keys, ttl, now):
+        self._connection().executemany(
+            'INSERT OR REPLACE INTO entity_cache (key, value, updated_at, expires_at) VALUES (?, NULL, ?, ?)',
+            [(key, now, now + ttl) for key in keys]
+        )
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM entity_cache WHERE value IS NOT NULL').fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {kind: {'hits': 0, 'misses': 0} for kind in MODELS}
+_invalidations = [0]
+
+
+def _default_storage():
+    """Arquivo compartilhado ao lado do banco SQLite; memória se o banco não é um arquivo (um único processo)."""
+    url = db.engine.url
+    if url.get_backend_name() == 'sqlite' and url.database and url.database != ':memory:':
+        return f'sqlite:///{url.database}.entity-cache'
+    return 'memory'
+
+
+def get_store():
+    """Retorna o armazenamento configurado, criado na primeira utilização."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                storage = current_app.config.get('ENTITY_CACHE_STORAGE') or _default_storage()
+                if storage == 'memory':
+                    _store = MemoryEntityStore(current_app.config.get('ENTITY_CACHE_MAX_ENTRIES', 10000))
+                elif storage.startswith('sqlite:///'):
+                    _store = SQLiteEntityStore(storage[len('sqlite:///'):])
+                else:
+                    raise ValueError("ENTITY_CACHE_STORAGE inválido. Use 'memory' ou 'sqlite:///caminho'.")
+    return _store
+
+
+def _key(kind, entity_id):
+    return f'{kind}:{int(entity_id)}'
+
+
+def _count(kind, field):
+    with _stats_lock:
+        _stats[kind][field] += 1
+
+
+def get_dict(kind, entity_id, load):
+    """Retorna o ``to_dict`` da entidade, do cache ou de ``load()`` (que retorna o modelo ou None).
+
+    Entidades inexistentes não são armazenadas.
+    """
+    config = current_app.config
+    if not config.get('ENTITY_CACHE_ENABLED', True):
+        entity = load()
+        return entity.to_dict() if entity is not None else None
+
+    store = get_store()
+    key = _key(kind, entity_id)
+    read_started = time.time()
+    value = store.get(key, read_started)
+    if value is not None:
+        _count(kind, 'hits')
+        return value
+
+    _count(kind, 'misses')
+    entity = load()
+    if entity is None:
+        return None
+    value = entity.to_dict()
+    store.set(key, value, read_started, config.get('ENTITY_CACHE_TTL', 30), time.time())
+    return value
+
+
+def invalidate(kind, *entity_ids):
+    """Remove as entidades do cache (usado pelos UPDATE/DELETE em lote, após o commit)."""
+    if not entity_ids or not current_app.config.get('ENTITY_CACHE_ENABLED', True):
+        return
+    get_store().invalidate([_key(kind, entity_id) for entity_id in entity_ids],
+                           current_app.config.get('ENTITY_CACHE_TTL', 30), time.time())
+    with _stats_lock:
+        _invalidations[0] += len(entity_ids)
+
+
+def get_stats():
+    """Acertos, faltas e taxa de acerto por tipo de entidade (contadores deste processo)."""
+    with _stats_lock:
+        by_kind = {kind: dict(counts) for kind, counts in _stats.items()}
+        invalidations = _invalidations[0]
+    for counts in by_kind.values():
+        total = counts['hits'] + counts['misses']
+        counts['hit_rate'] = round(counts['hits'] / total, 4) if total else None
+    hits = sum(counts['hits'] for counts in by_kind.values())
+    total = hits + sum(counts['misses'] for counts in by_kind.values())
+    return {
+        'enabled': current_app.config.get('ENTITY_CACHE_ENABLED', True),
+        'backend': get_store().name,
+        'entries': len(get_store()),
+        'hits': hits,
+        'misses': total - hits,
+        'hit_rate': round(hits / total, 4) if total else None,
+        'invalidations': invalidations,
+        'by_kind': by_kind
+    }
+
+
+def invalidate_after_commit(session, kind, *entity_ids):
+    """Invalida as entidades agora e de novo após o commit da sessão (escritas dentro de um flush)."""
+    invalidate(kind, *entity_ids)
+    if session is not None:
+        session.info.setdefault('entity_cache_pending', set()).update((kind, entity_id) for entity_id in entity_ids)
+
+
+def _on_change(mapper, connection, target):
+    """Invalida a entidade alterada pelo ORM agora e guarda a chave para depois do commit."""
+    invalidate_after_commit(Session.object_session(target), _KINDS[mapper.class_], target.id)
+
+
+for _model in MODELS.values():
+    event.listen(_model, 'after_update', _on_change)
+    event.listen(_model, 'after_delete', _on_change)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    # Uma leitura entre o flush e o commit ainda viu o valor antigo: invalida de novo
+    for kind, entity_id in session.info.pop('entity_cache_pending', ()):
+        invalidate(kind, entity_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('entity_cache_pending', None)
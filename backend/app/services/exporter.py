@@ -0,0 +1,169 @@
+"""Exportação em streaming dos dados do marketplace (CSV, NDJSON ou Parquet).
+
+As linhas são lidas do banco em blocos (``yield_per``) e serializadas bloco a
+bloco, sem carregar a tabela inteira na memória. As exportações podem ser
+incrementais: ``after_id`` e ``since`` (``created_at``) limitam as linhas às
+que surgiram depois da última execução, e ``export_watermark`` informa o
+maior id incluído para ser usado na próxima.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, select, types
+
+from app import db
+from app.models.message import Message
+from app.models.project import Project
+from app.models.proposal import Proposal
+from app.models.review import Review
+from app.models.skill import Skill, freelancer_skills, project_skills
+
+# Nome usado na API/CLI -> tabela exportada
+EXPORTABLE = {
+    'projects': Project.__table__,
+    'proposals': Proposal.__table__,
+    'reviews': Review.__table__,
+    'messages': Message.__table__,
+    'skills': Skill.__table__,
+    'freelancer_skills': freelancer_skills,
+    'project_skills': project_skills
+}
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+
+def _filtered(table, since=None, after_id=None, until_id=None):
+    """Aplica os filtros incrementais suportados pela tabela a um SELECT."""
+    stmt = select(table)
+    if 'id' in table.c:
+        if after_id is not None:
+            stmt = stmt.where(table.c.id > after_id)
+        if until_id is not None:
+            stmt = stmt.where(table.c.id <= until_id)
+        stmt = stmt.order_by(table.c.id)
+    else:
+        stmt = stmt.order_by(*table.primary_key.columns)
+    if since is not None and 'created_at' in table.c:
+        stmt = stmt.where(table.c.created_at > since)
+    return stmt
+
+
+def export_watermark(name, since=None, after_id=None):
+    """Retorna o maior id que será exportado (ou ``None`` para tabelas sem id/sem linhas).
+
+    Usar esse valor como limite superior garante que a exportação e a marca
+    d'água correspondam ao mesmo conjunto de linhas, mesmo com inserções
+    acontecendo durante o streaming.
+    """
+    table = EXPORTABLE[name]
+    if 'id' not in table.c:
+        return None
+    stmt = _filtered(table, since, after_id).order_by(None).with_only_columns(func.max(table.c.id))
+    return db.session.execute(stmt).scalar()
+
+
+def iter_chunks(name, since=None, after_id=None, until_id=None, chunk_size=None):
+    """Percorre a tabela em blocos de dicionários usando um cursor do lado do servidor."""
+    table = EXPORTABLE[name]
+    chunk_size = chunk_size or current_app.config.get('EXPORT_CHUNK_SIZE', 5000)
+    stmt = _filtered(table, since, after_id, until_id).execution_options(yield_per=chunk_size)
+    result = db.session.execute(stmt)
+    for partition in result.mappings().partitions():
+        yield [dict(row) for row in partition]
+
+
+def _plain(value):
+    """Converte valores para tipos serializáveis em CSV/JSON."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(name, chunks):
+    """Gera o CSV em pedaços de texto, um por bloco de linhas."""
+    columns = [column.name for column in EXPORTABLE[name].columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([[_plain(row[column]) for column in columns] for row in chunk])
+        yield buffer.getvalue()
+
+
+def stream_ndjson(name, chunks):
+    """Gera NDJSON (um objeto JSON por linha), um pedaço por bloco de linhas."""
+    for chunk in chunks:
+        yield ''.join(json.dumps({key: _plain(value) for key, value in row.items()}, ensure_ascii=False) + '\n' for row in chunk)
+
+
+def _arrow_schema(pa, table):
+    """Monta o schema Arrow a partir dos tipos das colunas SQLAlchemy."""
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, types.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, types.Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, types.DateTime):
+            arrow_type = pa.timestamp('us')
+        elif isinstance(column.type, types.Boolean):
+            arrow_type = pa.bool_()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+def parquet_available():
+    """Indica se o pyarrow (dependência opcional) está instalado."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_parquet(name, chunks, read_size=1024 * 1024):
+    """Grava cada bloco como um row group em um arquivo temporário e o transmite.
+
+    O formato Parquet só fica válido após o rodapé ser escrito, então o arquivo
+    é montado em disco (memória limitada a um bloco) e enviado ao final.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, EXPORTABLE[name])
+    with tempfile.TemporaryFile() as output:
+        with pq.ParquetWriter(output, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+        output.seek(0)
+        while True:
+            data = output.read(read_size)
+            if not data:
+                break
+            yield data
+
+
+def stream_export(name, fmt, since=None, after_id=None, until_id=None, chunk_size=None):
+    """Retorna o gerador com o conteúdo da exportação no formato pedido."""
+    chunks = iter_chunks(name, since=since, after_id=after_id, until_id=until_id, chunk_size=chunk_size)
+    if fmt == 'csv':
+        return stream_csv(name, chunks)
+    if fmt == 'ndjson':
+        return stream_ndjson(name, chunks)
+    if fmt == 'parquet':
+        return stream_parquet(name, chunks)
+    raise ValueError(f"Formato inválido. Use: {', '.join(FORMATS)}.")
@@ -0,0 +1,128 @@
+"""Contador de projetos em andamento de cada freelancer.
+
+As recomendações não levavam em conta a carga do freelancer: quem já tinha dez
+projetos em andamento aparecia à frente de alguém livre, e contar os projetos
+de cada candidato custaria mais uma consulta por freelancer. A coluna
+``Freelancer.active_projects`` guarda essa contagem (projetos ``in_progress``
+atribuídos a ele) e é lida junto com o próprio candidato.
+
+O contador acompanha as transições na mesma transação da mudança:
+
+- alterações de ``status``/``freelancer_id`` de um projeto pelo ORM
+  (conclusão, edição pelo cliente ou pelo administrador) são capturadas pelo
+  evento ``after_update``;
+- a aceitação de propostas e a exclusão de projetos e clientes, que usam
+  ``UPDATE``/``DELETE`` em lote, chamam ``adjust`` e ``release_projects``.
+
+A tarefa periódica ``reconcile_active_projects`` recalcula os contadores que
+divergiram (escritas fora da aplicação, falhas no meio de uma exclusão em
+blocos ou bancos anteriores à coluna).
+"""
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.freelancer import Freelancer
+from app.models.project import Project
+from app.services import entity_cache
+
+ACTIVE_STATUS = 'in_progress'
+
+
+def _shift(delta):
+    """Expressão que soma ``delta`` ao contador sem deixá-lo negativo."""
+    if delta >= 0:
+        return Freelancer.active_projects + delta
+    return case((Freelancer.active_projects > -delta, Freelancer.active_projects + delta), else_=0)
+
+
+def _apply(execute, changes):
+    for freelancer_id, delta in changes.items():
+        if delta:
+            execute(update(Freelancer.__table__).where(Freelancer.id == freelancer_id).values(active_projects=_shift(delta)))
+
+
+def adjust(changes):
+    """Aplica ``{id do freelancer: variação}`` na transação atual (sem commit).
+
+    Quem faz o commit deve chamar ``entity_cache.invalidate('freelancer', ...)`` depois.
+    """
+    _apply(db.session.execute, changes)
+
+
+def release_projects(condition):
+    """Desconta os projetos em andamento que atendem à condição, antes de excluí-los (sem commit).
+
+    Retorna os ids dos freelancers alterados.
+    """
+    rows = db.session.execute(
+        select(Project.freelancer_id, func.count(Project.id))
+        .where(condition, Project.status == ACTIVE_STATUS, Project.freelancer_id.isnot(None))
+        .group_by(Project.freelancer_id)
+    ).all()
+    adjust({freelancer_id: -count for freelancer_id, count in rows})
+    return [freelancer_id for freelancer_id, _ in rows]
+
+
+def _active_freelancer(status, freelancer_id):
+    return freelancer_id if status == ACTIVE_STATUS else None
+
+
+@event.listens_for(Project, 'after_update')
+def _on_project_update(mapper, connection, target):
+    """Move o projeto entre os contadores quando o status ou o freelancer mudam pelo ORM."""
+    state = inspect(target)
+    status, freelancer = state.attrs.status.history, state.attrs.freelancer_id.history
+    if not status.has_changes() and not freelancer.has_changes():
+        return
+    old_status = status.deleted[0] if status.deleted else target.status
+    old_freelancer = freelancer.deleted[0] if freelancer.deleted else target.freelancer_id
+    before = _active_freelancer(old_status, old_freelancer)
+    after = _active_freelancer(target.status, target.freelancer_id)
+    if before == after:
+        return
+
+    changes = {}
+    if before is not None:
+        changes[before] = -1
+    if after is not None:
+        changes[after] = changes.get(after, 0) + 1
+    _apply(connection.execute, changes)
+    entity_cache.invalidate_after_commit(Session.object_session(target), 'freelancer', *changes)
+
+
+def _expected_count():
+    return (
+        select(func.count(Project.id))
+        .where(Project.freelancer_id == Freelancer.id, Project.status == ACTIVE_STATUS)
+        .scalar_subquery()
+    )
+
+
+def reconcile(batch_size=1000):
+    """Recalcula os contadores divergentes; faz commit e retorna quantos foram corrigidos.
+
+    O valor gravado é recalculado pelo próprio ``UPDATE``, então uma aceitação
+    concorrente não é desfeita.
+    """
+    corrected = 0
+    last_id = 0
+    while True:
+        ids = list(db.session.execute(
+            select(Freelancer.id).where(Freelancer.id > last_id).order_by(Freelancer.id).limit(batch_size)
+        ).scalars())
+        if not ids:
+            return corrected
+        drifted = list(db.session.execute(
+            select(Freelancer.id).where(Freelancer.id.in_(ids), Freelancer.active_projects != _expected_count())
+        ).scalars())
+        if drifted:
+            db.session.execute(
+                update(Freelancer).where(Freelancer.id.in_(drifted)).values(active_projects=_expected_count())
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        entity_cache.invalidate('freelancer', *drifted)
+        corrected += len(drifted)
+        last_id = ids[-1]
@@ -0,0 +1,161 @@
+"""Chaves de idempotência para as rotas de criação.
+
+Clientes móveis repetem o POST quando a resposta demora, e cada repetição
+criava outra proposta, mensagem ou projeto. Com o cabeçalho
+``Idempotency-Key`` o decorador ``idempotent`` registra a chave (por usuário)
+com a impressão digital da requisição antes de executar o controlador e, ao
+final, grava o status e o corpo da resposta. Uma repetição com a mesma chave:
+
+- recebe a resposta gravada, sem executar o controlador de novo (cabeçalho
+  ``Idempotent-Replayed: true``);
+- recebe 409 se a original ainda está em execução (após
+  ``IDEMPOTENCY_LOCK_SECONDS`` a chave é considerada abandonada e assumida);
+- recebe 422 se o método, o caminho ou o corpo forem diferentes.
+
+Respostas 5xx e 429 não são gravadas: a chave é liberada para uma nova
+tentativa. O decorador fica por fora de ``rate_limit``, então as repetições
+respondidas com a resposta gravada não consomem o limite de escrita.
+As chaves valem por ``IDEMPOTENCY_TTL_SECONDS`` e são removidas pela tarefa
+periódica ``prune_idempotency_keys``. Requisições sem o cabeçalho ou sem
+token seguem direto para o controlador.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import delete, exc, select, update
+
+from app import db
+from app.models.idempotency_key import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = IdempotencyKey.__table__.c.key.type.length
+CLAIM_ATTEMPTS = 3
+
+
+def _owner():
+    """``papel:id`` do token da requisição, ou None sem token válido (a rota responde o erro)."""
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return None
+    identity = get_jwt_identity()
+    return f"{get_jwt().get('role')}:{identity}" if identity is not None else None
+
+
+def _fingerprint():
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.query_string.decode('latin-1')):
+        digest.update(part.encode('utf-8') + b'\0')
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _claim(owner, key, fingerprint):
+    """Registra a chave como em execução; retorna ``(registrou, linha existente)``.
+
+    Se a linha que impediu o registro sumiu antes de ser lida (liberada por um
+    5xx concorrente), tenta de novo; ``(False, None)`` se continuar disputada.
+    """
+    for _ in range(CLAIM_ATTEMPTS):
+        now = datetime.today()
+        db.session.execute(delete(IdempotencyKey).where(
+            IdempotencyKey.owner == owner, IdempotencyKey.key == key, IdempotencyKey.expires_at <= now
+        ))
+        db.session.add(IdempotencyKey(
+            owner=owner, key=key, fingerprint=fingerprint, created_at=now,
+            expires_at=now + timedelta(seconds=current_app.config.get('IDEMPOTENCY_TTL_SECONDS', 86400))
+        ))
+        try:
+            db.session.commit()
+            return True, None
+        except exc.IntegrityError:
+            db.session.rollback()
+        existing = db.session.execute(
+            select(IdempotencyKey).where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+        ).scalar_one_or_none()
+        if existing is not None:
+            return False, existing
+    return False, None
+
+
+def _take_over(existing):
+    """Assume uma chave cuja requisição original parou sem resposta (ex.: o worker caiu)."""
+    lock_seconds = current_app.config.get('IDEMPOTENCY_LOCK_SECONDS', 60)
+    if existing.created_at > datetime.today() - timedelta(seconds=lock_seconds):
+        return False
+    taken = db.session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.id == existing.id, IdempotencyKey.status_code.is_(None),
+               IdempotencyKey.created_at == existing.created_at)
+        .values(created_at=datetime.today())
+    ).rowcount
+    db.session.commit()
+    return taken == 1
+
+
+def _replay(existing):
+    response = current_app.response_class(existing.response, status=existing.status_code, mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _release(owner, key):
+    db.session.rollback()
+    db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.owner == owner, IdempotencyKey.key == key))
+    db.session.commit()
+
+
+def idempotent(view):
+    """Decorador de rota que responde as repetições com a resposta gravada para a ``Idempotency-Key``."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        owner = _owner() if key else None
+        if owner is None:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"O cabeçalho {HEADER} deve ter até {MAX_KEY_LENGTH} caracteres."}), 400
+
+        fingerprint = _fingerprint()
+        claimed, existing = _claim(owner, key, fingerprint)
+        if not claimed:
+            if existing is None:
+                return jsonify({"error": f"Uma requisição com esta {HEADER} ainda está em andamento."}), 409
+            if existing.fingerprint != fingerprint:
+                return jsonify({"error": f"A chave {HEADER} já foi usada em outra requisição."}), 422
+            if existing.status_code is not None:
+                return _replay(existing)
+            if not _take_over(existing):
+                return jsonify({"error": f"Uma requisição com esta {HEADER} ainda está em andamento."}), 409
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            _release(owner, key)
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            # Falha transitória (ou limite de taxa): a repetição deve executar de novo
+            _release(owner, key)
+            return response
+
+        db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+            .values(status_code=response.status_code, response=response.get_data(as_text=True))
+        )
+        db.session.commit()
+        return response
+    return wrapper
+
+
+def prune_expired():
+    """Remove as chaves vencidas; faz commit e retorna quantas foram removidas."""
+    removed = db.session.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.today())
+    ).rowcount
+    db.session.commit()
+    return removed
@@ -0,0 +1,275 @@
+"""Fila persistente de tarefas pesadas executadas fora das requisições.
+
+Recálculos, exclusões grandes e arquivamentos não devem ocupar um worker HTTP.
+Os controladores enfileiram a tarefa com ``enqueue`` (uma linha na tabela
+``job``) e respondem 202; o worker (``run_worker.py``) executa as tarefas em um
+pool de threads ou de processos.
+
+Cada worker reserva uma tarefa com um ``UPDATE`` condicional, então dois
+workers nunca executam a mesma tarefa. A reserva vale por um lease que o worker
+renova enquanto a tarefa roda; se ele morrer, o lease expira e outro worker
+assume a tarefa. Falhas são repetidas com backoff exponencial até
+``max_attempts``. Tarefas periódicas (``JOB_SCHEDULE``) são enfileiradas pelos
+próprios workers quando a última execução ficou mais antiga que o intervalo.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+
+from app import db
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Nome da tarefa -> função executada pelo worker (registradas em app.services.tasks)
+TASKS = {}
+
+_process_app = None
+
+
+def task(name):
+    """Registra a função decorada como a tarefa ``name``."""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def load_tasks():
+    """Importa o módulo que registra as tarefas disponíveis."""
+    import app.services.tasks  # noqa: F401
+    return TASKS
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None):
+    """Enfileira a tarefa ``name`` com os argumentos ``payload``. Faz commit e retorna o Job."""
+    job = Job(
+        name=name,
+        payload=json.dumps(payload or {}),
+        max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 5),
+        run_after=datetime.today() + timedelta(seconds=delay)
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def _claimable(now):
+    """Condição das tarefas que podem ser reservadas: na fila ou com o lease expirado."""
+    return or_(
+        and_(Job.status == 'queued', Job.run_after <= now),
+        and_(Job.status == 'running', Job.lease_expires_at < now, Job.attempts < Job.max_attempts)
+    )
+
+
+def claim(worker_id):
+    """Reserva a próxima tarefa disponível para o worker; retorna o id ou ``None``."""
+    lease = current_app.config.get('JOB_LEASE_SECONDS', 60)
+    while True:
+        now = datetime.today()
+        job_id = db.session.execute(
+            select(Job.id).where(_claimable(now)).order_by(Job.run_after, Job.id).limit(1)
+        ).scalar()
+        if job_id is None:
+            db.session.commit()
+            return None
+
+        # Só um worker encontra a tarefa ainda disponível; os demais tentam a próxima
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, _claimable(now))
+            .values(status='running', locked_by=worker_id, attempts=Job.attempts + 1,
+                    lease_expires_at=now + timedelta(seconds=lease), started_at=now)
+        ).rowcount
+        db.session.commit()
+        if claimed == 1:
+            return job_id
+
+
+def renew_leases(job_ids, worker_id):
+    """Estende o lease das tarefas que o worker ainda está executando."""
+    if not job_ids:
+        return
+    lease = current_app.config.get('JOB_LEASE_SECONDS', 60)
+    db.session.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.locked_by == worker_id, Job.status == 'running')
+        .values(lease_expires_at=datetime.today() + timedelta(seconds=lease))
+    )
+    db.session.commit()
+
+
+def fail_abandoned():
+    """Marca como falhas as tarefas cujo lease expirou na última tentativa."""
+    failed = db.session.execute(
+        update(Job)
+        .where(Job.status == 'running', Job.lease_expires_at < datetime.today(), Job.attempts >= Job.max_attempts)
+        .values(status='failed', locked_by=None, finished_at=datetime.today(),
+                last_error='Lease expirado: o worker parou durante a execução.')
+    ).rowcount
+    db.session.commit()
+    return failed
+
+
+def _finish(job_id, worker_id, values):
+    """Grava o desfecho da tarefa se o worker ainda detém o lease."""
+    db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == 'running')
+        .values(locked_by=None, lease_expires_at=None, **values)
+    )
+    db.session.commit()
+
+
+def _backoff(attempts):
+    """Segundos até a próxima tentativa: base * 2^(tentativas - 1), limitado ao máximo."""
+    base = current_app.config.get('JOB_RETRY_BACKOFF', 5)
+    return min(base * 2 ** (attempts - 1), current_app.config.get('JOB_RETRY_BACKOFF_MAX', 3600))
+
+
+def execute(job_id, worker_id):
+    """Executa a tarefa reservada e registra o resultado, a nova tentativa ou a falha."""
+    job = db.session.get(Job, job_id)
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(f'Tarefa desconhecida: {job.name}.')
+        result = func(**json.loads(job.payload))
+    except Exception as e:
+        db.session.rollback()
+        logger.exception('Falha na tarefa %s (%s).', job_id, job.name)
+        job = db.session.get(Job, job_id)
+        error = f'{type(e).__name__}: {e}'
+        if func is not None and job.attempts < job.max_attempts:
+            retry_at = datetime.today() + timedelta(seconds=_backoff(job.attempts))
+            _finish(job_id, worker_id, {'status': 'queued', 'run_after': retry_at, 'last_error': error})
+        else:
+            _finish(job_id, worker_id, {'status': 'failed', 'finished_at': datetime.today(), 'last_error': error})
+        return False
+
+    _finish(job_id, worker_id, {
+        'status': 'succeeded',
+        'finished_at': datetime.today(),
+        'result': json.dumps(result, default=str)
+    })
+    return True
+
+
+def schedule_periodic():
+    """Enfileira as tarefas de ``JOB_SCHEDULE`` cujo intervalo já passou desde o último job.
+
+    Vários workers podem fazer essa verificação ao mesmo tempo; no pior caso a
+    tarefa é enfileirada duas vezes, o que as tarefas periódicas toleram.
+    """
+    scheduled = []
+    now = datetime.today()
+    for name, interval in current_app.config.get('JOB_SCHEDULE', {}).items():
+        if not interval or interval <= 0:
+            continue
+        recent = db.session.query(Job.id).filter(
+            Job.name == name,
+            or_(Job.status.in_(['queued', 'running']), Job.created_at > now - timedelta(seconds=interval))
+        ).first()
+        if recent is None:
+            scheduled.append(enqueue(name).id)
+    db.session.commit()
+    return scheduled
+
+
+def _init_process():
+    """Inicializa cada processo do pool com a sua própria aplicação (e conexões)."""
+    global _process_app
+    from app import create_app
+    _process_app = create_app()
+    load_tasks()
+
+
+def _execute_in_context(job_id, worker_id, app=None):
+    """Executa a tarefa dentro do contexto da aplicação da thread ou do processo."""
+    with (app or _process_app).app_context():
+        try:
+            return execute(job_id, worker_id)
+        finally:
+            db.session.remove()
+
+
+def run_worker(app, concurrency=None, mode=None, poll_interval=None, once=False):
+    """Executa tarefas da fila até ser interrompido (ou, com ``once``, até a fila esvaziar).
+
+    ``mode`` é 'thread' (padrão, bom para tarefas limitadas pelo banco) ou
+    'process' (tarefas limitadas por CPU). Retorna a quantidade de tarefas executadas.
+    """
+    # Só o processo do worker precisa dos pools; a API apenas enfileira
+    import socket
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+    concurrency = concurrency or app.config.get('JOB_WORKER_CONCURRENCY', 2)
+    mode = mode or app.config.get('JOB_WORKER_MODE', 'thread')
+    poll_interval = poll_interval or app.config.get('JOB_POLL_INTERVAL', 1.0)
+    renew_every = app.config.get('JOB_LEASE_SECONDS', 60) / 3
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    load_tasks()
+
+    if mode == 'process':
+        executor = ProcessPoolExecutor(max_workers=concurrency, initializer=_init_process)
+    else:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    running = {}
+    executed = 0
+    last_renew = time.monotonic()
+    try:
+        with app.app_context():
+            fail_abandoned()
+            if not once:
+                schedule_periodic()
+            while True:
+                for future in [future for future in running if future.done()]:
+                    running.pop(future)
+                    executed += 1
+                    if future.exception() is not None:
+                        logger.error('Erro no worker: %s', future.exception())
+
+                claimed = False
+                while len(running) < concurrency:
+                    job_id = claim(worker_id)
+                    if job_id is None:
+                        break
+                    claimed = True
+                    target_app = None if mode == 'process' else app
+                    running[executor.submit(_execute_in_context, job_id, worker_id, target_app)] = job_id
+
+                if time.monotonic() - last_renew >= renew_every:
+                    renew_leases(list(running.values()), worker_id)
+                    fail_abandoned()
+                    if not once:
+                        schedule_periodic()
+                    last_renew = time.monotonic()
+
+                if once and not running and not claimed:
+                    return executed
+                if running:
+                    wait(running, timeout=poll_interval if not claimed else 0, return_when=FIRST_COMPLETED)
+                elif not claimed:
+                    time.sleep(poll_interval)
+    finally:
+        executor.shutdown(wait=True)
+
+
+def get_stats():
+    """Retorna a quantidade de tarefas por status e a idade da tarefa pendente mais antiga."""
+    counts = dict(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+    oldest = db.session.query(func.min(Job.run_after)).filter(Job.status == 'queued').scalar()
+    return {
+        'queued': counts.get('queued', 0),
+        'running': counts.get('running', 0),
+        'succeeded': counts.get('succeeded', 0),
+        'failed': counts.get('failed', 0),
+        'oldest_queued_seconds': max(0, (datetime.today() - oldest).total_seconds()) if oldest else 0
+    }
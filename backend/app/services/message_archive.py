@@ -0,0 +1,145 @@
+"""Arquivamento das mensagens de projetos concluídos em segmentos comprimidos.
+
+Projetos concluídos raramente têm o chat consultado novamente, mas suas linhas
+continuam ocupando a tabela ``message`` e seus índices. Este serviço move as
+mensagens desses projetos para um único segmento comprimido por projeto
+(tabela ``message_archive``) e oferece a leitura transparente desses segmentos.
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from app import db
+from app.models.message import Message
+from app.models.message_archive import MessageArchive
+from app.models.project import Project
+
+_zstandard = None
+
+
+def _zstd():
+    """Importa o zstandard na primeira compressão, não na inicialização da aplicação.
+
+    Dependência opcional: sem ela os segmentos usam gzip. Retorna ``None``
+    quando o pacote não está instalado.
+    """
+    global _zstandard
+    if _zstandard is None:
+        try:
+            import zstandard
+        except ImportError:
+            zstandard = False
+        _zstandard = zstandard
+    return _zstandard or None
+
+
+def _compress(data):
+    """Comprime os bytes com zstd, se disponível, ou gzip."""
+    zstandard = _zstd()
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(data)
+    return 'gzip', gzip.compress(data, compresslevel=9)
+
+
+def _decompress(codec, payload):
+    """Descomprime um segmento de acordo com o codec com que foi gravado."""
+    if codec == 'zstd':
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError('O pacote zstandard é necessário para ler este arquivo de mensagens.')
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return gzip.decompress(payload)
+
+
+def decode_archive(archive):
+    """Retorna a lista de mensagens (dicionários) contida em um segmento."""
+    return json.loads(_decompress(archive.codec, archive.payload).decode('utf-8'))
+
+
+def get_archived_messages(project_id):
+    """Lista as mensagens arquivadas de um projeto, ou uma lista vazia se não houver segmento."""
+    archive = MessageArchive.query.filter_by(project_id=project_id).first()
+    if not archive:
+        return []
+    return decode_archive(archive)
+
+
+def archive_project(project_id):
+    """Move as mensagens de um projeto para o seu segmento comprimido.
+
+    Se o projeto já possui um segmento, as novas mensagens são anexadas a ele.
+    Não faz commit; retorna um dicionário com os tamanhos envolvidos ou ``None``
+    quando não há mensagens para arquivar.
+    """
+    messages = Message.query.filter_by(project_id=project_id).order_by(Message.created_at.asc(), Message.id.asc()).all()
+    if not messages:
+        return None
+
+    new_rows = [message.to_dict() for message in messages]
+    rows_raw_size = sum(len(json.dumps(row, ensure_ascii=False).encode('utf-8')) for row in new_rows)
+
+    archive = MessageArchive.query.filter_by(project_id=project_id).first()
+    previous_compressed_size = archive.compressed_size if archive else 0
+    rows = (decode_archive(archive) if archive else []) + new_rows
+
+    raw = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    codec, payload = _compress(raw)
+
+    if not archive:
+        archive = MessageArchive(project_id=project_id)
+        db.session.add(archive)
+    archive.codec = codec
+    archive.payload = payload
+    archive.message_count = len(rows)
+    archive.raw_size = len(raw)
+    archive.compressed_size = len(payload)
+
+    Message.query.filter(Message.id.in_([message.id for message in messages])).delete(synchronize_session=False)
+
+    return {
+        'messages': len(new_rows),
+        'raw_bytes': rows_raw_size,
+        'compressed_bytes': len(payload) - previous_compressed_size
+    }
+
+
+def archive_completed_projects(older_than_days, limit=None):
+    """Arquiva as mensagens dos projetos concluídos há mais de ``older_than_days`` dias.
+
+    Cada projeto é arquivado e confirmado em sua própria transação, para não
+    segurar o lock de escrita do banco durante todo o processo. Retorna um
+    relatório com a quantidade de projetos e mensagens movidos e o espaço
+    estimado liberado (bytes das linhas removidas menos bytes comprimidos).
+    """
+    cutoff = datetime.today() - timedelta(days=older_than_days)
+    # Projetos concluídos antes da coluna completed_at usam a data de criação
+    completed_at = func.coalesce(Project.completed_at, Project.created_at)
+
+    query = db.session.query(Message.project_id).join(Project, Project.id == Message.project_id).filter(
+        Project.status == 'completed',
+        completed_at < cutoff
+    ).distinct().order_by(Message.project_id)
+    if limit:
+        query = query.limit(limit)
+    project_ids = [row.project_id for row in query.all()]
+
+    report = {'projects': 0, 'messages': 0, 'raw_bytes': 0, 'compressed_bytes': 0, 'errors': []}
+    for project_id in project_ids:
+        try:
+            result = archive_project(project_id)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            report['errors'].append({'project_id': project_id, 'error': str(e)})
+            continue
+        if result:
+            report['projects'] += 1
+            report['messages'] += result['messages']
+            report['raw_bytes'] += result['raw_bytes']
+            report['compressed_bytes'] += result['compressed_bytes']
+
+    report['bytes_reclaimed'] = report['raw_bytes'] - report['compressed_bytes']
+    return report
@@ -0,0 +1,152 @@
+"""Hashing de senhas em um pool de processos dedicado e limitado.
+
+O scrypt/pbkdf2 do werkzeug é caro em CPU de propósito. Executá-lo na thread
+da requisição faz com que um pico de logins ocupe todos os workers e atrase
+chamadas que não têm relação com autenticação. Aqui o trabalho vai para um
+``ProcessPoolExecutor`` com um número fixo de processos e uma fila limitada;
+quando a fila está cheia a operação é recusada com ``HashingPoolSaturated``
+para que o controlador responda 503 em vez de acumular requisições.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from app import db
+
+
+class HashingPoolSaturated(Exception):
+    """Lançada quando não há vaga na fila do pool de hashing."""
+
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_slots = None
+_stats = {
+    'in_flight': 0,
+    'max_in_flight': 0,
+    'completed': 0,
+    'rejected': 0,
+    'rehashed': 0,
+    'total_wait_seconds': 0.0
+}
+
+
+def password_hash_method():
+    """Retorna o método de hash configurado, no formato gravado no hash (ex.: 'scrypt:32768:8:1')."""
+    method = current_app.config.get('PASSWORD_HASH_METHOD') or 'scrypt'
+    if method == 'scrypt':
+        return 'scrypt:32768:8:1'
+    if method in ('pbkdf2', 'pbkdf2:sha256'):
+        return f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'
+    return method
+
+
+def _get_executor():
+    """Cria o pool na primeira utilização (e de novo após um fork do processo)."""
+    global _executor, _executor_pid, _slots
+
+    workers = current_app.config.get('PASSWORD_HASH_WORKERS', 0)
+    if workers <= 0:
+        return None
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(workers + current_app.config.get('PASSWORD_HASH_MAX_QUEUE', 0))
+        return _executor
+
+
+def _run(func, *args):
+    """Executa ``func`` no pool respeitando o limite da fila."""
+    executor = _get_executor()
+    if executor is None:
+        # Pool desativado (PASSWORD_HASH_WORKERS=0): executa na própria thread
+        result = func(*args)
+        with _lock:
+            _stats['completed'] += 1
+        return result
+
+    started = time.monotonic()
+    if not _slots.acquire(timeout=current_app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 0.5)):
+        with _lock:
+            _stats['rejected'] += 1
+        raise HashingPoolSaturated()
+
+    with _lock:
+        _stats['in_flight'] += 1
+        _stats['max_in_flight'] = max(_stats['max_in_flight'], _stats['in_flight'])
+        _stats['total_wait_seconds'] += time.monotonic() - started
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        _slots.release()
+        with _lock:
+            _stats['in_flight'] -= 1
+            _stats['completed'] += 1
+
+
+def hash_password(password):
+    """Gera o hash da senha no pool com o método configurado."""
+    return _run(generate_password_hash, password, password_hash_method())
+
+
+def hash_passwords(passwords, executor=None, workers=1):
+    """Gera os hashes de uma lista de senhas, distribuindo entre os processos de ``executor``.
+
+    Usado em importações em lote, que têm o seu próprio pool para não disputar
+    a fila usada pelos logins. Sem ``executor`` os hashes são gerados em série.
+    """
+    method = password_hash_method()
+    if executor is None:
+        return [generate_password_hash(password, method) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(executor.map(generate_password_hash, passwords, [method] * len(passwords), chunksize=chunksize))
+
+
+def verify_password(password_hash, password):
+    """Verifica a senha contra o hash armazenado, no pool."""
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Indica se o hash foi gerado com um método/custo diferente do configurado."""
+    return password_hash.split('$', 1)[0] != password_hash_method()
+
+
+def rehash_if_needed(user, password):
+    """Atualiza o hash do usuário após um login válido se o custo configurado mudou.
+
+    Falhas aqui não devem impedir o login, então o pool cheio ou um erro ao
+    salvar apenas mantêm o hash antigo até o próximo login.
+    """
+    if not needs_rehash(user.password_hash):
+        return
+    try:
+        user.password_hash = hash_password(password)
+        db.session.commit()
+    except HashingPoolSaturated:
+        return
+    except Exception:
+        db.session.rollback()
+        return
+    with _lock:
+        _stats['rehashed'] += 1
+
+
+def get_stats():
+    """Retorna as métricas do pool (profundidade da fila, recusas, etc.)."""
+    workers = current_app.config.get('PASSWORD_HASH_WORKERS', 0)
+    with _lock:
+        stats = dict(_stats)
+    stats['workers'] = workers
+    stats['max_queue'] = current_app.config.get('PASSWORD_HASH_MAX_QUEUE', 0)
+    stats['queued'] = max(0, stats['in_flight'] - workers)
+    stats['method'] = password_hash_method()
+    return stats
@@ -0,0 +1,231 @@
+"""Perfilamento sob demanda de requisições individuais.
+
+Quando uma rota fica lenta em produção, a média do APM não mostra onde o tempo
+é gasto dentro do controlador. Com ``PROFILING_ENABLED`` a aplicação perfila:
+
+- as requisições de administradores que enviam o cabeçalho ``X-Profile``
+  (``cprofile`` ou ``sample``; qualquer outro valor usa ``PROFILING_MODE``);
+- uma fração aleatória ``PROFILING_SAMPLE_RATE`` de todas as requisições.
+
+Só uma requisição por processo usa o cProfile de cada vez; as demais que o
+pedirem ao mesmo tempo são amostradas.
+
+O modo ``cprofile`` grava um arquivo ``.pstats`` (``python -m pstats``,
+snakeviz); o modo ``sample`` coleta a pilha da thread da requisição a cada
+``PROFILING_SAMPLE_INTERVAL`` segundos e grava as pilhas recolhidas
+(``.folded``) aceitas por flamegraph.pl e speedscope. O nome do arquivo volta
+no cabeçalho ``X-Profile-Id`` e os arquivos são listados e baixados pelas
+rotas ``/admin/profiles``.
+
+Desativado, nenhum hook é registrado na aplicação: o custo é zero.
+"""
+
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+MODES = ('cprofile', 'sample')
+EXTENSIONS = {'cprofile': '.pstats', 'sample': '.folded'}
+
+# Nomes gerados por _file_name; as rotas de download só aceitam esse formato
+FILE_NAME = re.compile(r'^\d{8}T\d{6}-\d+-[A-Z]+-[\w.-]*-\d+ms\.(pstats|folded)$')
+
+# Uma sessão de cProfile por processo (ver _start_cprofile)
+_cprofile_lock = threading.Lock()
+
+
+class StackSampler:
+    """Amostra periodicamente a pilha de uma thread e conta as pilhas recolhidas."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                frame = frame.f_back
+            stack = ';'.join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+
+def profiles_dir(app=None):
+    """Diretório dos arquivos de perfil (``PROFILING_DIR`` ou ``instance/profiles``)."""
+    app = app or current_app
+    return app.config.get('PROFILING_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def _requested_mode():
+    """Modo pedido pelo cabeçalho, se o token for de um administrador; senão None."""
+    header = request.headers.get('X-Profile')
+    if not header:
+        return None
+    try:
+        verify_jwt_in_request(optional=True)
+        if get_jwt().get('role') != 'admin':
+            return None
+    except Exception:
+        # Token inválido: a própria rota responde com o erro de autenticação
+        return None
+    return header if header in MODES else current_app.config['PROFILING_MODE']
+
+
+def _start():
+    config = current_app.config
+    mode = _requested_mode()
+    if mode is None:
+        rate = config['PROFILING_SAMPLE_RATE']
+        if not rate or random.random() >= rate:
+            return
+        mode = config['PROFILING_MODE']
+
+    profiler = _start_cprofile() if mode == 'cprofile' else None
+    if profiler is None:
+        # Amostragem: pedida, ou outra requisição já está com o cProfile
+        mode = 'sample'
+        profiler = StackSampler(threading.get_ident(), config['PROFILING_SAMPLE_INTERVAL'])
+        profiler.start()
+    g._profiler = (mode, profiler, time.perf_counter())
+
+
+def _start_cprofile():
+    """Inicia o cProfile se nenhuma outra requisição o estiver usando; senão None.
+
+    A partir do Python 3.12 só um perfilador pode estar ativo no processo e os
+    demais ``enable()`` lançam ``ValueError``; com os workers ``gthread`` as
+    requisições são concorrentes, então uma trava garante uma sessão por vez e
+    o perfilamento nunca derruba a requisição medida.
+    """
+    if not _cprofile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Outra ferramenta (ex.: um depurador) já ocupa o perfilador do interpretador
+        _cprofile_lock.release()
+        return None
+    return profiler
+
+
+def _stop():
+    """Para o perfilador da requisição, se houver; retorna (modo, perfilador, ms)."""
+    state = g.pop('_profiler', None)
+    if state is None:
+        return None
+    mode, profiler, started = state
+    if mode == 'cprofile':
+        profiler.disable()
+        _cprofile_lock.release()
+    else:
+        profiler.stop()
+    return mode, profiler, int((time.perf_counter() - started) * 1000)
+
+
+def _file_name(mode, elapsed_ms):
+    slug = re.sub(r'[^\w.-]+', '_', request.path.strip('/')) or 'root'
+    timestamp = datetime.today().strftime('%Y%m%dT%H%M%S')
+    return f'{timestamp}-{os.getpid()}-{request.method}-{slug[:80]}-{elapsed_ms}ms{EXTENSIONS[mode]}'
+
+
+def _prune(directory, keep):
+    """Mantém apenas os ``keep`` arquivos mais recentes."""
+    files = sorted((entry for entry in os.scandir(directory) if FILE_NAME.match(entry.name)),
+                   key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in files[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _finish(response):
+    state = _stop()
+    if state is None:
+        return response
+    mode, profiler, elapsed_ms = state
+    directory = profiles_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        name = _file_name(mode, elapsed_ms)
+        if mode == 'cprofile':
+            profiler.dump_stats(os.path.join(directory, name))
+        else:
+            profiler.dump(os.path.join(directory, name))
+        _prune(directory, current_app.config['PROFILING_MAX_FILES'])
+    except OSError as e:
+        current_app.logger.warning("Falha ao gravar o perfil da requisição: %s", e)
+        return response
+    response.headers['X-Profile-Id'] = name
+    return response
+
+
+def _discard(exc=None):
+    # Garante que o perfilador pare mesmo se a resposta não for finalizada
+    _stop()
+
+
+def init_profiling(app):
+    """Registra os hooks de perfilamento se ``PROFILING_ENABLED`` estiver ativo."""
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+    if app.config['PROFILING_MODE'] not in MODES:
+        raise ValueError(f"PROFILING_MODE inválido. Use: {', '.join(MODES)}.")
+    app.before_request(_start)
+    app.after_request(_finish)
+    app.teardown_request(_discard)
+
+
+def list_profiles(app=None):
+    """Lista os arquivos de perfil, dos mais recentes para os mais antigos."""
+    directory = profiles_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        if not FILE_NAME.match(entry.name):
+            continue
+        stat = entry.stat()
+        _, pid, method, rest = entry.name.rsplit('.', 1)[0].split('-', 3)
+        path, elapsed = rest.rsplit('-', 1)
+        profiles.append({
+            'name': entry.name,
+            'format': entry.name.rsplit('.', 1)[1],
+            'method': method,
+            'path': path,
+            'pid': int(pid),
+            'elapsed_ms': int(elapsed[:-2]),
+            'size': stat.st_size,
+            'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
+        })
+    profiles.sort(key=lambda profile: profile['created_at'], reverse=True)
+    return profiles
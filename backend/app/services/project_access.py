@@ -0,0 +1,183 @@
+"""Carregamento e autorização de projetos e propostas com cache por requisição.
+
+Os controladores buscavam o mesmo ``Project`` (e depois o cliente, o
+freelancer e a proposta aceita) várias vezes na mesma requisição, cada um com
+a sua cópia das regras de permissão. Aqui o projeto é carregado uma única vez,
+junto com o cliente dono e o freelancer contratado em uma só consulta, e fica
+memorizado em ``flask.g`` até o fim da requisição.
+
+As regras de acesso são funções puras que recebem o projeto (ou a proposta),
+o papel e o id do usuário e retornam ``(mensagem, status)`` quando o acesso é
+negado, ou ``None`` quando é permitido.
+"""
+
+from types import SimpleNamespace
+
+from flask import g, jsonify
+from sqlalchemy.orm import joinedload
+
+from app.models.project import Project
+from app.models.proposal import Proposal
+from app.services import entity_cache
+
+NOT_FOUND = "Projeto não encontrado."
+PROPOSAL_NOT_FOUND = "Proposta não encontrada."
+NOT_OWNER = "Acesso não autorizado. Este projeto não pertence ao cliente."
+NOT_ASSIGNED = "Acesso não autorizado. Este projeto não está associado ao freelancer."
+NOT_VISIBLE = "Acesso não autorizado. Apenas projetos abertos ou associados ao freelancer são visíveis."
+NOT_AUTHOR = "Acesso não autorizado. Esta proposta não pertence ao freelancer."
+FORBIDDEN = "Acesso não autorizado."
+
+
+class ProjectContext:
+    """Projeto carregado para a requisição, com cliente e freelancer já resolvidos."""
+
+    def __init__(self, project):
+        self.project = project
+        self._accepted_proposal = None
+        self._accepted_loaded = False
+
+    @property
+    def client(self):
+        """Cliente dono do projeto."""
+        return self.project.client
+
+    @property
+    def freelancer(self):
+        """Freelancer contratado para o projeto (ou ``None``)."""
+        return self.project.freelancer
+
+    def accepted_proposal(self):
+        """Proposta aceita do projeto, consultada no máximo uma vez por requisição."""
+        if not self._accepted_loaded:
+            self._accepted_proposal = Proposal.query.filter_by(project_id=self.project.id, status='accepted').first()
+            self._accepted_loaded = True
+        return self._accepted_proposal
+
+
+def owner_error(project, role, user_id):
+    """Apenas o cliente dono do projeto."""
+    if role != 'client':
+        return FORBIDDEN, 403
+    if project.client_id != int(user_id):
+        return NOT_OWNER, 403
+    return None
+
+
+def participant_error(project, role, user_id):
+    """O cliente dono ou o freelancer contratado; outros papéis são filtrados pelo chamador."""
+    if role == 'client' and project.client_id != int(user_id):
+        return NOT_OWNER, 403
+    if role == 'freelancer' and project.freelancer_id != int(user_id):
+        return NOT_ASSIGNED, 403
+    return None
+
+
+def viewer_error(project, role, user_id):
+    """O cliente dono, o freelancer contratado ou qualquer freelancer se o projeto estiver aberto."""
+    if role == 'client' and project.client_id != int(user_id):
+        return NOT_OWNER, 403
+    if role == 'freelancer' and project.status != 'open' and project.freelancer_id != int(user_id):
+        return NOT_VISIBLE, 403
+    if role not in ['client', 'freelancer']:
+        return FORBIDDEN, 403
+    return None
+
+
+def proposal_party_error(proposal, role, user_id):
+    """O cliente dono do projeto da proposta ou o freelancer que a enviou."""
+    if role == 'client':
+        return owner_error(proposal.project, role, user_id)
+    if role == 'freelancer':
+        return author_error(proposal, role, user_id)
+    return FORBIDDEN, 403
+
+
+def proposal_owner_error(proposal, role, user_id):
+    """Apenas o cliente dono do projeto da proposta."""
+    return owner_error(proposal.project, role, user_id)
+
+
+def author_error(proposal, role, user_id):
+    """Apenas o freelancer que enviou a proposta."""
+    if role != 'freelancer':
+        return FORBIDDEN, 403
+    if proposal.freelancer_id != int(user_id):
+        return NOT_AUTHOR, 403
+    return None
+
+
+def _error_response(error):
+    message, status = error
+    return jsonify({"error": message}), status
+
+
+def get_project_context(project_id):
+    """Retorna o ``ProjectContext`` do projeto (ou ``None``), memorizado em ``flask.g``."""
+    contexts = g.setdefault('project_contexts', {})
+    if project_id not in contexts:
+        project = Project.query.options(
+            joinedload(Project.client),
+            joinedload(Project.freelancer)
+        ).filter(Project.id == project_id).first()
+        contexts[project_id] = ProjectContext(project) if project else None
+    return contexts[project_id]
+
+
+def get_proposal(proposal_id):
+    """Retorna a proposta (ou ``None``) já com o projeto e seus participantes carregados."""
+    proposals = g.setdefault('proposals', {})
+    if proposal_id not in proposals:
+        proposal = Proposal.query.options(
+            joinedload(Proposal.project).joinedload(Project.client),
+            joinedload(Proposal.project).joinedload(Project.freelancer)
+        ).filter(Proposal.id == proposal_id).first()
+        proposals[proposal_id] = proposal
+        if proposal:
+            g.setdefault('project_contexts', {}).setdefault(proposal.project_id, ProjectContext(proposal.project))
+    return proposals[proposal_id]
+
+
+def authorize_project(project_id, role, user_id, rule=owner_error):
+    """Carrega o projeto e aplica a regra de acesso.
+
+    Retorna ``(contexto, None)`` quando permitido ou ``(None, resposta)`` com a
+    resposta de erro (404/403) pronta para ser devolvida pelo controlador.
+    """
+    context = get_project_context(project_id)
+    if context is None:
+        return None, (jsonify({"error": NOT_FOUND}), 404)
+    error = rule(context.project, role, user_id)
+    if error:
+        return None, _error_response(error)
+    return context, None
+
+
+def authorize_cached_project(project_id, role, user_id, rule=viewer_error):
+    """Como ``authorize_project``, mas sobre a representação do projeto em cache.
+
+    Para leituras que só devolvem o ``to_dict``: retorna ``(dicionário, None)``
+    ou ``(None, resposta)``. A regra de acesso é aplicada a cada chamada.
+    """
+    project = entity_cache.get_dict('project', project_id, lambda: Project.query.get(project_id))
+    if project is None:
+        return None, (jsonify({"error": NOT_FOUND}), 404)
+    error = rule(SimpleNamespace(**project), role, user_id)
+    if error:
+        return None, _error_response(error)
+    return project, None
+
+
+def authorize_proposal(proposal_id, role, user_id, rule=proposal_party_error):
+    """Carrega a proposta e aplica a regra de acesso.
+
+    Retorna ``(proposta, contexto do projeto, None)`` quando permitido ou
+    ``(None, None, resposta)`` com a resposta de erro.
+    """
+    proposal = get_proposal(proposal_id)
+    if proposal is None:
+        return None, None, (jsonify({"error": PROPOSAL_NOT_FOUND}), 404)
+    error = rule(proposal, role, user_id)
+    if error:
+        return None, None, _error_response(error)
+    return proposal, get_project_context(proposal.project_id), None
@@ -0,0 +1,81 @@
+"""Expiração dos projetos abertos cujo prazo já passou.
+
+Projetos abertos com o prazo vencido continuavam na listagem dos freelancers e
+nas recomendações. A tarefa periódica ``expire_projects`` move esses projetos
+para ``expired`` e rejeita as suas propostas pendentes, em blocos limitados
+(uma transação por bloco) percorridos pelo índice ``(status, deadline)``.
+Entre uma execução e outra, ``live_condition`` mantém os projetos vencidos
+fora das leituras.
+"""
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import or_, select, update
+
+from app import db
+from app.models.project import Project
+from app.models.proposal import Proposal
+from app.services import entity_cache
+from app.services.versioning import bump
+
+
+def live_condition(now=None):
+    """Condição dos projetos abertos e dentro do prazo (usa o índice ``(status, deadline)``)."""
+    now = now or datetime.today()
+    return Project.status == 'open', or_(Project.deadline.is_(None), Project.deadline >= now)
+
+
+def is_overdue(project, now=None):
+    """Indica se o projeto ainda aberto já passou do prazo."""
+    return project.deadline is not None and project.deadline < (now or datetime.today())
+
+
+def expire_overdue_projects(batch_size=None, max_batches=None):
+    """Expira os projetos abertos vencidos e rejeita as suas propostas pendentes.
+
+    Retorna a quantidade de projetos expirados, de propostas rejeitadas e de
+    blocos processados. Com ``max_batches`` o restante fica para a próxima
+    execução.
+    """
+    batch_size = batch_size or current_app.config.get('PROJECT_EXPIRY_BATCH_SIZE', 500)
+    now = datetime.today()
+    report = {'projects': 0, 'proposals': 0, 'batches': 0}
+
+    while max_batches is None or report['batches'] < max_batches:
+        ids = list(db.session.execute(
+            select(Project.id)
+            .where(Project.status == 'open', Project.deadline < now)
+            .order_by(Project.deadline)
+            .limit(batch_size)
+        ).scalars())
+        if not ids:
+            break
+
+        try:
+            # A condição de status é repetida: um projeto aceito entre a leitura e o UPDATE não expira
+            expired = db.session.execute(
+                update(Project)
+                .where(Project.id.in_(ids), Project.status == 'open')
+                .values(status='expired', version=bump(Project))
+            ).rowcount
+            rejected = db.session.execute(
+                update(Proposal)
+                .where(Proposal.project_id.in_(
+                    select(Project.id).where(Project.id.in_(ids), Project.status == 'expired')
+                ), Proposal.status == 'pending')
+                .values(status='rejected', version=bump(Proposal))
+            ).rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        entity_cache.invalidate('project', *ids)
+
+        report['projects'] += expired
+        report['proposals'] += rejected
+        report['batches'] += 1
+        if len(ids) < batch_size:
+            break
+
+    return report
@@ -0,0 +1,316 @@
+"""Busca facetada de projetos abertos com paginação por chave (keyset).
+
+A listagem ``/project/all`` devolve todos os projetos abertos de uma vez. A
+busca filtra por faixa de orçamento, janela de prazo, habilidades requeridas
+(qualquer uma ou todas, via ``project_skills``) e cliente, ordena e pagina
+pela chave de ordenação: a página seguinte começa depois do último item
+(``cursor``), sem ``OFFSET``, então o custo não cresce com a profundidade.
+
+As facetas (projetos por habilidade e por faixa de orçamento) são consultas
+agrupadas que usam os índices ``(status, budget)`` e ``project_skills
+(skill_id, project_id)``. Cada faceta ignora o próprio filtro, para mostrar
+quantos projetos cada opção traria, e o resultado fica em memória por
+``PROJECT_SEARCH_FACET_CACHE_SECONDS`` para a mesma combinação de filtros.
+
+Sem filtros as consultas agrupadas percorrem todos os projetos abertos (cerca
+de um segundo com 1M de projetos), então as facetas da busca sem filtros, a
+mais comum, vêm de um snapshot pré-calculado pela tarefa periódica
+``refresh_search_facets``; as contagens podem estar atrasadas em até um
+intervalo da tarefa.
+
+Nas ordenações por orçamento ou prazo, os projetos sem esse valor ficam fora
+do resultado.
+"""
+
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import and_, case, func, select, tuple_
+
+from app import db
+from app.models.facet_snapshot import FacetSnapshot
+from app.models.project import Project
+from app.models.skill import Skill, project_skills
+from app.services.project_expiry import live_condition
+
+# Ordenação -> (coluna, decrescente)
+SORTS = {
+    'newest': (Project.id, True),
+    'budget_desc': (Project.budget, True),
+    'budget_asc': (Project.budget, False),
+    'deadline': (Project.deadline, False)
+}
+SKILL_MATCH = ('any', 'all')
+
+# Faixas de orçamento das facetas: (rótulo, mínimo inclusivo, máximo exclusivo)
+BUDGET_BUCKETS = [
+    ('0-500', 0, 500),
+    ('500-2000', 500, 2000),
+    ('2000-5000', 2000, 5000),
+    ('5000-10000', 5000, 10000),
+    ('10000+', 10000, None)
+]
+
+_facet_lock = threading.Lock()
+_facet_cache = OrderedDict()  # filtros normalizados -> (expira em, facetas)
+_FACET_CACHE_MAX_KEYS = 1000
+_UNFILTERED = (None, None, None, None, None, (), 'any')  # facet_key sem o nome da faceta
+
+
+class SearchParams:
+    """Parâmetros da busca já validados."""
+
+    def __init__(self, args):
+        self.budget_min = _number(args, 'budget_min')
+        self.budget_max = _number(args, 'budget_max')
+        self.deadline_after = _date(args, 'deadline_after')
+        self.deadline_before = _date(args, 'deadline_before')
+        self.client_id = _integer(args, 'client_id')
+
+        skills = args.get('skills', '')
+        try:
+            self.skill_ids = sorted({int(skill_id) for skill_id in skills.split(',') if skill_id.strip()})
+        except ValueError:
+            raise ValueError("Parâmetro 'skills' deve ser uma lista de ids separados por vírgula.")
+        self.skill_match = args.get('skill_match', 'any')
+        if self.skill_match not in SKILL_MATCH:
+            raise ValueError(f"Parâmetro 'skill_match' inválido. Use: {', '.join(SKILL_MATCH)}.")
+
+        self.sort = args.get('sort', 'newest')
+        if self.sort not in SORTS:
+            raise ValueError(f"Ordenação inválida. Use: {', '.join(SORTS)}.")
+
+        max_limit = current_app.config.get('PROJECT_SEARCH_MAX_LIMIT', 100)
+        self.limit = min(max(_integer(args, 'limit') or 20, 1), max_limit)
+        self.cursor = _decode_cursor(args.get('cursor'), self.sort) if args.get('cursor') else None
+        self.facets = args.get('facets', '1' if self.cursor is None else '0') == '1'
+
+    def facet_key(self, facet):
+        """Filtros que afetam a faceta (cada faceta ignora o próprio filtro)."""
+        budget = (None, None) if facet == 'budget' else (self.budget_min, self.budget_max)
+        skills = ((), 'any') if facet == 'skills' or not self.skill_ids else (tuple(self.skill_ids), self.skill_match)
+        return (facet,) + budget + (self.deadline_after, self.deadline_before, self.client_id) + skills
+
+
+def _number(args, name):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{name}' deve ser numérico.")
+
+
+def _integer(args, name):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{name}' deve ser um número inteiro.")
+
+
+def _date(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{name}' deve estar no formato ISO 8601.")
+
+
+def _encode_cursor(sort, project):
+    column, _ = SORTS[sort]
+    value = getattr(project, column.key)
+    value = value.isoformat() if isinstance(value, datetime) else value
+    raw = json.dumps([sort, value, project.id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def _decode_cursor(cursor, sort):
+    try:
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if cursor_sort != sort:
+            raise ValueError()
+        if sort == 'deadline':
+            value = datetime.fromisoformat(value)
+        return value, int(last_id)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido para esta ordenação.")
+
+
+def _skill_condition(params):
+    if not params.skill_ids:
+        return None
+    matching = select(project_skills.c.project_id).where(project_skills.c.skill_id.in_(params.skill_ids))
+    if params.skill_match == 'all' and len(params.skill_ids) > 1:
+        matching = matching.group_by(project_skills.c.project_id).having(
+            func.count(project_skills.c.skill_id) == len(params.skill_ids)
+        )
+    return Project.id.in_(matching)
+
+
+def _budget_conditions(params):
+    conditions = []
+    if params.budget_min is not None:
+        conditions.append(Project.budget >= params.budget_min)
+    if params.budget_max is not None:
+        conditions.append(Project.budget <= params.budget_max)
+    return conditions
+
+
+def _base_conditions(params):
+    """Projetos abertos e dentro do prazo, com os filtros que não têm faceta."""
+    conditions = list(live_condition())
+    if params.deadline_after is not None:
+        conditions.append(Project.deadline >= params.deadline_after)
+    if params.deadline_before is not None:
+        conditions.append(Project.deadline <= params.deadline_before)
+    if params.client_id is not None:
+        conditions.append(Project.client_id == params.client_id)
+    return conditions
+
+
+def _page(params):
+    column, descending = SORTS[params.sort]
+    conditions = _base_conditions(params) + _budget_conditions(params)
+    skill_condition = _skill_condition(params)
+    if skill_condition is not None:
+        conditions.append(skill_condition)
+    if column is not Project.id:
+        conditions.append(column.isnot(None))
+
+    if params.cursor is not None:
+        value, last_id = params.cursor
+        if column is Project.id:
+            conditions.append(Project.id < last_id if descending else Project.id > last_id)
+        else:
+            key = tuple_(column, Project.id)
+            conditions.append(key < tuple_(value, last_id) if descending else key > tuple_(value, last_id))
+
+    order = [column.desc(), Project.id.desc()] if descending else [column.asc(), Project.id.asc()]
+    if column is Project.id:
+        order = order[:1]
+
+    # Um item a mais indica se existe a próxima página
+    projects = Project.query.filter(*conditions).order_by(*order).limit(params.limit + 1).all()
+    next_cursor = _encode_cursor(params.sort, projects[params.limit - 1]) if len(projects) > params.limit else None
+    return projects[:params.limit], next_cursor
+
+
+def _skill_facets(params):
+    """Projetos por habilidade, com todos os filtros exceto o de habilidades."""
+    limit = current_app.config.get('PROJECT_SEARCH_SKILL_FACETS', 20)
+    count = func.count(project_skills.c.project_id).label('count')
+    rows = db.session.execute(
+        select(project_skills.c.skill_id, Skill.name, count)
+        .join(Project, Project.id == project_skills.c.project_id)
+        .join(Skill, Skill.id == project_skills.c.skill_id)
+        .where(*_base_conditions(params), *_budget_conditions(params))
+        .group_by(project_skills.c.skill_id, Skill.name)
+        .order_by(count.desc(), project_skills.c.skill_id)
+        .limit(limit)
+    ).all()
+    return [{'id': skill_id, 'name': name, 'count': total} for skill_id, name, total in rows]
+
+
+def _budget_facets(params):
+    """Projetos por faixa de orçamento, com todos os filtros exceto o de orçamento."""
+    bucket = case(
+        *[
+            (and_(Project.budget >= low, Project.budget < high) if high is not None else Project.budget >= low, label)
+            for label, low, high in BUDGET_BUCKETS
+        ],
+        else_=None
+    ).label('bucket')
+    conditions = _base_conditions(params)
+    skill_condition = _skill_condition(params)
+    if skill_condition is not None:
+        conditions.append(skill_condition)
+    counts = dict(db.session.execute(
+        select(bucket, func.count(Project.id)).where(*conditions, Project.budget.isnot(None)).group_by(bucket)
+    ).all())
+    return [{'range': label, 'count': counts.get(label, 0)} for label, _, _ in BUDGET_BUCKETS]
+
+
+FACETS = {'skills': _skill_facets, 'budget': _budget_facets}
+
+
+def compute_facets(params):
+    """Calcula as facetas com as consultas agrupadas."""
+    return {name: compute(params) for name, compute in FACETS.items()}
+
+
+def refresh_facet_snapshot():
+    """Recalcula as facetas da busca sem filtros e substitui o snapshot gravado. Faz commit."""
+    result = compute_facets(SearchParams({}))
+    snapshot = FacetSnapshot(payload=json.dumps(result))
+    FacetSnapshot.query.delete()
+    db.session.add(snapshot)
+    db.session.commit()
+    return dict(result, computed_at=snapshot.computed_at.isoformat())
+
+
+def _unfiltered_facets():
+    """Facetas da busca sem filtros: do snapshot mais recente (ou calculadas na primeira vez)."""
+    snapshot = FacetSnapshot.query.order_by(FacetSnapshot.id.desc()).first()
+    if snapshot is None:
+        return refresh_facet_snapshot()
+    return json.loads(snapshot.payload)
+
+
+def facets(params):
+    """Facetas da busca; cada uma vem da memória, do snapshot (sem filtros) ou das consultas agrupadas.
+
+    Como cada faceta ignora o próprio filtro, a faceta de habilidades de uma
+    busca filtrada só por habilidades é a mesma da busca sem filtros (e o
+    mesmo vale para o orçamento): ela sai do snapshot em vez de percorrer
+    todos os projetos abertos.
+    """
+    ttl = current_app.config.get('PROJECT_SEARCH_FACET_CACHE_SECONDS', 30)
+    now = time.monotonic()
+    result = {}
+    unfiltered = None
+    for name, compute in FACETS.items():
+        key = params.facet_key(name)
+        with _facet_lock:
+            cached = _facet_cache.get(key)
+        if cached and cached[0] > now:
+            result[name] = cached[1]
+            continue
+
+        if key[1:] == _UNFILTERED:
+            unfiltered = unfiltered or _unfiltered_facets()
+            result[name] = unfiltered[name]
+        else:
+            result[name] = compute(params)
+        with _facet_lock:
+            _facet_cache[key] = (now + ttl, result[name])
+            _facet_cache.move_to_end(key)
+            while len(_facet_cache) > _FACET_CACHE_MAX_KEYS:
+                _facet_cache.popitem(last=False)
+    return result
+
+
+def search_projects(args):
+    """Executa a busca a partir dos parâmetros da requisição.
+
+    Lança ``ValueError`` com a mensagem para o usuário quando um parâmetro é inválido.
+    """
+    params = SearchParams(args)
+    projects, next_cursor = _page(params)
+    result = {
+        'projects': [project.to_dict() for project in projects],
+        'next_cursor': next_cursor
+    }
+    if params.facets:
+        result['facets'] = facets(params)
+    return result
@@ -0,0 +1,118 @@
+"""Ordenação das propostas de um projeto pela melhor combinação para o cliente.
+
+``/proposal/all/<id>`` devolvia as propostas em ordem arbitrária, e clientes
+com centenas de propostas as comparavam manualmente. Com ``?sort=best`` cada
+proposta recebe uma pontuação entre 0 e 1, média ponderada (``WEIGHTS``) de:
+
+- ``price``: valor proposto em relação ao orçamento do projeto (metade do
+  orçamento ou menos vale 1, o orçamento exato 0,5 e 50% acima dele 0);
+- ``time``: prazo estimado em relação aos dias até o prazo do projeto, na
+  mesma escala;
+- ``rating``: média das avaliações do freelancer, suavizada para quem tem
+  poucas avaliações (``RATING_PRIOR`` com peso ``RATING_PRIOR_WEIGHT``);
+- ``skills``: fração das habilidades do projeto que o freelancer possui.
+
+Sem orçamento ou sem prazo, a referência é a mediana das propostas do
+projeto. As propostas, as avaliações agregadas e a sobreposição de
+habilidades vêm de uma única consulta; a pontuação é calculada coluna a
+coluna sobre todas as propostas de uma vez, e a paginação (``limit``/
+``offset``) é aplicada na ordem já pontuada.
+"""
+
+import statistics
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models.freelancer import Freelancer
+from app.models.proposal import Proposal
+from app.models.review import Review
+from app.models.skill import freelancer_skills, project_skills
+
+SORTS = ('best',)
+WEIGHTS = {'price': 0.3, 'time': 0.2, 'rating': 0.3, 'skills': 0.2}
+RATING_PRIOR = 3.0
+RATING_PRIOR_WEIGHT = 2
+
+
+def _candidates_query(project_id):
+    """Propostas do projeto com o nome do freelancer, as avaliações e as habilidades em comum."""
+    bidders = select(Proposal.freelancer_id).where(Proposal.project_id == project_id)
+    required = select(project_skills.c.skill_id).where(project_skills.c.project_id == project_id)
+    ratings = (
+        select(Review.freelancer_id, func.avg(Review.rating).label('average'), func.count(Review.id).label('count'))
+        .where(Review.freelancer_id.in_(bidders))
+        .group_by(Review.freelancer_id)
+        .subquery()
+    )
+    overlap = (
+        select(freelancer_skills.c.freelancer_id, func.count().label('matching'))
+        .where(freelancer_skills.c.freelancer_id.in_(bidders), freelancer_skills.c.skill_id.in_(required))
+        .group_by(freelancer_skills.c.freelancer_id)
+        .subquery()
+    )
+    required_count = select(func.count()).select_from(required.subquery()).scalar_subquery()
+    return (
+        select(Proposal, Freelancer.name, ratings.c.average, ratings.c.count, overlap.c.matching, required_count)
+        .join(Freelancer, Freelancer.id == Proposal.freelancer_id)
+        .outerjoin(ratings, ratings.c.freelancer_id == Proposal.freelancer_id)
+        .outerjoin(overlap, overlap.c.freelancer_id == Proposal.freelancer_id)
+        .where(Proposal.project_id == project_id)
+    )
+
+
+def _ratio_scores(values, reference):
+    """1 até metade da referência, 0,5 na referência e 0 a partir de 1,5 vez a referência."""
+    if not reference or reference <= 0:
+        return [0.5] * len(values)
+    return [min(max(1.5 - value / reference, 0.0), 1.0) for value in values]
+
+
+def score_columns(bids, days, averages, counts, matching, budget, days_available, required):
+    """Pontuação de cada critério, calculada sobre as colunas de todas as propostas."""
+    price = _ratio_scores(bids, budget or statistics.median(bids))
+    time = _ratio_scores(days, days_available if days_available and days_available > 0 else statistics.median(days))
+    rating = [
+        ((average or 0) * count + RATING_PRIOR * RATING_PRIOR_WEIGHT) / (count + RATING_PRIOR_WEIGHT) / 5
+        for average, count in zip(averages, counts)
+    ]
+    skills = [count / required for count in matching] if required else [0.0] * len(bids)
+    return {'price': price, 'time': time, 'rating': rating, 'skills': skills}
+
+
+def rank_proposals(project, limit, offset=0):
+    """Retorna ``(propostas da página, total)`` ordenadas pela pontuação, com os detalhes de cada uma."""
+    rows = db.session.execute(_candidates_query(project.id)).all()
+    if not rows:
+        return [], 0
+
+    proposals = [row[0] for row in rows]
+    counts = [row[3] or 0 for row in rows]
+    matching = [row[4] or 0 for row in rows]
+    days_available = (project.deadline - datetime.today()).days if project.deadline else None
+    columns = score_columns(
+        [proposal.bid_amount for proposal in proposals],
+        [proposal.estimated_days for proposal in proposals],
+        [row[2] for row in rows], counts, matching,
+        project.budget, days_available, rows[0][5]
+    )
+    totals = [
+        sum(WEIGHTS[name] * columns[name][index] for name in WEIGHTS)
+        for index in range(len(proposals))
+    ]
+
+    order = sorted(range(len(proposals)), key=lambda index: (-totals[index], proposals[index].id))
+    page = []
+    for index in order[offset:offset + limit]:
+        item = proposals[index].to_dict()
+        item.update({
+            'freelancer_name': rows[index][1],
+            'score': round(totals[index], 4),
+            'scores': {name: round(columns[name][index], 4) for name in WEIGHTS},
+            'average_rating': round(rows[index][2], 1) if rows[index][2] is not None else None,
+            'review_count': counts[index],
+            'matching_skills': matching[index]
+        })
+        page.append(item)
+    return page, len(proposals)
@@ -0,0 +1,68 @@
+"""Transições de estado de propostas executadas de forma atômica no banco.
+
+Aceitar uma proposta envolve escritas que precisam acontecer juntas: marcar
+a vencedora, atribuir o freelancer ao projeto (somando-o à carga do
+freelancer) e rejeitar as demais propostas pendentes. Em vez de ler e depois
+escrever (o que permite que duas aceitações simultâneas passem pela
+verificação), o projeto é reservado com um ``UPDATE`` condicional: apenas a
+transação que o encontrar ainda aberto segue, e a proposta só é aceita se a
+sua versão ainda for a lida.
+"""
+
+from sqlalchemy import update
+
+from app import db
+from app.models.project import Project
+from app.models.proposal import Proposal
+from app.services import entity_cache, freelancer_load
+from app.services.project_expiry import live_condition
+from app.services.versioning import bump
+
+
+class ProposalConflict(Exception):
+    """Lançada quando outra proposta foi aceita (ou o projeto fechado) concorrentemente."""
+
+
+def accept_proposal(proposal):
+    """Aceita a proposta e rejeita as concorrentes pendentes em uma única transação.
+
+    Faz commit e retorna a quantidade de propostas rejeitadas. Aceitar uma
+    proposta que já está aceita não altera nada.
+    """
+    if proposal.status == 'accepted':
+        return 0
+
+    project_id = proposal.project_id
+    try:
+        reserved = db.session.execute(
+            update(Project)
+            .where(Project.id == project_id, *live_condition())
+            .values(status='in_progress', freelancer_id=proposal.freelancer_id, version=bump(Project))
+        ).rowcount
+        if reserved != 1:
+            raise ProposalConflict()
+
+        # A proposta precisa estar como foi lida (mesma versão): senão outra requisição a alterou
+        accepted = db.session.execute(
+            update(Proposal)
+            .where(Proposal.id == proposal.id, Proposal.version == proposal.version)
+            .values(status='accepted', version=bump(Proposal))
+        ).rowcount
+        if accepted != 1:
+            raise ProposalConflict()
+        freelancer_load.adjust({proposal.freelancer_id: 1})
+
+        rejected = db.session.execute(
+            update(Proposal)
+            .where(Proposal.project_id == project_id, Proposal.id != proposal.id, Proposal.status == 'pending')
+            .values(status='rejected', version=bump(Proposal))
+        ).rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # O UPDATE em lote não passa pelos eventos do ORM
+    entity_cache.invalidate('project', project_id)
+    entity_cache.invalidate('freelancer', proposal.freelancer_id)
+    return rejected
@@ -0,0 +1,164 @@
+"""Limitação de taxa com token buckets por IP e por email.
+
+Cada tentativa de login executa um hash de senha caro; sem limite, uma rajada
+de credential stuffing vira uma negação de serviço contra os próprios workers.
+O decorador ``rate_limit`` é aplicado nas rotas, antes do controlador, então a
+requisição recusada não toca no banco nem no pool de hashing.
+
+Por padrão os buckets ficam em memória no processo. Com vários workers na
+mesma máquina, ``RATE_LIMIT_STORAGE`` pode apontar para um arquivo SQLite
+compartilhado (ex.: ``sqlite:////tmp/rate_limit.db``).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(limit):
+    """Converte '10/minute' em (capacidade, tokens por segundo)."""
+    amount, unit = limit.split('/')
+    amount = int(amount)
+    return amount, amount / _UNITS[unit.strip().rstrip('s')]
+
+
+class MemoryBucketStore:
+    """Buckets em memória com limite de chaves e descarte dos buckets ociosos.
+
+    Um bucket ocioso por mais tempo do que leva para encher de novo é
+    equivalente a um bucket inexistente, então é removido. As chaves ficam em
+    ordem de último acesso, o que permite a limpeza a partir das mais antigas.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # chave -> (tokens, atualizado_em, janela)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, now):
+        """Consome um token; retorna (permitido, segundos até o próximo token)."""
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.pop(key, (capacity, now, 0))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, capacity / rate)
+            self._prune(now)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def _prune(self, now):
+        while self._buckets:
+            key, (_, updated_at, window) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - updated_at < window:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """Buckets em um arquivo SQLite compartilhado entre os workers da máquina."""
+
+    def __init__(self, path, prune_interval=60):
+        self.path = path
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_bucket ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_rate_limit_bucket_expires_at ON rate_limit_bucket (expires_at)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def consume(self, key, capacity, rate, now):
+        """Consome um token em uma transação exclusiva; retorna (permitido, retry_after)."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM rate_limit_bucket WHERE key = ?', (key,)).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limit_bucket (key, tokens, updated_at, expires_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + capacity / rate)
+            )
+            if now >= self._next_prune:
+                # Buckets que já encheram de novo equivalem a buckets inexistentes
+                conn.execute('DELETE FROM rate_limit_bucket WHERE expires_at < ?', (now,))
+                self._next_prune = now + self.prune_interval
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Retorna o armazenamento de buckets configurado, criado na primeira utilização."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                storage = current_app.config.get('RATE_LIMIT_STORAGE') or ''
+                if storage.startswith('sqlite:///'):
+                    _store = SQLiteBucketStore(storage[len('sqlite:///'):])
+                else:
+                    _store = MemoryBucketStore(current_app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+    return _store
+
+
+def _too_many_requests(retry_after):
+    response = jsonify({"error": "Muitas requisições. Tente novamente mais tarde."})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+def rate_limit(scope, by_email=False):
+    """Decorador de rota que aplica o limite ``RATE_LIMITS[scope]`` por IP (e por email)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_app.config.get('RATE_LIMIT_ENABLED', True):
+                capacity, rate = parse_limit(current_app.config['RATE_LIMITS'][scope])
+                keys = [f'{scope}:ip:{request.remote_addr}']
+                if by_email:
+                    data = request.get_json(silent=True)
+                    email = data.get('email') if isinstance(data, dict) else None
+                    if isinstance(email, str):
+                        keys.append(f'{scope}:email:{email.strip().lower()}')
+
+                store = get_store()
+                now = time.time()
+                for key in keys:
+                    allowed, retry_after = store.consume(key, capacity, rate, now)
+                    if not allowed:
+                        return _too_many_requests(retry_after)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
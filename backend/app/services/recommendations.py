@@ -0,0 +1,116 @@
+"""Consultas e pontuação das recomendações de freelancers para um projeto.
+
+As consultas são montadas como ``select()`` para serem executadas tanto pela
+sessão síncrona do Flask quanto pela sessão assíncrona (``app/asgi.py``), e a
+pontuação é uma função pura: as duas rotas produzem a mesma resposta. As
+avaliações de todos os candidatos vêm de uma única consulta agregada, em vez
+de duas consultas por freelancer.
+
+As habilidades do projeto são expandidas pelo grafo de coocorrência
+(``skill_graph``): um freelancer sem uma habilidade pedida, mas com uma
+relacionada, recebe parte do crédito (peso da relação vezes
+``SKILL_GRAPH_EXPANSION_WEIGHT``) e também entra entre os candidatos.
+
+A carga do freelancer vem do contador ``Freelancer.active_projects``, lido
+junto com o candidato: quem tem ``RECOMMENDATION_LOAD_CAP`` projetos em
+andamento ou mais perde ``RECOMMENDATION_LOAD_PENALTY`` da pontuação (menos
+projetos, proporcionalmente menos), e ``max_active_projects`` filtra os
+candidatos na própria consulta.
+"""
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+from app.models.freelancer import Freelancer
+from app.models.review import Review
+from app.models.skill import freelancer_skills, project_skills
+
+NO_SKILLS_MESSAGE = "Nenhuma habilidade associada ao projeto. Recomendações baseadas apenas em avaliações."
+
+
+def project_skill_ids_query(project_id):
+    """Ids das habilidades requeridas pelo projeto."""
+    return select(project_skills.c.skill_id).where(project_skills.c.project_id == project_id)
+
+
+def skill_expansion(graph, project_skill_ids):
+    """Habilidades relacionadas às do projeto: ``{habilidade do projeto: {relacionada: crédito}}``."""
+    config = current_app.config
+    per_skill = config.get('SKILL_GRAPH_EXPANSION_PER_SKILL', 5)
+    factor = config.get('SKILL_GRAPH_EXPANSION_WEIGHT', 0.5)
+    if per_skill <= 0 or factor <= 0:
+        return {}
+    return {
+        skill_id: {other: weight * factor for other, weight in related.items()}
+        for skill_id, related in graph.expand(project_skill_ids, per_skill).items()
+    }
+
+
+def expanded_skill_ids(project_skill_ids, expansion):
+    """Habilidades do projeto seguidas das relacionadas, para a busca de candidatos."""
+    related = {other for items in expansion.values() for other in items}
+    return list(project_skill_ids) + sorted(related.difference(project_skill_ids))
+
+
+def candidates_query(skill_ids, max_active_projects=None):
+    """Freelancers com pelo menos uma das habilidades, com as habilidades já carregadas.
+
+    ``max_active_projects`` exclui quem tem mais projetos em andamento que o limite.
+    """
+    matching = select(freelancer_skills.c.freelancer_id).where(freelancer_skills.c.skill_id.in_(skill_ids))
+    query = select(Freelancer).where(Freelancer.id.in_(matching))
+    if max_active_projects is not None:
+        query = query.where(Freelancer.active_projects <= max_active_projects)
+    return query.options(selectinload(Freelancer.skill_set)).order_by(Freelancer.id)
+
+
+def ratings_query(freelancer_ids):
+    """Média e quantidade de avaliações de cada freelancer."""
+    return select(Review.freelancer_id, func.avg(Review.rating), func.count(Review.id)).where(
+        Review.freelancer_id.in_(freelancer_ids)
+    ).group_by(Review.freelancer_id)
+
+
+def build_recommendations(project_skill_ids, freelancers, ratings, expansion=None):
+    """Pontua e ordena os candidatos (50% habilidades, 50% avaliações, descontada a carga).
+
+    ``ratings`` mapeia o id do freelancer para ``(média, quantidade)`` e
+    ``expansion`` é o resultado de ``skill_expansion``.
+    """
+    expansion = expansion or {}
+    penalty = current_app.config.get('RECOMMENDATION_LOAD_PENALTY', 0.3)
+    load_cap = max(current_app.config.get('RECOMMENDATION_LOAD_CAP', 5), 1)
+    recommendations = []
+    for freelancer in freelancers:
+        # Conta quantas habilidades do projeto o freelancer possui
+        freelancer_skill_ids = {skill.id for skill in freelancer.skill_set}
+        matching_skills = len(set(project_skill_ids).intersection(freelancer_skill_ids))
+        credit = matching_skills
+        related_skills = 0
+        # Cada habilidade que falta vale o crédito da relacionada mais forte que ele possui
+        for skill_id in set(project_skill_ids).difference(freelancer_skill_ids):
+            best = max((weight for other, weight in expansion.get(skill_id, {}).items() if other in freelancer_skill_ids), default=0)
+            if best:
+                credit += best
+                related_skills += 1
+        skill_match_score = credit / len(project_skill_ids) if project_skill_ids else 0
+
+        avg_rating, review_count = ratings.get(freelancer.id, (None, 0))
+        avg_rating = avg_rating or 0
+        score = (0.5 * skill_match_score) + (0.5 * (avg_rating / 5.0)) if avg_rating else skill_match_score
+        score *= 1 - penalty * min(freelancer.active_projects or 0, load_cap) / load_cap
+
+        recommendations.append({
+            'freelancer': freelancer.to_dict(),
+            'score': round(score, 2),
+            'matching_skills': matching_skills,
+            'related_skills': related_skills,
+            'active_projects': freelancer.active_projects,
+            'average_rating': round(avg_rating, 1) if avg_rating else None,
+            'review_count': review_count
+        })
+
+    # Ordena por pontuação (maior para menor)
+    recommendations.sort(key=lambda x: x['score'], reverse=True)
+    return recommendations
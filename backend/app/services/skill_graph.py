@@ -0,0 +1,167 @@
+"""Grafo de coocorrência de habilidades para expandir as recomendações.
+
+As recomendações só consideravam as habilidades exatas do projeto: um projeto
+que pede "React" ignorava freelancers fortes em "Next.js". Aqui duas
+habilidades são relacionadas quando aparecem juntas nos mesmos perfis
+(``freelancer_skills``) ou projetos (``project_skills``), com peso
+``coocorrências / sqrt(uso de A * uso de B)`` (similaridade do cosseno, entre
+0 e 1). Cada habilidade guarda só as ``SKILL_GRAPH_MAX_RELATED`` mais fortes
+com pelo menos ``SKILL_GRAPH_MIN_COOCCURRENCE`` coocorrências.
+
+O grafo é calculado pela tarefa periódica ``refresh_skill_graph`` (uma leitura
+ordenada de cada tabela de associação, contada em Python) e gravado como
+snapshot. Cada processo mantém o grafo em memória, como um dicionário esparso
+``habilidade -> {relacionada: peso}``, e só consulta o banco a cada
+``SKILL_GRAPH_RELOAD_SECONDS`` para ver se existe um snapshot mais novo; as
+consultas ao grafo nunca fazem junções. Antes do primeiro snapshot o grafo é
+calculado em memória no primeiro uso.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import Counter
+from itertools import combinations
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.models.skill import freelancer_skills, project_skills
+from app.models.skill_graph_snapshot import SkillGraphSnapshot
+
+
+class SkillGraph:
+    """Habilidades relacionadas de cada habilidade, das mais fortes para as mais fracas."""
+
+    def __init__(self, related, snapshot_id=None):
+        self.related = related  # id -> [(id relacionada, peso, coocorrências)]
+        self.snapshot_id = snapshot_id
+        self.checked_at = time.monotonic()
+
+    @classmethod
+    def from_data(cls, data, snapshot_id=None):
+        """Cria o grafo a partir do resultado de ``compute_graph`` (ou do snapshot em JSON)."""
+        related = {int(skill_id): [tuple(item) for item in items] for skill_id, items in data['related'].items()}
+        return cls(related, snapshot_id)
+
+    def related_to(self, skill_id, limit=None):
+        """Habilidades relacionadas como ``[(id, peso, coocorrências)]``."""
+        items = self.related.get(skill_id, [])
+        return items[:limit] if limit is not None else items
+
+    def expand(self, skill_ids, per_skill):
+        """Para cada habilidade, as ``per_skill`` relacionadas mais fortes que não estão em ``skill_ids``.
+
+        Retorna ``{habilidade: {relacionada: peso}}``.
+        """
+        requested = set(skill_ids)
+        expansion = {}
+        for skill_id in requested:
+            related = [(other, weight) for other, weight, _ in self.related.get(skill_id, ()) if other not in requested]
+            if related[:per_skill]:
+                expansion[skill_id] = dict(related[:per_skill])
+        return expansion
+
+
+def _owner_groups(session, table, owner_column):
+    """Conjuntos de habilidades de cada perfil ou projeto, lidos em ordem em uma consulta."""
+    owner = table.c[owner_column]
+    rows = session.execute(
+        select(owner, table.c.skill_id).order_by(owner).execution_options(yield_per=5000)
+    )
+    current, skills = None, []
+    for owner_id, skill_id in rows:
+        if owner_id != current:
+            if skills:
+                yield skills
+            current, skills = owner_id, []
+        skills.append(skill_id)
+    if skills:
+        yield skills
+
+
+def compute_graph(session):
+    """Conta as coocorrências e monta as relações de cada habilidade (``{id: [[id, peso, n]]}``)."""
+    config = current_app.config
+    min_count = config.get('SKILL_GRAPH_MIN_COOCCURRENCE', 2)
+    max_related = config.get('SKILL_GRAPH_MAX_RELATED', 20)
+
+    usage = Counter()
+    pairs = Counter()
+    groups = 0
+    for table, owner_column in ((freelancer_skills, 'freelancer_id'), (project_skills, 'project_id')):
+        for skills in _owner_groups(session, table, owner_column):
+            skills = sorted(set(skills))
+            usage.update(skills)
+            pairs.update(combinations(skills, 2))
+            groups += 1
+
+    related = {}
+    for (first, second), count in pairs.items():
+        if count < min_count:
+            continue
+        weight = round(count / math.sqrt(usage[first] * usage[second]), 4)
+        related.setdefault(first, []).append((second, weight, count))
+        related.setdefault(second, []).append((first, weight, count))
+    for skill_id, items in related.items():
+        items.sort(key=lambda item: (-item[1], -item[2], item[0]))
+        related[skill_id] = [list(item) for item in items[:max_related]]
+
+    return {'related': related, 'skills': len(usage), 'groups': groups}
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def refresh_graph(session):
+    """Recalcula o grafo e substitui o snapshot gravado. Faz commit.
+
+    O novo snapshot é inserido antes de apagar os anteriores: assim o SQLite
+    lhe dá um id maior que o de qualquer snapshot já carregado pelos outros
+    processos (com a tabela vazia o id voltaria a 1 e ``get_graph`` não
+    perceberia a troca).
+    """
+    global _graph
+    result = compute_graph(session)
+    snapshot = SkillGraphSnapshot(payload=json.dumps(result))
+    session.add(snapshot)
+    session.flush()
+    session.query(SkillGraphSnapshot).filter(SkillGraphSnapshot.id < snapshot.id).delete(synchronize_session=False)
+    session.commit()
+    with _graph_lock:
+        _graph = SkillGraph.from_data(result, snapshot.id)
+    return {
+        'computed_at': snapshot.computed_at.isoformat(),
+        'skills': result['skills'],
+        'relations': sum(len(items) for items in result['related'].values()) // 2
+    }
+
+
+def get_graph(session):
+    """Retorna o grafo do processo, recarregado quando existe um snapshot mais novo.
+
+    Recebe a sessão para funcionar também pela sessão assíncrona
+    (``AsyncSession.run_sync``).
+    """
+    global _graph
+    reload_seconds = current_app.config.get('SKILL_GRAPH_RELOAD_SECONDS', 30)
+    graph = _graph
+    if graph is not None and time.monotonic() - graph.checked_at < reload_seconds:
+        return graph
+
+    with _graph_lock:
+        graph = _graph
+        if graph is not None and time.monotonic() - graph.checked_at < reload_seconds:
+            return graph
+        latest = session.scalar(select(SkillGraphSnapshot.id).order_by(SkillGraphSnapshot.id.desc()).limit(1))
+        if latest is not None and (graph is None or graph.snapshot_id != latest):
+            payload = session.scalar(select(SkillGraphSnapshot.payload).where(SkillGraphSnapshot.id == latest))
+            graph = SkillGraph.from_data(json.loads(payload), latest)
+        elif latest is None and (graph is None or graph.snapshot_id is not None):
+            # Ainda sem snapshot (a tarefa periódica não rodou): calcula só em memória
+            graph = SkillGraph.from_data(compute_graph(session))
+        graph.checked_at = time.monotonic()
+        _graph = graph
+    return graph
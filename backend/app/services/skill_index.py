@@ -0,0 +1,204 @@
+"""Índice em memória dos nomes de habilidades para autocompletar e resolução em lote.
+
+Vincular habilidades pelo nome custava uma consulta por nome, e não havia como
+sugerir nomes enquanto o usuário digita. Aqui cada processo mantém um array
+ordenado com os nomes normalizados (minúsculas, sem acentos e espaços
+repetidos) de todas as habilidades, e também com cada palavra a partir da
+segunda (``native`` encontra "React Native"). A sugestão é uma busca binária
+pelo prefixo, e os resultados são ordenados pelo uso em ``freelancer_skills``
+e ``project_skills``.
+
+O índice é reconstruído a cada ``SKILL_INDEX_REFRESH_SECONDS`` (uma consulta
+agrupada) e recebe, após o commit, as habilidades criadas pelo próprio
+processo. ``resolve_skill_ids`` mapeia uma lista de nomes para ids com uma
+consulta e cria as que faltam com um único INSERT; nomes que diferem só em
+maiúsculas ou acentos resolvem para a mesma habilidade.
+"""
+
+import bisect
+import re
+import threading
+import time
+import unicodedata
+
+from flask import current_app
+from sqlalchemy import event, func, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.skill import Skill, freelancer_skills, project_skills
+
+MAX_NAME_LENGTH = Skill.__table__.c.name.type.length
+
+
+def normalize(name):
+    """Forma usada na comparação: sem acentos, minúsculas e espaços simples."""
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', stripped).strip().casefold()
+
+
+class SkillIndex:
+    """Array ordenado de (termo normalizado, id) com o nome e o uso de cada habilidade."""
+
+    def __init__(self, rows):
+        self.skills = {}  # id -> (nome, uso)
+        self.by_normalized = {}  # nome normalizado -> id (a habilidade mais usada)
+        for skill_id, name, usage in rows:
+            self._add(skill_id, name, usage)
+        self.terms = sorted(
+            (term, skill_id) for skill_id, (name, _) in self.skills.items() for term in self._terms(name)
+        )
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def _terms(name):
+        words = normalize(name).split(' ')
+        return {' '.join(words[start:]) for start in range(len(words))}
+
+    def _add(self, skill_id, name, usage):
+        self.skills[skill_id] = (name, usage)
+        key = normalize(name)
+        current = self.by_normalized.get(key)
+        if current is None or usage > self.skills[current][1]:
+            self.by_normalized[key] = skill_id
+
+    def add(self, skill_id, name):
+        """Inclui uma habilidade recém-criada."""
+        if skill_id in self.skills:
+            return
+        self._add(skill_id, name, 0)
+        for term in self._terms(name):
+            bisect.insort(self.terms, (term, skill_id))
+
+    def suggest(self, prefix, limit):
+        """Habilidades cujo nome (ou uma das palavras) começa com o prefixo, das mais usadas para as menos."""
+        prefix = normalize(prefix)
+        if prefix:
+            start = bisect.bisect_left(self.terms, (prefix,))
+            end = bisect.bisect_left(self.terms, (prefix + '\U0010ffff',))
+            matches = {skill_id for _, skill_id in self.terms[start:end]}
+        else:
+            matches = self.skills.keys()
+        ranked = sorted(matches, key=lambda skill_id: (-self.skills[skill_id][1], self.skills[skill_id][0].casefold()))
+        return [
+            {'id': skill_id, 'name': self.skills[skill_id][0], 'usage': self.skills[skill_id][1]}
+            for skill_id in ranked[:limit]
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _load_index():
+    links = union_all(
+        select(freelancer_skills.c.skill_id.label('skill_id')),
+        select(project_skills.c.skill_id.label('skill_id'))
+    ).subquery()
+    usage = select(links.c.skill_id, func.count().label('usage')).group_by(links.c.skill_id).subquery()
+    rows = db.session.execute(
+        select(Skill.id, Skill.name, func.coalesce(usage.c.usage, 0)).outerjoin(usage, usage.c.skill_id == Skill.id)
+    ).all()
+    return SkillIndex(rows)
+
+
+def get_index():
+    """Retorna o índice do processo, reconstruído quando passa de ``SKILL_INDEX_REFRESH_SECONDS``."""
+    global _index
+    refresh = current_app.config.get('SKILL_INDEX_REFRESH_SECONDS', 60)
+    index = _index
+    if index is None or time.monotonic() - index.built_at >= refresh:
+        with _index_lock:
+            if _index is None or time.monotonic() - _index.built_at >= refresh:
+                _index = _load_index()
+            index = _index
+    return index
+
+
+def suggest(prefix, limit=10):
+    """Sugestões de habilidades para o prefixo digitado."""
+    return get_index().suggest(prefix, limit)
+
+
+def clean_names(names):
+    """Valida e limpa os nomes recebidos; lança ``ValueError`` com a mensagem para o usuário."""
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError("Informe 'names' como uma lista de textos.")
+    cleaned = [re.sub(r'\s+', ' ', name).strip() for name in names]
+    cleaned = [name for name in cleaned if name]
+    too_long = [name for name in cleaned if len(name) > MAX_NAME_LENGTH]
+    if too_long:
+        raise ValueError(f"Nomes de habilidades devem ter até {MAX_NAME_LENGTH} caracteres: {', '.join(too_long)}.")
+    return cleaned
+
+
+def _find(by_key):
+    """Ids das habilidades existentes para ``{nome normalizado: nome recebido}`` (uma consulta).
+
+    O índice só traduz o nome normalizado para a grafia cadastrada; a consulta
+    confirma no banco, então um índice desatualizado não devolve ids removidos.
+    """
+    index = get_index()
+    spellings = {index.skills[index.by_normalized[key]][0] for key in by_key if key in index.by_normalized}
+    spellings.update(by_key.values())
+    rows = db.session.execute(select(Skill.id, Skill.name).where(or_(
+        Skill.name.in_(spellings), func.lower(Skill.name).in_({name.lower() for name in by_key.values()})
+    ))).all()
+
+    found = {}
+    for skill_id, name in rows:
+        key = normalize(name)
+        if key in by_key and (key not in found or index.by_normalized.get(key) == skill_id):
+            found[key] = skill_id
+    return found
+
+
+def _insert_ignoring_conflicts(rows):
+    """INSERT das habilidades com ``ON CONFLICT (name) DO NOTHING`` no dialeto do banco."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(Skill.__table__).values(rows).on_conflict_do_nothing(index_elements=['name'])
+
+
+def resolve_skill_ids(names, create=True):
+    """Mapeia nomes de habilidades para ids, criando (sem commit) as que ainda não existem.
+
+    Retorna ``({nome recebido: id}, [nomes criados])``. Nomes que só diferem em
+    maiúsculas, acentos ou espaços resolvem para a mesma habilidade.
+    """
+    by_key = {}
+    for name in names:
+        by_key.setdefault(normalize(name), name)
+    if not by_key:
+        return {}, []
+    found = _find(by_key)
+
+    missing = {key: name for key, name in by_key.items() if key not in found}
+    created = []
+    if missing and create:
+        # Uma criação simultânea do mesmo nome é ignorada em vez de abortar a transação
+        db.session.execute(_insert_ignoring_conflicts([{'name': name} for name in missing.values()]))
+        new = _find(missing)
+        found.update(new)
+        created = [name for key, name in missing.items() if key in new]
+        pending = db.session.info.setdefault('skill_index_pending', [])
+        pending.extend((new[key], name) for key, name in missing.items() if key in new)
+
+    return {name: found[normalize(name)] for name in names if normalize(name) in found}, created
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    # As habilidades criadas entram no índice só depois de gravadas
+    pending = session.info.pop('skill_index_pending', None)
+    if pending and _index is not None:
+        for skill_id, name in pending:
+            _index.add(skill_id, name)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('skill_index_pending', None)
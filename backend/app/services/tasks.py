@@ -0,0 +1,63 @@
+"""Tarefas executadas pelo worker da fila (``run_worker.py``).
+
+Cada tarefa recebe os argumentos gravados no payload do job e retorna um
+resultado serializável em JSON. As tarefas fazem os seus próprios commits.
+"""
+
+from flask import current_app
+
+from app import db
+from app.services import (
+    account_purge, admin_stats, freelancer_load, idempotency, message_archive, project_expiry, project_search, skill_graph
+)
+from app.services.job_queue import task
+
+
+@task('purge_entity')
+def purge_entity(kind, entity_id):
+    """Exclui um cliente, freelancer ou projeto grande em blocos."""
+    return {'removed': account_purge.purge(kind, entity_id)}
+
+
+@task('archive_messages')
+def archive_messages(days=None, limit=None):
+    """Arquiva as mensagens dos projetos concluídos há mais de ``days`` dias."""
+    if days is None:
+        days = current_app.config['MESSAGE_ARCHIVE_AFTER_DAYS']
+    return message_archive.archive_completed_projects(days, limit=limit)
+
+
+@task('refresh_stats')
+def refresh_stats():
+    """Recalcula o snapshot das estatísticas do painel administrativo."""
+    return {'computed_at': admin_stats.refresh_stats()['computed_at']}
+
+
+@task('expire_projects')
+def expire_projects(batch_size=None, max_batches=None):
+    """Expira os projetos abertos cujo prazo passou e rejeita as suas propostas pendentes."""
+    return project_expiry.expire_overdue_projects(batch_size=batch_size, max_batches=max_batches)
+
+
+@task('refresh_search_facets')
+def refresh_search_facets():
+    """Recalcula as facetas da busca de projetos sem filtros."""
+    return {'computed_at': project_search.refresh_facet_snapshot()['computed_at']}
+
+
+@task('refresh_skill_graph')
+def refresh_skill_graph():
+    """Recalcula o grafo de coocorrência de habilidades usado pelas recomendações."""
+    return skill_graph.refresh_graph(db.session)
+
+
+@task('reconcile_active_projects')
+def reconcile_active_projects():
+    """Corrige os contadores de projetos em andamento que divergiram dos projetos."""
+    return {'corrected': freelancer_load.reconcile()}
+
+
+@task('prune_idempotency_keys')
+def prune_idempotency_keys():
+    """Remove as chaves de idempotência vencidas."""
+    return {'removed': idempotency.prune_expired()}
\ No newline at end of file
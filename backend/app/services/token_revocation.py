@@ -0,0 +1,72 @@
+"""Revogação de tokens JWT com verificação em memória.
+
+Cada requisição com ``@jwt_required`` consulta o ``token_in_blocklist_loader``.
+A verificação é uma busca em um dicionário em memória (jti -> expiração), sem
+ida ao banco. A tabela ``revoked_token`` guarda as revogações para que
+sobrevivam a reinícios e sejam vistas pelos outros workers: cada processo
+carrega apenas as linhas novas (por id) no máximo uma vez a cada
+``TOKEN_REVOCATION_SYNC_INTERVAL`` segundos.
+
+O id da tabela é um ``INTEGER PRIMARY KEY`` do SQLite, que reaproveita
+``max(id) + 1``: se a limpeza das expiradas apagasse todas as linhas, a próxima
+revogação voltaria a ter id 1 e os outros processos, com a marca antiga, nunca
+a carregariam. Por isso a linha mais recente nunca é apagada.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func
+
+from app import db
+from app.models.revoked_token import RevokedToken
+
+_lock = threading.Lock()
+_revoked = {}  # jti -> timestamp de expiração
+_last_seen_id = 0
+_next_sync = 0.0
+
+
+def _sync():
+    """Carrega as revogações feitas por outros processos e descarta as expiradas."""
+    global _last_seen_id, _next_sync
+
+    now = datetime.today()
+    rows = db.session.query(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at).filter(
+        RevokedToken.id > _last_seen_id,
+        RevokedToken.expires_at > now
+    ).all()
+
+    timestamp = time.time()
+    with _lock:
+        for row in rows:
+            _revoked[row.jti] = row.expires_at.timestamp()
+            _last_seen_id = max(_last_seen_id, row.id)
+        for jti in [jti for jti, expires in _revoked.items() if expires <= timestamp]:
+            del _revoked[jti]
+        _next_sync = time.monotonic() + current_app.config.get('TOKEN_REVOCATION_SYNC_INTERVAL', 5)
+
+
+def is_token_revoked(jwt_header, jwt_payload):
+    """Callback do ``JWTManager.token_in_blocklist_loader``."""
+    if time.monotonic() >= _next_sync:
+        _sync()
+    return jwt_payload['jti'] in _revoked
+
+
+def revoke_token(jwt_payload):
+    """Revoga o token informado até a sua expiração. Faz commit da sessão."""
+    expires_at = datetime.fromtimestamp(jwt_payload['exp'])
+
+    # Aproveita a escrita para descartar registros que já expiraram, exceto o mais recente (mantém os ids crescentes)
+    newest = db.session.query(func.max(RevokedToken.id)).scalar_subquery()
+    RevokedToken.query.filter(
+        RevokedToken.expires_at <= datetime.today(), RevokedToken.id < newest
+    ).delete(synchronize_session=False)
+    db.session.add(RevokedToken(jti=jwt_payload['jti'], expires_at=expires_at))
+    db.session.commit()
+
+    with _lock:
+        _revoked[jwt_payload['jti']] = expires_at.timestamp()
@@ -0,0 +1,190 @@
+"""Importação em lote de clientes e freelancers a partir de CSV ou NDJSON.
+
+Criar usuários um a um pela API custa uma consulta de unicidade, um hash e um
+commit por usuário. Aqui as linhas são processadas em blocos: a unicidade dos
+emails é verificada com uma única consulta por bloco, os hashes são gerados em
+um pool de processos e as linhas são inseridas com ``insert().values()``. Os
+erros são reportados por linha, sem interromper o restante da importação.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+
+from flask import current_app
+from sqlalchemy import insert, select
+
+from app import db
+from app.models.client import Client
+from app.models.freelancer import Freelancer
+from app.models.skill import freelancer_skills
+from app.services.password_hasher import hash_passwords
+from app.services.skill_index import resolve_skill_ids
+
+# Tipo de usuário -> (model, campos opcionais aceitos)
+IMPORTABLE = {
+    'clients': (Client, ['company', 'phone']),
+    'freelancers': (Freelancer, ['skills', 'portfolio_url', 'phone'])
+}
+
+REQUIRED_FIELDS = ['name', 'email', 'password']
+
+
+def read_rows(stream, fmt):
+    """Lê as linhas de um fluxo de texto em CSV ou NDJSON, uma a uma."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'ndjson':
+        for line in stream:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield {'_error': 'JSON inválido.'}
+    else:
+        raise ValueError("Formato inválido. Use 'csv' ou 'ndjson'.")
+
+
+def open_text_stream(binary_stream):
+    """Envolve um fluxo binário (ex.: ``request.stream``) para leitura como texto UTF-8."""
+    return io.TextIOWrapper(binary_stream, encoding='utf-8', newline='')
+
+
+def _skill_names(value):
+    """Normaliza o campo de habilidades (lista ou texto separado por vírgula/ponto e vírgula)."""
+    if not value:
+        return []
+    names = value if isinstance(value, list) else re.split(r'[;,]', str(value))
+    return [str(name).strip() for name in names if str(name).strip()]
+
+
+def _validate(row, fields, seen_emails):
+    """Valida uma linha; retorna (valores para inserção, mensagem de erro)."""
+    if not isinstance(row, dict):
+        return None, "Linha inválida."
+    if row.get('_error'):
+        return None, row['_error']
+    if not all(row.get(field) for field in REQUIRED_FIELDS):
+        return None, "Nome, email e senha são obrigatórios."
+
+    email = str(row['email']).strip()
+    if email in seen_emails:
+        return None, "Email duplicado no arquivo."
+
+    values = {'name': str(row['name']).strip(), 'email': email}
+    for field in fields:
+        value = row.get(field)
+        if field == 'skills' and isinstance(value, list):
+            value = ', '.join(_skill_names(value))
+        values[field] = value or None
+    return values, None
+
+
+def _insert_chunk(model, rows, skills_by_email):
+    """Insere um bloco de usuários já validados e vincula as habilidades dos freelancers."""
+    db.session.execute(insert(model.__table__).values(rows))
+
+    if skills_by_email:
+        emails = list(skills_by_email)
+        ids_by_email = dict(db.session.execute(select(model.email, model.id).where(model.email.in_(emails))).all())
+        skill_ids, _ = resolve_skill_ids(sorted({name for names in skills_by_email.values() for name in names}))
+        # Grafias diferentes da mesma habilidade (ex.: "Python" e "python") viram um único vínculo
+        links = [
+            {'freelancer_id': ids_by_email[email], 'skill_id': skill_id}
+            for email, names in skills_by_email.items()
+            for skill_id in {skill_ids[name] for name in names}
+        ]
+        if links:
+            db.session.execute(insert(freelancer_skills).values(links))
+
+
+def _import_chunk(kind, chunk, report, executor, workers):
+    """Processa um bloco de linhas numeradas: valida, deduplica, gera hashes e insere."""
+    model, fields = IMPORTABLE[kind]
+
+    valid = []
+    seen_emails = set()
+    for number, row in chunk:
+        values, error = _validate(row, fields, seen_emails)
+        if error:
+            report['errors'].append({'row': number, 'error': error})
+            continue
+        seen_emails.add(values['email'])
+        valid.append((number, values, str(row['password']), _skill_names(row.get('skills')) if kind == 'freelancers' else []))
+
+    if not valid:
+        return
+
+    # Uma única consulta para verificar todos os emails do bloco
+    emails = [values['email'] for _, values, _, _ in valid]
+    taken = set(db.session.execute(select(model.email).where(model.email.in_(emails))).scalars())
+    pending = []
+    for item in valid:
+        if item[1]['email'] in taken:
+            report['errors'].append({'row': item[0], 'error': "Email já está em uso."})
+        else:
+            pending.append(item)
+    if not pending:
+        return
+
+    hashes = hash_passwords([password for _, _, password, _ in pending], executor, workers)
+    for (_, values, _, _), password_hash in zip(pending, hashes):
+        values['password_hash'] = password_hash
+
+    try:
+        _insert_chunk(model, [values for _, values, _, _ in pending],
+                      {values['email']: skills for _, values, _, skills in pending if skills})
+        db.session.commit()
+        report['inserted'] += len(pending)
+        return
+    except Exception:
+        db.session.rollback()
+
+    # Se o bloco falhou (ex.: email inserido por outra requisição), insere linha a linha para isolar o erro
+    for number, values, _, skills in pending:
+        try:
+            _insert_chunk(model, [values], {values['email']: skills} if skills else {})
+            db.session.commit()
+            report['inserted'] += 1
+        except Exception as e:
+            db.session.rollback()
+            report['errors'].append({'row': number, 'error': str(e.__cause__ or e)})
+
+
+def import_users(kind, rows, chunk_size=None, hash_workers=None):
+    """Importa clientes ou freelancers a partir de um iterável de dicionários.
+
+    Retorna um relatório com o total de linhas processadas, o total inserido e
+    a lista de erros por linha (numeradas a partir de 1).
+    """
+    if kind not in IMPORTABLE:
+        raise ValueError(f"Tipo inválido. Use: {', '.join(IMPORTABLE)}.")
+
+    chunk_size = chunk_size or current_app.config.get('USER_IMPORT_CHUNK_SIZE', 1000)
+    if hash_workers is None:
+        hash_workers = current_app.config.get('USER_IMPORT_HASH_WORKERS', os.cpu_count() or 1)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    report = {'processed': 0, 'inserted': 0, 'errors': []}
+    executor = ProcessPoolExecutor(max_workers=hash_workers) if hash_workers > 0 else None
+    try:
+        chunk = []
+        for number, row in enumerate(rows, start=1):
+            chunk.append((number, row))
+            if len(chunk) >= chunk_size:
+                _import_chunk(kind, chunk, report, executor, hash_workers)
+                report['processed'] += len(chunk)
+                chunk = []
+        if chunk:
+            _import_chunk(kind, chunk, report, executor, hash_workers)
+            report['processed'] += len(chunk)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report['errors'].sort(key=lambda error: error['row'])
+    return report
@@ -0,0 +1,44 @@
+"""Controle de concorrência otimista de projetos e propostas.
+
+As transições de status liam o registro, verificavam o status e gravavam, sem
+nenhuma trava: duas requisições simultâneas podiam passar pela mesma
+verificação e uma gravação sobrescrevia a outra. ``Project`` e ``Proposal``
+têm a coluna ``version`` configurada como ``version_id_col``: todo UPDATE do
+ORM leva ``WHERE version = <versão lida>`` e incrementa a versão, e se outra
+transação gravou antes nenhuma linha é alterada e o SQLAlchemy lança
+``StaleDataError`` (respondido com 409). Os UPDATE em lote incrementam a
+versão explicitamente com ``bump``.
+
+As leituras devolvem a versão no corpo e no cabeçalho ``ETag``; um PUT com
+``If-Match`` diferente da versão atual é recusado com 412 antes de qualquer
+escrita.
+"""
+
+from flask import jsonify, request
+from sqlalchemy.orm.exc import StaleDataError
+
+CONFLICT_MESSAGE = "O registro foi alterado por outra requisição. Recarregue e tente novamente."
+
+__all__ = ['CONFLICT_MESSAGE', 'StaleDataError', 'bump', 'conflict', 'etag_header', 'precondition_error']
+
+
+def bump(model):
+    """Valor de ``version`` para os UPDATE em lote (que não passam pelo ``version_id_col``)."""
+    return model.version + 1
+
+
+def etag_header(version):
+    """Cabeçalho ``ETag`` com a versão do registro (vazio para entradas de cache anteriores à coluna)."""
+    return {'ETag': f'"{version}"'} if version is not None else {}
+
+
+def precondition_error(version):
+    """Resposta 412 se o ``If-Match`` da requisição não corresponde à versão; None sem cabeçalho ou se corresponder."""
+    if request.if_match and not request.if_match.contains(str(version)):
+        return jsonify({"error": "A versão informada em If-Match não é a atual.", "version": version}), 412
+    return None
+
+
+def conflict():
+    """Resposta 409 para uma gravação que perdeu a corrida para outra transação."""
+    return jsonify({"error": CONFLICT_MESSAGE}), 409
@@ -0,0 +1,36 @@
+import argparse
+from app import create_app
+from app.services.job_queue import enqueue
+from app.services.message_archive import archive_completed_projects
+
+def archive_messages(days=None, limit=None, queue=False):
+    """Arquiva as mensagens de projetos concluídos há mais de N dias e mostra o espaço liberado."""
+    app = create_app()
+    with app.app_context():
+        if queue:
+            job = enqueue('archive_messages', {'days': days, 'limit': limit})
+            print(f"Arquivamento enfileirado (tarefa {job.id}).")
+            return
+
+        if days is None:
+            days = app.config['MESSAGE_ARCHIVE_AFTER_DAYS']
+
+        report = archive_completed_projects(days, limit=limit)
+
+        print(f"Projetos arquivados: {report['projects']}")
+        print(f"Mensagens movidas: {report['messages']}")
+        print(f"Bytes originais: {report['raw_bytes']}")
+        print(f"Bytes comprimidos: {report['compressed_bytes']}")
+        print(f"Espaço liberado (estimado): {report['bytes_reclaimed']} bytes")
+        for error in report['errors']:
+            print(f"Erro no projeto {error['project_id']}: {error['error']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arquiva mensagens de projetos concluídos.")
+    parser.add_argument('--days', type=int, help="Dias desde a conclusão do projeto (padrão: MESSAGE_ARCHIVE_AFTER_DAYS).")
+    parser.add_argument('--limit', type=int, help="Quantidade máxima de projetos processados nesta execução.")
+    parser.add_argument('--enqueue', action='store_true', help="Enfileira o arquivamento para o worker em vez de executá-lo agora.")
+    args = parser.parse_args()
+    archive_messages(days=args.days, limit=args.limit, queue=args.enqueue)
+
+# python archive_messages.py --days 30
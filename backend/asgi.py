@@ -0,0 +1,5 @@
+from app import create_app
+from app.asgi import create_asgi_app
+
+# Ponto de entrada ASGI (leituras assíncronas; as demais rotas vão para o Flask): uvicorn asgi:app --workers 4
+app = create_asgi_app(create_app())
@@ -0,0 +1,114 @@
+"""Benchmark: tempo de exclusão de um cliente em função do volume de dados.
+
+Compara três estratégias em um banco SQLite temporário:
+
+- orm: carrega projetos, propostas e mensagens na sessão e os exclui um a um
+  (o comportamento antigo, com ``cascade='all, delete'`` sem ``passive_deletes``);
+- cascade: um único DELETE do cliente, com o ON DELETE CASCADE do banco;
+- chunked: a exclusão em blocos usada para contas grandes.
+
+Uso: python benchmarks/bench_delete.py [--sizes 10 100 500] [--children 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(db, projects, children):
+    """Cria um cliente com ``projects`` projetos, cada um com ``children`` propostas e mensagens."""
+    from sqlalchemy import insert
+    from app.models.client import Client
+    from app.models.freelancer import Freelancer
+    from app.models.message import Message
+    from app.models.project import Project
+    from app.models.proposal import Proposal
+
+    now = datetime.today()
+    client_id = db.session.execute(insert(Client).values(name='c', email=f'c{time.time_ns()}@x', password_hash='x', created_at=now, role='client')).inserted_primary_key[0]
+    # Uma proposta por freelancer e projeto (índice único): um freelancer por proposta do projeto
+    stamp = time.time_ns()
+    db.session.execute(insert(Freelancer), [
+        {'name': 'f', 'email': f'f{stamp}-{i}@x', 'password_hash': 'x', 'created_at': now, 'role': 'freelancer'} for i in range(children)
+    ])
+    freelancer_ids = [row.id for row in db.session.query(Freelancer.id).filter(Freelancer.email.like(f'f{stamp}-%'))]
+    freelancer_id = freelancer_ids[0]
+    db.session.execute(insert(Project), [
+        {'title': 't', 'description': 'd', 'status': 'open', 'client_id': client_id, 'created_at': now} for _ in range(projects)
+    ])
+    project_ids = [row.id for row in db.session.query(Project.id).filter_by(client_id=client_id)]
+    db.session.execute(insert(Proposal), [
+        {'project_id': pid, 'freelancer_id': fid, 'bid_amount': 1, 'estimated_days': 1, 'status': 'pending', 'created_at': now}
+        for pid in project_ids for fid in freelancer_ids
+    ])
+    db.session.execute(insert(Message), [
+        {'project_id': pid, 'sender_id': client_id, 'sender_role': 'client', 'receiver_id': freelancer_id,
+         'receiver_role': 'freelancer', 'content': 'x' * 200, 'created_at': now}
+        for pid in project_ids for _ in range(children)
+    ])
+    db.session.commit()
+    return client_id
+
+
+def delete_orm(db, client_id):
+    from app.models.client import Client
+    # Sem as chaves estrangeiras ativas, como antes: a cascata fica toda a cargo do ORM
+    db.session.connection().exec_driver_sql('PRAGMA foreign_keys=OFF')
+    client = db.session.get(Client, client_id)
+    for project in client.projects:
+        for child in project.proposals + project.messages:
+            db.session.delete(child)
+        db.session.delete(project)
+    db.session.delete(client)
+    db.session.commit()
+    db.session.connection().exec_driver_sql('PRAGMA foreign_keys=ON')
+    db.session.commit()
+
+
+def delete_cascade(db, client_id):
+    from app.services.account_purge import delete_now
+    delete_now('client', client_id)
+
+
+def delete_chunked(db, client_id):
+    from app.services.account_purge import purge
+    purge('client', client_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500], help="Quantidades de projetos do cliente.")
+    parser.add_argument('--children', type=int, default=20, help="Propostas e mensagens por projeto.")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    from sqlalchemy.exc import SAWarning
+    from app import create_app, db
+    app = create_app()
+    # O rowcount de executemany do sqlite3 não soma as linhas: o ORM avisa à toa
+    warnings.filterwarnings('ignore', 'DELETE statement on table', SAWarning)
+
+    strategies = [('orm', delete_orm), ('cascade', delete_cascade), ('chunked', delete_chunked)]
+    print(f"{'projetos':>9} {'linhas':>9} " + ' '.join(f'{name:>10}' for name, _ in strategies))
+    with app.app_context():
+        for size in args.sizes:
+            timings = []
+            for _, strategy in strategies:
+                client_id = seed(db, size, args.children)
+                db.session.expunge_all()
+                started = time.perf_counter()
+                strategy(db, client_id)
+                timings.append(time.perf_counter() - started)
+            rows = size * (1 + 2 * args.children) + 1
+            print(f'{size:>9} {rows:>9} ' + ' '.join(f'{seconds:>9.3f}s' for seconds in timings))
+
+
+if __name__ == '__main__':
+    main()
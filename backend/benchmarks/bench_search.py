@@ -0,0 +1,126 @@
+"""Benchmark: busca facetada de projetos (/project/search) em um banco grande.
+
+Popula um banco SQLite temporário com ``--projects`` projetos (abertos na
+maioria, com orçamento, prazo e até três habilidades cada) e mede, para várias
+combinações de filtros, o tempo da primeira página com as facetas calculadas
+(cache de facetas vazio), com as facetas vindas do cache e de uma página
+seguinte pelo cursor.
+
+Uso: python benchmarks/bench_search.py [--projects 1000000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = [
+    ('sem filtros', ''),
+    ('orçamento 1000-5000', 'budget_min=1000&budget_max=5000&sort=budget_desc'),
+    ('prazo em 30 dias', 'deadline_before={in_30_days}&sort=deadline'),
+    ('2 habilidades (any)', 'skills=1,2'),
+    ('2 habilidades (all)', 'skills=1,2&skill_match=all'),
+    ('cliente', 'client_id=7'),
+    ('combinada', 'skills=3&budget_min=500&deadline_after={today}&sort=budget_asc')
+]
+
+
+def seed(app, projects, skills, clients):
+    from sqlalchemy import insert
+    from app import db
+    from app.models.client import Client
+    from app.models.project import Project
+    from app.models.skill import Skill, project_skills
+
+    rng = random.Random(7)
+    today = datetime.today()
+    started = time.perf_counter()
+    with app.app_context():
+        db.session.execute(insert(Client), [
+            {'name': f'c{i}', 'email': f'c{i}@bench', 'password_hash': 'x', 'role': 'client'} for i in range(clients)
+        ])
+        db.session.execute(insert(Skill), [{'name': f'skill{i}'} for i in range(skills)])
+        chunk = 50000
+        for offset in range(0, projects, chunk):
+            count = min(chunk, projects - offset)
+            db.session.execute(insert(Project), [
+                {
+                    'title': f'Projeto {offset + i}', 'description': 'd', 'client_id': rng.randint(1, clients),
+                    'status': 'open' if rng.random() < 0.8 else rng.choice(['in_progress', 'completed', 'expired']),
+                    'budget': rng.choice([None, rng.randint(50, 20000)]) if rng.random() < 0.1 else rng.randint(50, 20000),
+                    'deadline': today + timedelta(days=rng.randint(1, 180)) if rng.random() < 0.7 else None
+                }
+                for i in range(count)
+            ])
+            links = {(offset + i + 1, rng.randint(1, skills)) for i in range(count) for _ in range(rng.randint(0, 3))}
+            db.session.execute(insert(project_skills), [{'project_id': p, 'skill_id': s} for p, s in links])
+            db.session.commit()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+    print(f"{projects} projetos criados em {time.perf_counter() - started:.1f}s")
+
+
+def measure(client, headers, url, repeat):
+    timings = []
+    response = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.json
+    return statistics.median(timings), response.json
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', type=int, default=1000000)
+    parser.add_argument('--skills', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5, help="Execuções por medição (mediana).")
+    args = parser.parse_args()
+
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.services import project_search
+
+    app = create_app()
+    seed(app, args.projects, args.skills, args.clients)
+    with app.app_context():
+        token = create_access_token(identity='1', additional_claims={'role': 'freelancer'})
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+    today = datetime.today()
+    values = {'today': today.date().isoformat(), 'in_30_days': (today + timedelta(days=30)).date().isoformat()}
+
+    print(f"{'busca':<22} {'facetas (frio)':>15} {'facetas (cache)':>16} {'sem facetas':>12} {'página 2':>10} {'total':>9}")
+    for label, query in QUERIES:
+        url = '/project/search?' + query.format(**values)
+        cold = []
+        for _ in range(args.repeat):
+            project_search._facet_cache.clear()
+            started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            cold.append((time.perf_counter() - started) * 1000)
+        cold = statistics.median(cold)
+        total = sum(item['count'] for item in response.json['facets']['budget'])
+
+        warm, first = measure(client, headers, url, args.repeat)
+        bare, _ = measure(client, headers, url + '&facets=0', args.repeat)
+        second = 0.0
+        if first['next_cursor']:
+            second, _ = measure(client, headers, f"{url}&cursor={first['next_cursor']}", args.repeat)
+        print(f"{label:<22} {cold:>13.1f}ms {warm:>14.1f}ms {bare:>10.1f}ms {second:>8.1f}ms {total:>9}")
+
+
+if __name__ == '__main__':
+    main()
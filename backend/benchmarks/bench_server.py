@@ -0,0 +1,164 @@
+"""Benchmark: servidor de desenvolvimento (run.py) x gunicorn (gunicorn.conf.py) x uvicorn (asgi.py).
+
+Sobe cada servidor em uma porta livre com o mesmo banco SQLite temporário,
+dispara requisições autenticadas contra uma rota de leitura a partir de várias
+conexões keep-alive e mostra requisições por segundo, latências e a memória
+(RSS) do servidor e dos seus processos filhos em cada nível de concorrência.
+
+Uso: python benchmarks/bench_server.py [--servers dev gunicorn uvicorn] [--concurrency 8 32 128] [--duration 10]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+HOST = '127.0.0.1'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def seed(projects):
+    """Cria um cliente com projetos abertos e retorna um token de freelancer para a listagem."""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import insert
+    from app import create_app, db
+    from app.models.client import Client
+    from app.models.freelancer import Freelancer
+    from app.models.project import Project
+
+    app = create_app()
+    with app.app_context():
+        client_id = db.session.execute(insert(Client).values(name='c', email='c@bench', password_hash='x', role='client')).inserted_primary_key[0]
+        freelancer_id = db.session.execute(insert(Freelancer).values(name='f', email='f@bench', password_hash='x', role='freelancer')).inserted_primary_key[0]
+        db.session.execute(insert(Project), [
+            {'title': f'Projeto {i}', 'description': 'd' * 200, 'status': 'open', 'client_id': client_id} for i in range(projects)
+        ])
+        db.session.commit()
+        token = create_access_token(identity=str(freelancer_id), additional_claims={'role': 'freelancer'}, expires_delta=False)
+    return token
+
+
+def start_server(kind, port, env):
+    env = dict(env, APP_HOST=HOST, APP_PORT=str(port), FLASK_DEBUG='0', GUNICORN_ACCESS_LOG='')
+    if kind == 'dev':
+        command = [sys.executable, 'run.py']
+    elif kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', HOST, '--port', str(port), '--no-access-log']
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'O servidor {kind} não iniciou.')
+
+
+def rss_mb(pid):
+    """Memória residente do processo e dos seus descendentes, em MB (lida de /proc; apenas Linux)."""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            rss = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+        children = []
+        for task in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{task}/children') as f:
+                children.extend(int(child) for child in f.read().split())
+    except (OSError, StopIteration):
+        return 0.0
+    return rss / 1024 + sum(rss_mb(child) for child in children)
+
+
+def load(port, path, token, concurrency, duration):
+    """Executa requisições por ``duration`` segundos; retorna as latências e o total de erros."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def run():
+        conn = http.client.HTTPConnection(HOST, port, timeout=30)
+        local = []
+        failed = 0
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                if response.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(HOST, port, timeout=30)
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=run) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', nargs='+', choices=['dev', 'gunicorn', 'uvicorn'], default=['dev', 'gunicorn', 'uvicorn'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128], help="Níveis de conexões simultâneas.")
+    parser.add_argument('--duration', type=float, default=10, help="Segundos de carga por servidor.")
+    parser.add_argument('--projects', type=int, default=50, help="Projetos abertos na listagem.")
+    parser.add_argument('--path', default='/project/all', help="Rota medida.")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    env['RATE_LIMIT_ENABLED'] = '0'
+    os.environ.update(env)
+    token = seed(args.projects)
+
+    print(f"{'servidor':>9} {'conexões':>9} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'erros':>7} {'RSS':>9}")
+    for kind in args.servers:
+        port = free_port()
+        process = start_server(kind, port, env)
+        try:
+            for concurrency in args.concurrency:
+                latencies, errors = load(port, args.path, token, concurrency, args.duration)
+                memory = rss_mb(process.pid)
+
+                latencies.sort()
+                quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+                print(f'{kind:>9} {concurrency:>9} {len(latencies) / args.duration:>9.1f} '
+                      f'{quantiles[49] * 1000:>7.1f}ms {quantiles[94] * 1000:>7.1f}ms {quantiles[98] * 1000:>7.1f}ms '
+                      f'{errors:>7} {memory:>7.1f}MB')
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: tempo de importação e de inicialização da aplicação, com orçamento.
+
+Mede, em processos novos (como um worker recém-criado):
+
+- a importação do pacote ``app`` segundo ``python -X importtime``;
+- o tempo de ``create_app()`` com o esquema já aplicado (SCHEMA_STARTUP=check).
+
+Termina com código de saída 1 se algum valor passar do orçamento, para ser
+usado como verificação no CI.
+
+Uso: python benchmarks/bench_startup.py [--import-budget-ms 800] [--startup-budget-ms 300] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SNIPPET = '''
+import time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+print(imported - started, time.perf_counter() - imported)
+'''
+
+
+def _run(args, env):
+    return subprocess.run([sys.executable] + args, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def import_time(env):
+    """Retorna o tempo cumulativo (ms) da importação de ``app`` e os módulos mais lentos."""
+    stderr = _run(['-X', 'importtime', '-c', 'import app'], env).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative) / 1000, name.strip()))
+    total = next(ms for ms, name in modules if name == 'app')
+    return total, sorted(modules, reverse=True)[1:6]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--import-budget-ms', type=float, default=800, help="Orçamento da importação de app (mediana).")
+    parser.add_argument('--startup-budget-ms', type=float, default=300, help="Orçamento de create_app() (mediana).")
+    parser.add_argument('--runs', type=int, default=5, help="Processos medidos.")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    _run(['migrate.py'], env)
+    env['SCHEMA_STARTUP'] = 'check'
+
+    imports = []
+    startups = []
+    slowest = []
+    for _ in range(args.runs):
+        total, slowest = import_time(env)
+        imports.append(total)
+        _, startup = map(float, _run(['-c', STARTUP_SNIPPET], env).stdout.split())
+        startups.append(startup * 1000)
+
+    import_ms = statistics.median(imports)
+    startup_ms = statistics.median(startups)
+    print(f"Importação de app: {import_ms:.1f} ms (orçamento {args.import_budget_ms:.0f} ms)")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+    print(f"create_app(): {startup_ms:.1f} ms (orçamento {args.startup_budget_ms:.0f} ms)")
+
+    if import_ms > args.import_budget_ms or startup_ms > args.startup_budget_ms:
+        print("Orçamento de inicialização excedido.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
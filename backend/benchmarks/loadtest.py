@@ -0,0 +1,385 @@
+"""Teste de carga ponta a ponta com uma carga de trabalho realista do marketplace.
+
+1. Popula um banco SQLite temporário com clientes, freelancers, administradores,
+   habilidades e projetos (ou usa ``--url``/``--database-url`` de um ambiente já
+   em execução);
+2. sobe o servidor escolhido (dev, gunicorn ou uvicorn) e faz o login de todos
+   os usuários sintéticos pelas rotas reais ``/client/login``,
+   ``/freelancer/login`` e ``/admin/login``;
+3. executa, com um cliente HTTP assíncrono, uma mistura ponderada de operações
+   (criar projetos, enviar e aceitar propostas, chat, recomendações, painel);
+4. mostra vazão, percentis de latência e taxas de erro por rota.
+
+Com ``--save-baseline`` o resultado é gravado em JSON; com ``--baseline`` ele é
+comparado ao arquivo e o script termina com código 1 se alguma rota regrediu
+além da tolerância.
+
+Requer o pacote ``httpx``. O limite de taxa é desativado no servidor iniciado
+pelo script; em um ambiente externo desative-o (RATE_LIMIT_ENABLED=0).
+
+Uso: python benchmarks/loadtest.py --server gunicorn --duration 30 --concurrency 32
+     python benchmarks/loadtest.py --mix propose=6,accept=1,chat=3 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_server import HOST, free_port, start_server  # noqa: E402
+
+PASSWORD = 'carga-123'
+
+# Operação -> peso padrão na mistura
+DEFAULT_MIX = {
+    'list_projects': 6,
+    'view_project': 4,
+    'create_project': 1,
+    'propose': 3,
+    'accept': 1,
+    'chat': 3,
+    'recommend': 2,
+    'admin_stats': 1
+}
+
+
+def parse_mix(value):
+    """Converte 'op=peso,op=peso' em um dicionário; operações omitidas ficam com peso 0."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Operação inválida: {name}. Use: {', '.join(DEFAULT_MIX)}.")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def seed(clients, freelancers, admins, projects, skills):
+    """Cria os usuários sintéticos (todos com a mesma senha) e os projetos iniciais."""
+    from sqlalchemy import insert, select
+    from werkzeug.security import generate_password_hash
+    from app import create_app, db
+    from app.models.admin import Admin
+    from app.models.client import Client
+    from app.models.freelancer import Freelancer
+    from app.models.project import Project
+    from app.models.skill import Skill, freelancer_skills, project_skills
+    from app.services.password_hasher import password_hash_method
+
+    app = create_app()
+    rng = random.Random(42)
+    with app.app_context():
+        # Um único hash para todos: o custo do scrypt fica nos logins, não na preparação
+        password_hash = generate_password_hash(PASSWORD, password_hash_method())
+        users = {'client': [], 'freelancer': [], 'admin': []}
+        for kind, model, count in [('client', Client, clients), ('freelancer', Freelancer, freelancers), ('admin', Admin, admins)]:
+            emails = [f'{kind}{i}@carga.local' for i in range(count)]
+            if emails:
+                db.session.execute(insert(model), [
+                    {'name': f'{kind} {i}', 'email': email, 'password_hash': password_hash, 'role': kind}
+                    for i, email in enumerate(emails)
+                ])
+            ids = dict(db.session.execute(select(model.email, model.id).where(model.email.in_(emails))).all())
+            users[kind] = [(email, ids[email]) for email in emails]
+
+        db.session.execute(insert(Skill), [{'name': f'skill-carga-{i}'} for i in range(skills)])
+        skill_ids = list(db.session.execute(select(Skill.id).where(Skill.name.like('skill-carga-%'))).scalars())
+        links = {(freelancer_id, rng.choice(skill_ids)) for _, freelancer_id in users['freelancer'] for _ in range(3)}
+        db.session.execute(insert(freelancer_skills), [{'freelancer_id': f, 'skill_id': s} for f, s in links])
+
+        project_rows = [
+            {'title': f'Projeto {i}', 'description': 'Carga ' * 20, 'budget': rng.randint(100, 5000),
+             'status': 'open', 'client_id': rng.choice(users['client'])[1]}
+            for i in range(projects)
+        ]
+        initial = []
+        if project_rows:
+            db.session.execute(insert(Project), project_rows)
+            initial = db.session.execute(select(Project.id, Project.client_id).where(Project.title.like('Projeto %'))).all()
+            links = {(project_id, rng.choice(skill_ids)) for project_id, _ in initial for _ in range(2)}
+            db.session.execute(insert(project_skills), [{'project_id': p, 'skill_id': s} for p, s in links])
+        db.session.commit()
+    return users, [(project_id, client_id) for project_id, client_id in initial]
+
+
+class Workload:
+    """Estado compartilhado da simulação e as operações sorteadas pelos workers virtuais."""
+
+    def __init__(self, client, tokens, projects, rng):
+        self.client = client
+        self.tokens = tokens  # papel -> [(id, token)]
+        self.open_projects = {project_id: client_id for project_id, client_id in projects}
+        self.pending = []  # (proposal_id, project_id)
+        self.active = {}  # projeto em andamento -> (client_id, freelancer_id)
+        self.rng = rng
+        self.stats = defaultdict(lambda: {'latencies': [], 'errors': 0, 'rejected': 0})
+        self.token_by_id = {(role, user_id): token for role, users in tokens.items() for user_id, token in users}
+
+    async def request(self, route, method, path, token, body=None):
+        """Executa a requisição e registra latência e resultado sob o nome da rota."""
+        started = time.perf_counter()
+        stats = self.stats[route]
+        try:
+            response = await self.client.request(method, path, json=body, headers={'Authorization': f'Bearer {token}'})
+        except Exception:
+            stats['latencies'].append(time.perf_counter() - started)
+            stats['errors'] += 1
+            return None
+        stats['latencies'].append(time.perf_counter() - started)
+        if response.status_code >= 500:
+            stats['errors'] += 1
+        elif response.status_code >= 400:
+            stats['rejected'] += 1  # Conflitos esperados sob concorrência (409, 400 de projeto fechado...)
+        return response
+
+    def _user(self, role):
+        return self.rng.choice(self.tokens[role])
+
+    async def list_projects(self):
+        _, token = self._user('freelancer')
+        await self.request('GET /project/all', 'GET', '/project/all', token)
+
+    async def view_project(self):
+        if not self.open_projects:
+            return await self.list_projects()
+        _, token = self._user('freelancer')
+        project_id = self.rng.choice(list(self.open_projects))
+        await self.request('GET /project/<id>', 'GET', f'/project/{project_id}', token)
+
+    async def create_project(self):
+        client_id, token = self._user('client')
+        response = await self.request('POST /project/create', 'POST', '/project/create', token, {
+            'title': 'Projeto de carga', 'description': 'Descrição ' * 10, 'budget': self.rng.randint(100, 5000)
+        })
+        if response is not None and response.status_code == 201:
+            self.open_projects[response.json()['project']['id']] = client_id
+
+    async def propose(self):
+        if not self.open_projects:
+            return await self.create_project()
+        _, token = self._user('freelancer')
+        project_id = self.rng.choice(list(self.open_projects))
+        response = await self.request('POST /proposal/create', 'POST', '/proposal/create', token, {
+            'project_id': project_id, 'bid_amount': self.rng.randint(50, 5000), 'estimated_days': self.rng.randint(1, 60)
+        })
+        if response is not None and response.status_code == 201:
+            self.pending.append((response.json()['proposal']['id'], project_id))
+
+    async def accept(self):
+        candidates = [(proposal_id, project_id) for proposal_id, project_id in self.pending if project_id in self.open_projects]
+        if not candidates:
+            return await self.propose()
+        proposal_id, project_id = self.rng.choice(candidates)
+        client_id = self.open_projects[project_id]
+        response = await self.request('PUT /proposal/<id>', 'PUT', f'/proposal/{proposal_id}',
+                                      self.token_by_id[('client', client_id)], {'status': 'accepted'})
+        if response is not None and response.status_code == 200:
+            freelancer_id = response.json()['proposal']['freelancer_id']
+            self.open_projects.pop(project_id, None)
+            self.active[project_id] = (client_id, freelancer_id)
+            self.pending = [item for item in self.pending if item[1] != project_id]
+
+    async def chat(self):
+        if not self.active:
+            return await self.accept()
+        project_id = self.rng.choice(list(self.active))
+        client_id, freelancer_id = self.active[project_id]
+        if self.rng.random() < 0.5:
+            sender, receiver = ('client', client_id), ('freelancer', freelancer_id)
+        else:
+            sender, receiver = ('freelancer', freelancer_id), ('client', client_id)
+        token = self.token_by_id[sender]
+        await self.request('POST /message/', 'POST', '/message/', token, {
+            'project_id': project_id, 'receiver_id': receiver[1], 'receiver_role': receiver[0], 'content': 'Mensagem de carga'
+        })
+        await self.request('GET /message/project/<id>', 'GET', f'/message/project/{project_id}', token)
+
+    async def recommend(self):
+        projects = list(self.open_projects.items()) + [(p, owners[0]) for p, owners in self.active.items()]
+        if not projects:
+            return await self.create_project()
+        project_id, client_id = self.rng.choice(projects)
+        await self.request('GET /recommendation/project/<id>', 'GET', f'/recommendation/project/{project_id}',
+                           self.token_by_id[('client', client_id)])
+
+    async def admin_stats(self):
+        if not self.tokens['admin']:
+            return await self.list_projects()
+        _, token = self._user('admin')
+        await self.request('GET /admin/stats', 'GET', '/admin/stats', token)
+
+
+async def login_all(client, users, concurrency):
+    """Faz o login de todos os usuários pelas rotas reais; retorna papel -> [(id, token)]."""
+    semaphore = asyncio.Semaphore(concurrency)
+    tokens = {role: [] for role in users}
+    failures = 0
+
+    async def login(role, email, user_id):
+        nonlocal failures
+        async with semaphore:
+            response = await client.post(f'/{role}/login', json={'email': email, 'password': PASSWORD})
+        if response.status_code == 200:
+            tokens[role].append((user_id, response.json()['access_token']))
+        else:
+            failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(role, email, user_id) for role, items in users.items() for email, user_id in items))
+    print(f"Logins: {sum(len(items) for items in tokens.values())} em {time.perf_counter() - started:.1f}s ({failures} falhas)")
+    return tokens
+
+
+async def run_load(url, users, projects, mix, concurrency, duration, seed_value):
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        tokens = await login_all(client, users, concurrency)
+        if not tokens['client'] or not tokens['freelancer']:
+            raise RuntimeError("Nenhum cliente ou freelancer conseguiu fazer login.")
+
+        workload = Workload(client, tokens, projects, random.Random(seed_value))
+        operations = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in operations]
+        stop_at = time.monotonic() + duration
+
+        async def virtual_user(index):
+            rng = random.Random(seed_value + index)
+            while time.monotonic() < stop_at:
+                await getattr(workload, rng.choices(operations, weights)[0])()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(index) for index in range(concurrency)))
+        return workload.stats, time.perf_counter() - started
+
+
+def summarize(stats, elapsed):
+    """Calcula vazão, percentis e taxas de erro de cada rota."""
+    report = {}
+    for route, data in sorted(stats.items()):
+        latencies = sorted(data['latencies'])
+        count = len(latencies)
+        quantiles = statistics.quantiles(latencies, n=100) if count > 1 else latencies * 99
+        report[route] = {
+            'requests': count,
+            'rps': round(count / elapsed, 2),
+            'p50_ms': round(quantiles[49] * 1000, 2),
+            'p95_ms': round(quantiles[94] * 1000, 2),
+            'p99_ms': round(quantiles[98] * 1000, 2),
+            'error_rate': round(data['errors'] / count, 4) if count else 0,
+            'rejected_rate': round(data['rejected'] / count, 4) if count else 0
+        }
+    total = sum(item['requests'] for item in report.values())
+    report['TOTAL'] = {
+        'requests': total,
+        'rps': round(total / elapsed, 2),
+        'error_rate': round(sum(data['errors'] for data in stats.values()) / total, 4) if total else 0
+    }
+    return report
+
+
+def print_report(report):
+    print(f"{'rota':<34} {'req':>7} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'erros':>7} {'4xx':>7}")
+    for route, item in report.items():
+        if route == 'TOTAL':
+            continue
+        print(f"{route:<34} {item['requests']:>7} {item['rps']:>8.1f} {item['p50_ms']:>7.1f}ms {item['p95_ms']:>7.1f}ms "
+              f"{item['p99_ms']:>7.1f}ms {item['error_rate']:>7.2%} {item['rejected_rate']:>7.2%}")
+    total = report['TOTAL']
+    print(f"{'TOTAL':<34} {total['requests']:>7} {total['rps']:>8.1f} {'':>29} {total['error_rate']:>7.2%}")
+
+
+def compare(report, baseline, tolerance):
+    """Lista as rotas que regrediram em relação ao baseline (vazão, p95 ou erros)."""
+    regressions = []
+    for route, previous in baseline.items():
+        current = report.get(route)
+        if current is None or route == 'TOTAL':
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms")
+        if current['rps'] < previous['rps'] * (1 - tolerance):
+            regressions.append(f"{route}: vazão {previous['rps']:.1f} -> {current['rps']:.1f} req/s")
+        if current['error_rate'] > previous['error_rate'] + 0.01:
+            regressions.append(f"{route}: erros {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=['dev', 'gunicorn', 'uvicorn'], default='gunicorn', help="Servidor iniciado pelo script.")
+    parser.add_argument('--url', help="Usa um servidor já em execução em vez de iniciar um (exige --database-url).")
+    parser.add_argument('--database-url', help="Banco do servidor em --url, onde os usuários sintéticos são criados.")
+    parser.add_argument('--duration', type=float, default=30, help="Segundos de carga.")
+    parser.add_argument('--concurrency', type=int, default=32, help="Usuários virtuais simultâneos.")
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--freelancers', type=int, default=200)
+    parser.add_argument('--admins', type=int, default=2)
+    parser.add_argument('--projects', type=int, default=200, help="Projetos abertos criados na preparação.")
+    parser.add_argument('--skills', type=int, default=30)
+    parser.add_argument('--mix', type=parse_mix, help=f"Pesos das operações, ex.: propose=6,chat=3 (padrão: {DEFAULT_MIX}).")
+    parser.add_argument('--seed', type=int, default=1, help="Semente do sorteio das operações.")
+    parser.add_argument('--baseline', help="Arquivo JSON de referência para detectar regressões.")
+    parser.add_argument('--save-baseline', help="Grava o resultado como novo arquivo de referência.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Variação aceita em relação ao baseline (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        sys.exit("O teste de carga requer o pacote httpx (pip install httpx).")
+    if args.url and not args.database_url:
+        parser.error("--url exige --database-url para criar os usuários sintéticos.")
+
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'loadtest')
+    env['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'loadtest.db')}"
+    env['RATE_LIMIT_ENABLED'] = '0'
+    os.environ.update(env)
+
+    users, projects = seed(args.clients, args.freelancers, args.admins, args.projects, args.skills)
+    mix = args.mix or DEFAULT_MIX
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        process = start_server(args.server, port, env)
+        url = f'http://{HOST}:{port}'
+    try:
+        stats, elapsed = asyncio.run(run_load(url, users, projects, mix, args.concurrency, args.duration, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = summarize(stats, elapsed)
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline gravado em {args.save_baseline}.")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressões em relação ao baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Sem regressões em relação ao baseline.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""Teste de estresse do controle de concorrência otimista (coluna ``version``).
+
+Sobe o servidor escolhido com um banco SQLite temporário e dispara, em
+paralelo, as duas corridas que perdiam gravações:
+
+1. aceitação: todas as propostas de cada projeto são aceitas ao mesmo tempo
+   pelo cliente; ao final cada projeto deve ter exatamente uma proposta
+   aceita, o freelancer do projeto deve ser o dela, as demais devem estar
+   rejeitadas e ``active_projects`` de cada freelancer deve bater com os seus
+   projetos em andamento;
+2. leitura-modificação-escrita: vários escritores leem o projeto (``ETag``),
+   acrescentam uma marca própria à descrição e gravam com ``If-Match``,
+   repetindo em 409/412. Ao final a descrição deve conter a marca de todos os
+   escritores e ``version`` deve ser 1 + gravações bem-sucedidas. A mesma
+   corrida sem ``If-Match`` é executada para comparação e mostra quantas
+   atualizações se perdem sem a pré-condição.
+
+Termina com código 1 se alguma invariante for violada. Requer o pacote ``httpx``.
+
+Uso: python benchmarks/stress_concurrency.py [--server gunicorn] [--projects 20] [--proposals 8] [--writers 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_server import HOST, free_port, start_server  # noqa: E402
+
+
+def seed(projects, proposals, edited):
+    """Cria um cliente, os freelancers, os projetos e as propostas; retorna o app, o token do cliente e os ids dos projetos."""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import insert
+    from app import create_app, db
+    from app.models.client import Client
+    from app.models.freelancer import Freelancer
+    from app.models.project import Project
+    from app.models.proposal import Proposal
+
+    app = create_app()
+    with app.app_context():
+        client_id = db.session.execute(
+            insert(Client).values(name='c', email='c@stress', password_hash='x', role='client')
+        ).inserted_primary_key[0]
+        freelancer_ids = [
+            db.session.execute(
+                insert(Freelancer).values(name=f'f{i}', email=f'f{i}@stress', password_hash='x', role='freelancer')
+            ).inserted_primary_key[0]
+            for i in range(proposals)
+        ]
+        contested, edited_ids = [], []
+        for i in range(projects + edited):
+            project_id = db.session.execute(
+                insert(Project).values(title=f'Projeto {i}', description='d', status='open', client_id=client_id)
+            ).inserted_primary_key[0]
+            (contested if i < projects else edited_ids).append(project_id)
+        db.session.execute(insert(Proposal), [
+            {'project_id': project_id, 'freelancer_id': freelancer_id, 'bid_amount': 100, 'estimated_days': 5}
+            for project_id in contested for freelancer_id in freelancer_ids
+        ])
+        db.session.commit()
+        token = create_access_token(identity=str(client_id), additional_claims={'role': 'client'}, expires_delta=False)
+    return app, token, contested, edited_ids
+
+
+async def accept_race(http, contested, proposal_ids):
+    """Aceita todas as propostas de todos os projetos ao mesmo tempo; retorna a contagem de status."""
+    responses = await asyncio.gather(*(
+        http.put(f'/proposal/{proposal_id}', json={'status': 'accepted'})
+        for project_id in contested for proposal_id in proposal_ids[project_id]
+    ))
+    return Counter(response.status_code for response in responses)
+
+
+async def write_race(http, project_id, writers, conditional, max_retries):
+    """Escritores concorrentes acrescentam a sua marca à descrição; retorna a contagem de gravações, repetições e desistências."""
+    stats = Counter()
+
+    async def writer(index):
+        for _ in range(max_retries + 1):
+            current = await http.get(f'/project/{project_id}')
+            headers = {'If-Match': current.headers['ETag']} if conditional else {}
+            description = current.json()['description'] + f' [w{index}]'
+            response = await http.put(f'/project/{project_id}', json={'description': description}, headers=headers)
+            if response.status_code == 200:
+                stats['written'] += 1
+                return
+            if response.status_code not in (409, 412):
+                raise RuntimeError(f'PUT /project/{project_id} respondeu {response.status_code}: {response.text}')
+            stats['retries'] += 1
+        stats['gave_up'] += 1
+
+    await asyncio.gather(*(writer(index) for index in range(writers)))
+    return stats
+
+
+def check_accepts(app, contested):
+    """Retorna as violações das invariantes de aceitação."""
+    from sqlalchemy import func, select
+    from app import db
+    from app.models.freelancer import Freelancer
+    from app.models.project import Project
+    from app.models.proposal import Proposal
+
+    violations = []
+    with app.app_context():
+        for project_id in contested:
+            project = db.session.get(Project, project_id)
+            accepted = db.session.execute(
+                select(Proposal).where(Proposal.project_id == project_id, Proposal.status == 'accepted')
+            ).scalars().all()
+            pending = db.session.scalar(
+                select(func.count()).where(Proposal.project_id == project_id, Proposal.status == 'pending')
+            )
+            if len(accepted) != 1:
+                violations.append(f'projeto {project_id}: {len(accepted)} propostas aceitas')
+            elif project.freelancer_id != accepted[0].freelancer_id or project.status != 'in_progress':
+                violations.append(f'projeto {project_id}: freelancer {project.freelancer_id} / status {project.status} '
+                                  f'não correspondem à proposta aceita {accepted[0].id}')
+            if pending:
+                violations.append(f'projeto {project_id}: {pending} propostas ainda pendentes')
+
+        active = dict(db.session.execute(
+            select(Project.freelancer_id, func.count()).where(Project.status == 'in_progress').group_by(Project.freelancer_id)
+        ).all())
+        for freelancer in db.session.execute(select(Freelancer)).scalars():
+            if freelancer.active_projects != active.get(freelancer.id, 0):
+                violations.append(f'freelancer {freelancer.id}: active_projects={freelancer.active_projects}, '
+                                  f'em andamento={active.get(freelancer.id, 0)}')
+    return violations
+
+
+def check_writes(app, project_id, writers, stats):
+    """Retorna (marcas perdidas, violações) do projeto editado."""
+    from app import db
+    from app.models.project import Project
+
+    with app.app_context():
+        project = db.session.get(Project, project_id)
+        lost = [index for index in range(writers) if f' [w{index}]' not in project.description]
+        violations = []
+        if project.version != 1 + stats['written']:
+            violations.append(f'projeto {project_id}: version={project.version}, esperado {1 + stats["written"]}')
+    return lost, violations
+
+
+async def run(port, token, app, args, contested, edited):
+    import httpx
+    from sqlalchemy import select
+    from app import db
+    from app.models.proposal import Proposal
+
+    with app.app_context():
+        proposal_ids = {project_id: [] for project_id in contested}
+        for proposal_id, project_id in db.session.execute(
+            select(Proposal.id, Proposal.project_id).where(Proposal.project_id.in_(contested))
+        ).all():
+            proposal_ids[project_id].append(proposal_id)
+
+    limits = httpx.Limits(max_connections=args.connections)
+    async with httpx.AsyncClient(base_url=f'http://{HOST}:{port}', headers={'Authorization': f'Bearer {token}'},
+                                 limits=limits, timeout=60) as http:
+        started = time.perf_counter()
+        statuses = await accept_race(http, contested, proposal_ids)
+        print(f'aceitação: {sum(statuses.values())} requisições em {time.perf_counter() - started:.2f}s, '
+              f'status {dict(sorted(statuses.items()))}')
+        violations = check_accepts(app, contested)
+
+        half = len(edited) // 2
+        for label, conditional, projects in (('com If-Match', True, edited[:half]), ('sem If-Match', False, edited[half:])):
+            totals, lost_total = Counter(), 0
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                write_race(http, project_id, args.writers, conditional, args.max_retries) for project_id in projects
+            ))
+            for project_id, stats in zip(projects, results):
+                totals.update(stats)
+                lost, failed = check_writes(app, project_id, args.writers, stats)
+                lost_total += max(len(lost) - stats['gave_up'], 0)  # Quem desistiu não gravou
+                if conditional:
+                    violations.extend(failed)
+                    if len(lost) != stats['gave_up']:
+                        violations.append(f'projeto {project_id}: marcas perdidas {lost} com {stats["gave_up"]} desistências')
+            print(f'escrita {label}: {totals["written"]} gravações, {totals["retries"]} repetições, '
+                  f'{totals["gave_up"]} desistências, {lost_total} atualizações perdidas '
+                  f'({time.perf_counter() - started:.2f}s)')
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=['dev', 'gunicorn', 'uvicorn'], default='gunicorn')
+    parser.add_argument('--projects', type=int, default=20, help="Projetos disputados na corrida de aceitação.")
+    parser.add_argument('--proposals', type=int, default=8, help="Propostas (freelancers) por projeto disputado.")
+    parser.add_argument('--edited', type=int, default=10, help="Projetos editados (metade com If-Match, metade sem).")
+    parser.add_argument('--writers', type=int, default=8, help="Escritores concorrentes por projeto editado.")
+    parser.add_argument('--max-retries', type=int, default=50, help="Repetições de cada escritor após 409/412.")
+    parser.add_argument('--connections', type=int, default=64, help="Conexões HTTP simultâneas.")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'stress.db')}"
+    # Invalidações do cache visíveis para todos os workers
+    env['ENTITY_CACHE_STORAGE'] = f"sqlite:///{os.path.join(directory, 'entity_cache.db')}"
+    env['RATE_LIMIT_ENABLED'] = '0'
+    os.environ.update(env)
+    app, token, contested, edited = seed(args.projects, args.proposals, args.edited)
+
+    port = free_port()
+    process = start_server(args.server, port, env)
+    try:
+        violations = asyncio.run(run(port, token, app, args, contested, edited))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    if violations:
+        print(f'{len(violations)} violações:')
+        for violation in violations:
+            print(f'  {violation}')
+        sys.exit(1)
+    print('Nenhuma atualização perdida.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import json
+import os
+from app import create_app
+from app.services.exporter import EXPORTABLE, FORMATS, export_watermark, stream_export
+
+def export_table(name, fmt, output, state_file=None):
+    """Exporta uma tabela para um arquivo; com --state-file exporta apenas as linhas novas."""
+    state = {}
+    if state_file and os.path.exists(state_file):
+        with open(state_file, encoding='utf-8') as f:
+            state = json.load(f)
+    after_id = state.get(name)
+
+    app = create_app()
+    with app.app_context():
+        watermark = export_watermark(name, after_id=after_id)
+        mode = 'w' if fmt in ['csv', 'ndjson'] else 'wb'
+        with open(output, mode, encoding='utf-8' if mode == 'w' else None, newline='' if mode == 'w' else None) as f:
+            for data in stream_export(name, fmt, after_id=after_id, until_id=watermark):
+                f.write(data)
+
+    print(f"Tabela {name} exportada para {output}.")
+    if state_file and watermark is not None:
+        state[name] = watermark
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        print(f"Marca d'água salva: id {watermark}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta dados do marketplace para análise.")
+    parser.add_argument('name', choices=list(EXPORTABLE), help="Tabela exportada.")
+    parser.add_argument('output', help="Arquivo de saída.")
+    parser.add_argument('--format', choices=list(FORMATS), default='ndjson', help="Formato do arquivo (padrão: ndjson).")
+    parser.add_argument('--state-file', help="Arquivo JSON com a marca d'água de cada tabela, para exportações incrementais.")
+    args = parser.parse_args()
+    export_table(args.name, args.format, args.output, state_file=args.state_file)
+
+# python export_data.py proposals proposals.ndjson --state-file export_state.json
@@ -0,0 +1,69 @@
+"""Configuração do gunicorn para produção.
+
+Uso: gunicorn -c gunicorn.conf.py wsgi:app
+
+A aplicação é carregada uma vez no processo mestre (``preload_app``): o esquema
+é verificado uma única vez e os workers nascem prontos via fork. Cada worker
+atende várias requisições em threads (``gthread``), o que cobre o tempo de
+espera do banco sem multiplicar processos. Todos os valores podem ser
+alterados por variáveis de ambiente.
+
+Reinícios sem queda: ``kill -HUP`` recria os workers com a mesma versão do
+código; para carregar código novo com ``preload_app`` use ``kill -USR2`` (novo
+mestre) seguido de ``kill -TERM`` no mestre antigo.
+"""
+
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+cpus = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', f"{os.getenv('APP_HOST', '0.0.0.0')}:{os.getenv('APP_PORT', '8081')}")
+
+# Um processo por núcleo; as threads cobrem a espera por I/O dentro de cada worker
+workers = int(os.getenv('WEB_CONCURRENCY', str(cpus)))
+worker_class = 'gthread'
+
+# O cache de entidades em memória é por processo: as invalidações de um worker não chegariam aos outros
+if workers > 1 and os.getenv('ENTITY_CACHE_STORAGE') == 'memory' and os.getenv('ENTITY_CACHE_ENABLED', '1') == '1':
+    raise RuntimeError("ENTITY_CACHE_STORAGE=memory exige um único worker (WEB_CONCURRENCY=1); use o cache compartilhado padrão.")
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+# Os workers dividem os núcleos com o pool de hashing de senhas de cada um
+os.environ.setdefault('PASSWORD_HASH_WORKERS', str(max(1, cpus // workers)))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))  # Worker travado por mais que isso é reiniciado
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))  # Prazo para concluir as requisições ao reiniciar
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))  # Segundos mantendo conexões ociosas abertas
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))  # Recicla workers aos poucos (vazamentos de memória)
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None  # Vazio desativa o log de acesso
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def _dispose_engine(close):
+    """Descarta o pool de conexões do SQLAlchemy da aplicação carregada pelo mestre."""
+    from app import db
+    from wsgi import app
+
+    with app.app_context():
+        db.engine.dispose(close=close)
+
+
+def when_ready(server):
+    """Fecha no mestre as conexões abertas durante o carregamento da aplicação."""
+    if preload_app:
+        _dispose_engine(close=True)
+
+
+def post_fork(server, worker):
+    """Cada worker abre as suas próprias conexões em vez de reutilizar as herdadas do mestre."""
+    if preload_app:
+        _dispose_engine(close=False)
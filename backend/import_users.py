@@ -0,0 +1,30 @@
+import argparse
+from app import create_app
+from app.services.user_import import IMPORTABLE, import_users, read_rows
+
+def import_file(kind, path, fmt=None, chunk_size=None, workers=None):
+    """Importa clientes ou freelancers de um arquivo CSV ou NDJSON e mostra o relatório."""
+    fmt = fmt or ('csv' if path.endswith('.csv') else 'ndjson')
+
+    app = create_app()
+    with app.app_context():
+        with open(path, encoding='utf-8', newline='') as stream:
+            report = import_users(kind, read_rows(stream, fmt), chunk_size=chunk_size, hash_workers=workers)
+
+        print(f"Linhas processadas: {report['processed']}")
+        print(f"Usuários inseridos: {report['inserted']}")
+        print(f"Erros: {len(report['errors'])}")
+        for error in report['errors']:
+            print(f"Linha {error['row']}: {error['error']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa clientes ou freelancers em lote.")
+    parser.add_argument('kind', choices=list(IMPORTABLE), help="Tipo de usuário importado.")
+    parser.add_argument('file', help="Arquivo CSV ou NDJSON.")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help="Formato do arquivo (padrão: pela extensão).")
+    parser.add_argument('--chunk-size', type=int, help="Linhas por bloco (padrão: USER_IMPORT_CHUNK_SIZE).")
+    parser.add_argument('--workers', type=int, help="Processos para gerar os hashes (padrão: USER_IMPORT_HASH_WORKERS).")
+    args = parser.parse_args()
+    import_file(args.kind, args.file, fmt=args.format, chunk_size=args.chunk_size, workers=args.workers)
+
+# python import_users.py freelancers agencia.csv
@@ -0,0 +1,44 @@
+import argparse
+import sys
+from app import create_app
+from app.schema import DuplicateRows, remove_duplicates, schema_fingerprint, stored_version, upgrade_schema
+
+def migrate(check=False, dedupe=False):
+    """Aplica o esquema das models ao banco (tabelas, colunas e índices novos).
+
+    Com ``dedupe`` remove antes as linhas duplicadas que impedem os índices
+    únicos novos, listando cada linha removida.
+    """
+    app = create_app(schema_startup='skip')
+    with app.app_context():
+        current = stored_version()
+        target = schema_fingerprint()
+        if current == target:
+            print(f"Esquema já está atualizado (versão {target}).")
+            return True
+        if check:
+            print(f"Esquema desatualizado: banco {current or 'sem versão'}, models {target}.")
+            return False
+
+        if dedupe:
+            for index_name, rows in remove_duplicates().items():
+                print(f"{index_name}: {len(rows)} linhas duplicadas removidas.")
+                for row in rows:
+                    print('  ' + ', '.join(f'{key}={value}' for key, value in row.items()))
+        try:
+            upgrade_schema()
+        except DuplicateRows as e:
+            print(e)
+            return False
+        print(f"Esquema atualizado: {current or 'sem versão'} -> {target}.")
+        return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aplica o esquema do banco antes de iniciar a aplicação.")
+    parser.add_argument('--check', action='store_true', help="Apenas verifica se o esquema está atualizado (código de saída 1 se não).")
+    parser.add_argument('--remove-duplicates', action='store_true', help="Remove as linhas duplicadas que impedem a criação de índices únicos novos (lista as removidas).")
+    args = parser.parse_args()
+    if not migrate(check=args.check, dedupe=args.remove_duplicates):
+        sys.exit(1)
+
+# python migrate.py  (executar a cada deploy, antes de iniciar os workers com SCHEMA_STARTUP=check)
@@ -0,0 +1,24 @@
+import argparse
+from app import create_app
+from app.services.admin_stats import refresh_stats
+from app.services.job_queue import enqueue
+
+def refresh(queue=False):
+    """Recalcula as estatísticas do painel administrativo."""
+    app = create_app()
+    with app.app_context():
+        if queue:
+            job = enqueue('refresh_stats')
+            print(f"Recálculo enfileirado (tarefa {job.id}).")
+            return
+
+        stats = refresh_stats()
+        print(f"Estatísticas atualizadas em {stats['computed_at']}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recalcula as estatísticas do painel administrativo.")
+    parser.add_argument('--enqueue', action='store_true', help="Enfileira o recálculo para o worker em vez de executá-lo agora.")
+    args = parser.parse_args()
+    refresh(queue=args.enqueue)
+
+# python refresh_stats.py  (agendar, por exemplo, a cada 5 minutos)
@@ -1,11 +1,7 @@
 from app import create_app
-from dotenv import load_dotenv
 import os
 
-# Carrega variáveis de ambiente do arquivo .env
-load_dotenv()
-
-# Cria a instância da aplicação Flask
+# Cria a instância da aplicação Flask (as variáveis do .env são carregadas por app.config)
 app = create_app()
 
 if __name__ == "__main__":
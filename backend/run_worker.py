@@ -0,0 +1,24 @@
+import argparse
+import logging
+from app import create_app
+from app.services.job_queue import run_worker
+
+def start_worker(concurrency=None, mode=None, once=False):
+    """Executa as tarefas da fila (exclusões grandes, arquivamento, estatísticas)."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    app = create_app()
+    executed = run_worker(app, concurrency=concurrency, mode=mode, once=once)
+    print(f"Tarefas executadas: {executed}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker da fila de tarefas em segundo plano.")
+    parser.add_argument('--concurrency', type=int, help="Tarefas executadas ao mesmo tempo (padrão: JOB_WORKER_CONCURRENCY).")
+    parser.add_argument('--mode', choices=['thread', 'process'], help="Pool de threads ou de processos (padrão: JOB_WORKER_MODE).")
+    parser.add_argument('--once', action='store_true', help="Encerra quando a fila estiver vazia.")
+    args = parser.parse_args()
+    try:
+        start_worker(concurrency=args.concurrency, mode=args.mode, once=args.once)
+    except KeyboardInterrupt:
+        print("Worker encerrado.")
+
+# python run_worker.py --concurrency 4